@@ -27,6 +27,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',  # pg_trgm, полнотекстовый поиск
 
     # сторонние
     "rest_framework",
@@ -39,6 +40,8 @@ INSTALLED_APPS = [
 
 # Middleware (промежуточные слои)
 MIDDLEWARE = [
+    'tracker.middleware.MetricsMiddleware',         # метрики Prometheus (/api/metrics/), первым - замеряет всё
+    'tracker.middleware.ServerTimingMiddleware',    # заголовок Server-Timing (SERVER_TIMING_SAMPLE_RATE)
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',   # добавила для админки на ВМ
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -47,6 +50,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'tracker.middleware.ProfilerMiddleware',        # профиль запроса для Admin (X-Profile: 1)
 ]
 
 # Основной файл маршрутизации
@@ -113,6 +117,26 @@ USE_I18N = True
 USE_TZ = True
 
 
+# Кэши
+# analytics - результаты аналитических эндпоинтов (tracker/api/analytics.py).
+# По умолчанию память процесса; для нескольких воркеров gunicorn лучше общий backend, например:
+# ANALYTICS_CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+# ANALYTICS_CACHE_LOCATION=redis://redis:6379/1
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "tracker-default",
+    },
+    "analytics": {
+        "BACKEND": os.getenv("ANALYTICS_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("ANALYTICS_CACHE_LOCATION", "tracker-analytics"),
+    },
+}
+
+# Сколько секунд хранить результат аналитики (данные всё равно инвалидируются версией при записи)
+ANALYTICS_CACHE_TTL = int(os.getenv("ANALYTICS_CACHE_TTL", "60"))
+
+
 # Статические и медиа-файлы
 STATIC_URL = 'static/'
 STATIC_ROOT = BASE_DIR / "staticfiles"
@@ -122,6 +146,23 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Загрузки пишутся сразу во временный файл на диске с подсчётом SHA-256 (tracker/storage.py),
+# без буферизации в памяти; файл отчёта потом переносится в хранилище переименованием
+FILE_UPLOAD_HANDLERS = ["tracker.storage.HashingFileUploadHandler"]
+
+# Кто отдаёт файл отчёта в GET /api/tasks/{id}/report/ после проверки прав:
+# "django" - FileResponse (с Range), "nginx" - X-Accel-Redirect, "sendfile" - X-Sendfile (Apache/lighttpd)
+REPORT_DOWNLOAD_BACKEND = os.getenv("REPORT_DOWNLOAD_BACKEND", "django")
+# internal location nginx, который смотрит в MEDIA_ROOT
+REPORT_ACCEL_REDIRECT_PREFIX = os.getenv("REPORT_ACCEL_REDIRECT_PREFIX", "/protected-media/")
+
+# Докачиваемая загрузка отчётов (/api/report-uploads/): части пишутся в файлы этого каталога.
+# Каталог должен быть на той же файловой системе, что и MEDIA_ROOT - готовый файл переносится переименованием
+REPORT_UPLOAD_DIR = Path(os.getenv("REPORT_UPLOAD_DIR", BASE_DIR / "report_uploads"))
+REPORT_UPLOAD_MAX_SIZE = int(os.getenv("REPORT_UPLOAD_MAX_SIZE", 2 * 1024 ** 3))  # байт
+# Сессия без новых частей дольше этого срока считается брошенной (manage.py cleanup_report_uploads)
+REPORT_UPLOAD_EXPIRE_HOURS = int(os.getenv("REPORT_UPLOAD_EXPIRE_HOURS", 24))
+
 # Это настройка Django, которая определяет тип поля первичного ключа (id),
 # создаваемого по умолчанию для всех моделей, если я явно не указала id в модели.
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
@@ -134,13 +175,19 @@ REST_FRAMEWORK = {
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",  # подключает генерацию схемы
     "DEFAULT_AUTHENTICATION_CLASSES": (                            # JWT авторизация (Bearer token)
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # JWT_STATELESS_AUTH=True - пользователь строится из claims токена, без запроса к БД
+        "tracker.api.authentication.StatelessJWTAuthentication"
+        if os.getenv("JWT_STATELESS_AUTH") == "True"
+        else "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": [                                 # доступ только авторизованным
         "rest_framework.permissions.IsAuthenticated",
     ],
     # когда происходит ошибка, то вызывай функцию custom_exception_handler
     "EXCEPTION_HANDLER": "tracker.api.exceptions.custom_exception_handler",
+    # курсорная (keyset) пагинация списков: без OFFSET и без COUNT(*)
+    "DEFAULT_PAGINATION_CLASS": "tracker.api.pagination.KeysetCursorPagination",
+    "PAGE_SIZE": int(os.getenv("API_PAGE_SIZE", "50")),
 
 }
 
@@ -173,8 +220,44 @@ SPECTACULAR_SETTINGS = {
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(hours=2),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
+    # в токен добавляются claims "roles" (имена групп) и "auth_stamp" (штамп состояния пользователя)
+    "TOKEN_OBTAIN_SERIALIZER": "tracker.api.authentication.ClaimsTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "tracker.api.authentication.ClaimsTokenRefreshSerializer",
 }
 
+# Штампы пользователей для StatelessJWTAuthentication (кэш и время жизни записи, секунды).
+# Используется кэш "analytics": для нескольких процессов/контейнеров он должен быть общим
+# (ANALYTICS_CACHE_BACKEND), иначе отзыв токена в другом процессе сработает только через TTL
+AUTH_STAMP_CACHE_ALIAS = "analytics"
+AUTH_STAMP_CACHE_TTL = int(os.getenv("AUTH_STAMP_CACHE_TTL", "60"))
+
+# Роли пользователя: кэш в памяти процесса (секунды) и доверие claim "roles" из токена.
+# При ROLE_CLAIM_TRUSTED=True проверки ролей не ходят в БД, но смена групп
+# применяется только к новым токенам (не позже ACCESS_TOKEN_LIFETIME)
+ROLE_CACHE_TTL = int(os.getenv("ROLE_CACHE_TTL", "30"))
+ROLE_CLAIM_TRUSTED = True if os.getenv("ROLE_CLAIM_TRUSTED") == "True" else False
+
+# Метрики Prometheus (/api/metrics/). Под gunicorn метрики воркеров собираются через
+# PROMETHEUS_MULTIPROC_DIR (выставляется в gunicorn.conf.py).
+# /api/metrics/ требует Authorization: Bearer <METRICS_TOKEN>; без METRICS_TOKEN эндпоинт закрыт (403),
+# METRICS_PUBLIC=True - отдавать метрики без авторизации (только если /api/metrics/ закрыт снаружи, например прокси)
+METRICS_ENABLED = False if os.getenv("METRICS_ENABLED") == "False" else True
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+METRICS_PUBLIC = True if os.getenv("METRICS_PUBLIC") == "True" else False
+
+# Доля запросов с заголовком Server-Timing (разбивка времени по этапам): 0 - выключено,
+# 0.01 - каждый сотый запрос, 1 - все запросы
+SERVER_TIMING_SAMPLE_RATE = float(os.getenv("SERVER_TIMING_SAMPLE_RATE", "0"))
+
+# Профилирование запросов /api/ по требованию Admin (X-Profile: 1 или ?_profile=1).
+# Профили - JSON-файлы в PROFILER_DIR, хранятся последние PROFILER_MAX_ENTRIES, просмотр в /admin/profiles/
+# Выключено по умолчанию: PROFILER_ENABLED=True включает
+PROFILER_ENABLED = os.getenv("PROFILER_ENABLED") == "True"
+PROFILER_DIR = os.getenv("PROFILER_DIR", BASE_DIR / "profiles")
+PROFILER_MAX_ENTRIES = int(os.getenv("PROFILER_MAX_ENTRIES", "50"))
+PROFILER_MAX_QUERIES = 1000   # SQL-запросов в одном профиле (остальные только считаются)
+PROFILER_EXPLAIN_TOP = 5      # EXPLAIN для стольких самых медленных SELECT
+
 # Логирование: Logger -> Handler -> Formatter -> Вывод
 LOGGING = {
     "version": 1,
@@ -5,7 +5,10 @@ from django.conf.urls.static import static
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
 
+from tracker.admin import profile_urlpatterns
+
 urlpatterns = [
+    path("admin/profiles/", include(profile_urlpatterns)),  # профили запросов (до admin/)
     path('admin/', admin.site.urls),
 
     # JWT
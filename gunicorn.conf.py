@@ -0,0 +1,20 @@
+import os
+import shutil
+
+
+# Настройки gunicorn (файл подхватывается автоматически из рабочей папки).
+# Метрики Prometheus: каждый воркер пишет значения в общую папку,
+# /api/metrics/ суммирует их по всем воркерам
+prometheus_dir = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/tracker-metrics")
+
+
+def on_starting(server):
+    # значения прошлого запуска не должны попасть в новые счётчики
+    shutil.rmtree(prometheus_dir, ignore_errors=True)
+    os.makedirs(prometheus_dir, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
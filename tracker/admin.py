@@ -1,9 +1,37 @@
+from django.conf import settings
 from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.db import connections
+from django.http import Http404
+from django.template.response import TemplateResponse
+from django.urls import path
+
+from tracker.api.filters import SEARCH_RANK, trigram_rank
+from tracker.api.roles import get_user_roles
 from tracker.models import Employee, Task, TaskDependency
+from tracker.profiler import list_profile_ids, load_profile
+
+
+class TrigramRankedSearchMixin:
+    """
+    Поиск в админке (и автодополнении) на PostgreSQL: отбор по ILIKE идёт
+    по trigram-индексам, найденное сортируется по похожести.
+    В списке объектов сортировку потом задаёт сама админка, в autocomplete она сохраняется.
+    """
+
+    def get_search_results(self, request, queryset, search_term):
+        queryset, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if search_term.strip() and connections[queryset.db].vendor == "postgresql":
+            queryset = (
+                queryset
+                .annotate(**{SEARCH_RANK: trigram_rank(self.search_fields, search_term.strip())})
+                .order_by(f"-{SEARCH_RANK}", "pk")
+            )
+        return queryset, may_have_duplicates
 
 
 @admin.register(Employee)
-class EmployeeAdmin(admin.ModelAdmin):
+class EmployeeAdmin(TrigramRankedSearchMixin, admin.ModelAdmin):
     # Колонки в списке сотрудников
     list_display = ("id", "full_name", "position", "email", "is_active", "created_at")
     # Поиск по полям
@@ -15,7 +43,7 @@ class EmployeeAdmin(admin.ModelAdmin):
 
 
 @admin.register(Task)
-class TaskAdmin(admin.ModelAdmin):
+class TaskAdmin(TrigramRankedSearchMixin, admin.ModelAdmin):
     list_display = ("id", "title", "assignee", "status", "due_date", "created_at")
     search_fields = ("title", "description")
     list_filter = ("status", "due_date", "assignee")
@@ -30,3 +58,39 @@ class TaskDependencyAdmin(admin.ModelAdmin):
     list_display = ("id", "parent_task", "child_task")
     search_fields = ("parent_task__title", "child_task__title")
     autocomplete_fields = ("parent_task", "child_task")
+
+
+# Профили запросов (tracker/profiler.py): хранятся файлами, а не в БД,
+# поэтому это отдельные страницы админки, а не ModelAdmin
+
+def _check_profile_access(request) -> None:
+    # в профиле SQL с параметрами - только суперпользователь или группа Admin
+    if not (request.user.is_superuser or "Admin" in get_user_roles(request.user)):
+        raise PermissionDenied
+
+
+def profile_list_view(request):
+    _check_profile_access(request)
+    profiles = [profile for profile in map(load_profile, list_profile_ids()) if profile is not None]
+    context = {
+        **admin.site.each_context(request),
+        "title": "Профили запросов",
+        "profiles": profiles,
+        "max_entries": settings.PROFILER_MAX_ENTRIES,
+    }
+    return TemplateResponse(request, "admin/tracker/profiles/list.html", context)
+
+
+def profile_detail_view(request, profile_id):
+    _check_profile_access(request)
+    profile = load_profile(profile_id)
+    if profile is None:
+        raise Http404("Профиль не найден (вытеснен более новыми?)")
+    context = {**admin.site.each_context(request), "title": f"Профиль {profile_id}", "profile": profile}
+    return TemplateResponse(request, "admin/tracker/profiles/detail.html", context)
+
+
+profile_urlpatterns = [
+    path("", admin.site.admin_view(profile_list_view), name="tracker-profiles"),
+    path("<str:profile_id>/", admin.site.admin_view(profile_detail_view), name="tracker-profile"),
+]
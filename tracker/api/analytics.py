@@ -1,37 +1,109 @@
-from django.db.models import Count, Q
-from typing import Any, Dict, List, Optional
-
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.db.models import Case, Count, IntegerField, Value, When
+from django.db.models.functions import JSONObject
+
+from tracker.api.assignment import suggest_assignees
+from tracker.api.etags import make_etag
+from tracker.metrics import ANALYTICS_CACHE
 from tracker.models import Employee, Task, TaskDependency
 
 
 # Статусы, которые считаем "активными"
-active_statuses = [
-    Task.Status.IN_PROGRESS,
-    Task.Status.REVIEW,
-]
+active_statuses = list(Task.ACTIVE_STATUSES)
 
 
-def get_busy_employees() -> list[dict]:
+# КЭШ АНАЛИТИКИ
+#
+# Результаты аналитики кэшируются по ключу с "версией данных".
+# Версия увеличивается после коммита любой записи Task/TaskDependency/Employee
+# (см. tracker/signals.py), поэтому старые результаты просто перестают читаться,
+# а TTL ограничивает время их хранения.
+# Backend - CACHES["analytics"] (по умолчанию locmem, для нескольких воркеров - общий, например Redis).
+
+ANALYTICS_CACHE_ALIAS = "analytics"
+DATA_VERSION_KEY = "tracker:data-version"
+
+
+def _analytics_cache():
+    return caches[ANALYTICS_CACHE_ALIAS]
+
+
+def _initial_version() -> int:
+    # Если ключ версии вытеснен из кэша, начинаем с "времени", а не с 1,
+    # чтобы не совпасть со старыми ещё живыми результатами
+    return int(time.time() * 1000)
+
+
+def get_data_version() -> int:
+    """Текущая версия данных для ключей кэша аналитики."""
+    cache = _analytics_cache()
+    version = cache.get(DATA_VERSION_KEY)
+    if version is None:
+        cache.add(DATA_VERSION_KEY, _initial_version(), timeout=None)
+        version = cache.get(DATA_VERSION_KEY, _initial_version())
+    return version
+
+
+def bump_data_version() -> None:
+    """Данные изменились: все закэшированные результаты аналитики устаревают."""
+    cache = _analytics_cache()
+    try:
+        cache.incr(DATA_VERSION_KEY)
+    except ValueError:  # ключа нет (первый запуск или вытеснен)
+        cache.add(DATA_VERSION_KEY, _initial_version(), timeout=None)
+
+
+def _analytics_key(name: str, version: int) -> str:
+    return f"tracker:analytics:{name}:v{version}"
+
+
+def _record_cache_access(hit: bool) -> None:
+    """Попадание/промах - в метрику tracker_analytics_cache_total (/api/metrics/, по всем воркерам)."""
+    ANALYTICS_CACHE.labels(result="hit" if hit else "miss").inc()
+
+
+def cached_analytics(name: str, builder: Callable[[], Any]) -> Tuple[Any, str, bool]:
     """
-    Возвращает список сотрудников с активными задачами.
-    Для каждого сотрудника (id, full_name, количество активных задач, список активных задач)
-    Сотрудники отсортированы по количеству активных задач (по убыванию).
+    Возвращает (результат, ETag результата, попадание_в_кэш).
+    builder вызывается только при промахе, результат хранится ANALYTICS_CACHE_TTL секунд
+    вместе с ETag (хэш содержимого считается один раз при построении).
+    """
+    cache = _analytics_cache()
+    key = _analytics_key(name, get_data_version())
+
+    entry = cache.get(key)
+    hit = entry is not None
+    _record_cache_access(hit)
+
+    if not hit:
+        value = builder()
+        entry = (value, make_etag(name, value))
+        cache.set(key, entry, timeout=settings.ANALYTICS_CACHE_TTL)
+
+    value, etag = entry
+    return value, etag, hit
+
+
+def _busy_employees_querysets():
+    """
+    Два независимых запроса busy-employees (ORM-вариант):
+    сотрудники с активными задачами и сами активные задачи.
     """
 
-    # 1. Получаем сотрудников и считаем количество активных задач
+    # 1. Сотрудники с активными задачами
+    # (active_tasks_count - денормализованный счётчик, COUNT по всей таблице задач не нужен)
     employees = (
         Employee.objects
-        .filter(is_active=True)
-        .annotate(
-            active_tasks_count=Count(
-                "tasks",                            # related_name из Task.assignee
-                filter=Q(tasks__status__in=active_statuses)
-            )
-        )
+        .filter(is_active=True, active_tasks_count__gt=0)
         .order_by("-active_tasks_count", "id")
     )
 
-    # 2. Получаем все активные задачи одним запросом
+    # 2. Все их активные задачи одним запросом
     active_tasks = (
         Task.objects
         .filter(
@@ -39,15 +111,21 @@ def get_busy_employees() -> list[dict]:
             assignee__in=employees,
         )
         .select_related("assignee")
+        .order_by("id")
     )
+    return employees, active_tasks
+
 
-    # 3. Группируем задачи по сотрудникам (assignee_id)
+def _group_busy_employees(employees, active_tasks) -> list[dict]:
+    """Группировка задач по сотрудникам в формат BusyEmployeeSerializer (без запросов к БД)."""
+
+    # Группируем задачи по сотрудникам (assignee_id)
     tasks_by_employee: dict[int, list[Task]] = {}
 
     for task in active_tasks:
         tasks_by_employee.setdefault(task.assignee_id, []).append(task)
 
-    # 4. Формируем результат для сериализатора
+    # Формируем результат для сериализатора
     result: list[dict] = []
 
     for employee in employees:
@@ -68,6 +146,80 @@ def get_busy_employees() -> list[dict]:
     return result
 
 
+def get_busy_employees() -> list[dict]:
+    """
+    Возвращает список сотрудников с активными задачами.
+    Для каждого сотрудника (id, full_name, количество активных задач, список активных задач)
+    Сотрудники отсортированы по количеству активных задач (по убыванию).
+    """
+    employees, active_tasks = _busy_employees_querysets()
+    return _group_busy_employees(employees, active_tasks)
+
+
+def _busy_employees_json_agg_queryset():
+    """
+    PostgreSQL: готовый ответ busy-employees одним запросом
+    (JOIN + GROUP BY + jsonb_agg), без создания моделей Task и без DRF-сериализации.
+    Ключи jsonb-объекта id, title, status, due_date совпадают с TaskShortSerializer
+    (и по порядку: jsonb сортирует ключи по длине), due_date приходит строкой ISO.
+    """
+    from django.contrib.postgres.aggregates import JSONBAgg
+
+    return (
+        Employee.objects
+        .filter(
+            is_active=True,
+            active_tasks_count__gt=0,
+            tasks__status__in=active_statuses,
+        )
+        .values("id", "full_name")                   # GROUP BY employees.id, full_name
+        .annotate(
+            tasks_count=Count("tasks"),
+            tasks_json=JSONBAgg(
+                JSONObject(
+                    id="tasks__id",
+                    title="tasks__title",
+                    status="tasks__status",
+                    due_date="tasks__due_date",
+                ),
+                order_by="tasks__id",
+            ),
+        )
+        .order_by("-tasks_count", "id")
+        .values_list("id", "full_name", "tasks_count", "tasks_json")
+    )
+
+
+def _busy_employees_json_rows(rows) -> list[dict]:
+    return [
+        {
+            "id": employee_id,
+            "full_name": full_name,
+            "active_tasks_count": tasks_count,
+            "active_tasks": tasks_json,
+        }
+        for employee_id, full_name, tasks_count, tasks_json in rows
+    ]
+
+
+def _busy_employees_json_agg() -> list[dict]:
+    return _busy_employees_json_rows(_busy_employees_json_agg_queryset())
+
+
+def get_busy_employees_payload() -> list[dict]:
+    """
+    Ответ busy-employees в формате BusyEmployeeSerializer.
+    На PostgreSQL - один агрегирующий запрос, на остальных БД (SQLite в тестах) -
+    get_busy_employees() + сериализатор.
+    """
+    if connection.vendor == "postgresql":
+        return _busy_employees_json_agg()
+
+    from tracker.api.serializers import BusyEmployeeSerializer
+
+    return BusyEmployeeSerializer(get_busy_employees(), many=True).data
+
+
 def get_important_tasks():
     """
     "Важные задачи" (parent_task):
@@ -100,48 +252,29 @@ def get_active_load_by_employee() -> Dict[int, int]:
     qs = (
         Employee.objects
         .filter(is_active=True)
-        .annotate(
-            active_tasks_count=Count(
-                "tasks",
-                filter=Q(tasks__status__in=active_statuses),
-            )
-        )
-        .values("id", "active_tasks_count")
+        .values_list("id", "active_tasks_count")  # денормализованный счётчик
     )
 
-    return {row["id"]: row["active_tasks_count"] for row in qs}
-
-
-def get_important_tasks_with_suggestion() -> List[Dict[str, Any]]:
-    """
-    Важные задачи = родительская задача (от них зависит хотя бы одна активная задача) в статусе NEW
-
-    Для каждой важной задачи выбираем suggested_employee:
-    - базовый кандидат: сотрудник с минимальной нагрузкой (min активных задач)
-    - альтернативный кандидат: исполнитель дочерней активной задачи, если его нагрузка <= min_load + 2
-
-    Возвращаем список словарей под ImportantTaskSerializer:
-    {id, title, due_date, suggested_employee_id, suggested_employee_full_name}
-    """
-
-    load_by_employee = get_active_load_by_employee()
+    return dict(qs)
 
-    # Если сотрудников нет,то вернем просто список важных задач без рекомендаций
-    if not load_by_employee:
-        min_load = 0
-        min_load_employee_id = None
-    else:
-        min_load = min(load_by_employee.values())
-        min_load_employee_id = min(load_by_employee, key=load_by_employee.get)
 
-    # Загружаем сразу всех активных сотрудников одним запросом
-    employee_names: Dict[int, str] = dict(
+def _active_employees() -> Tuple[Dict[int, int], Dict[int, str]]:
+    """Все активные сотрудники одним запросом: ({id: нагрузка}, {id: ФИО})."""
+    load_by_employee: Dict[int, int] = {}
+    employee_names: Dict[int, str] = {}
+    for employee_id, full_name, load in (
         Employee.objects
         .filter(is_active=True)
-        .values_list("id", "full_name")
-    )
+        .values_list("id", "full_name", "active_tasks_count")
+    ):
+        load_by_employee[employee_id] = load
+        employee_names[employee_id] = full_name
+    return load_by_employee, employee_names
 
-    important_qs = (
+
+def _important_tasks_queryset():
+    """Важные задачи по сроку, с активными дочерними задачами (prefetch)."""
+    return (
         Task.objects
         .filter(
             status=Task.Status.NEW,
@@ -149,44 +282,79 @@ def get_important_tasks_with_suggestion() -> List[Dict[str, Any]]:
         )
         .distinct()
         .order_by("due_date", "created_at")
-        .prefetch_related("child_dependencies__child_task__assignee")
+        .prefetch_related("child_dependencies__child_task")
     )
 
-    results: List[Dict[str, Any]] = []
 
-    for task in important_qs:
-        suggested_employee_id: Optional[int] = min_load_employee_id
+def _important_task_rows(
+    important_tasks: List[Task],
+    load_by_employee: Dict[int, int],
+    employee_names: Dict[int, str],
+) -> List[Dict[str, Any]]:
+    """Рекомендации для уже загруженных данных (без запросов к БД)."""
 
+    def child_assignee_id(task: Task) -> Optional[int]:
         # кандидат = assignee первой найденной активной дочерней задачи
-        child_assignee_id: Optional[int] = None
         for dep in task.child_dependencies.all():
             child_task = dep.child_task
             if child_task.status in active_statuses and child_task.assignee_id:
-                child_assignee_id = child_task.assignee_id
-                break
-
-        # если у кандидата нагрузка <= min_load + 2 то рекомендуем его
-        if child_assignee_id is not None:
-            child_load = load_by_employee.get(child_assignee_id, 0)
-            if child_load <= min_load + 2:
-                suggested_employee_id = child_assignee_id
-
-        # ФИО кандидата из заранее подготовленного словаря
-        suggested_full_name = (
-            employee_names.get(suggested_employee_id)
-            if suggested_employee_id is not None
-            else None
-        )
+                return child_task.assignee_id
+        return None
+
+    suggestions = suggest_assignees(
+        ((task.id, task.owner_id, child_assignee_id(task)) for task in important_tasks),
+        load_by_employee,
+    )
+
+    # КЛЮЧИ должны совпадать с ImportantTaskSerializer
+    return [
+        {
+            "id": task.id,
+            "title": task.title,
+            "due_date": task.due_date,
+            "suggested_employee_id": suggested_employee_id,
+            "suggested_employee_full_name": employee_names.get(suggested_employee_id),
+        }
+        for task, (_, suggested_employee_id) in zip(important_tasks, suggestions)
+    ]
 
-        # КЛЮЧИ должны совпадать с ImportantTaskSerializer
-        results.append(
-            {
-                "id": task.id,
-                "title": task.title,
-                "due_date": task.due_date,
-                "suggested_employee_id": suggested_employee_id,
-                "suggested_employee_full_name": suggested_full_name,
-            }
-        )
 
+def get_important_tasks_with_suggestion() -> List[Dict[str, Any]]:
+    """
+    Важные задачи = родительская задача (от них зависит хотя бы одна активная задача) в статусе NEW
+
+    Для каждой важной задачи выбираем suggested_employee (tracker/api/assignment.py):
+    - базовый кандидат: сотрудник с минимальной нагрузкой (min активных задач)
+    - альтернативный кандидат: исполнитель дочерней активной задачи, если его нагрузка <= min_load + 2
+    Рекомендации выдаются по очереди (по сроку), и каждая увеличивает нагрузку выбранного
+    сотрудника, поэтому задачи распределяются, а не уходят одному человеку.
+
+    Возвращаем список словарей под ImportantTaskSerializer:
+    {id, title, due_date, suggested_employee_id, suggested_employee_full_name}
+    """
+    load_by_employee, employee_names = _active_employees()
+    important_tasks = list(_important_tasks_queryset())
+    return _important_task_rows(important_tasks, load_by_employee, employee_names)
+
+
+def apply_important_task_suggestions() -> List[Dict[str, Any]]:
+    """
+    Режим commit: назначить рекомендованных исполнителей одним UPDATE (CASE по id).
+    Обновляются только задачи, которые всё ещё в статусе NEW.
+    Возвращает те же строки, что get_important_tasks_with_suggestion.
+    """
+    with transaction.atomic():
+        results = get_important_tasks_with_suggestion()
+        assignments = {
+            row["id"]: row["suggested_employee_id"]
+            for row in results
+            if row["suggested_employee_id"] is not None
+        }
+        if assignments:
+            Task.objects.filter(id__in=assignments, status=Task.Status.NEW).update(
+                assignee=Case(
+                    *(When(id=task_id, then=Value(employee_id)) for task_id, employee_id in assignments.items()),
+                    output_field=IntegerField(),
+                )
+            )
     return results
@@ -0,0 +1,84 @@
+import heapq
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Исполнитель активной дочерней задачи рекомендуется, если его нагрузка не больше min_load + 2
+CHILD_ASSIGNEE_LOAD_SLACK = 2
+
+
+class _LoadHeap:
+    """
+    Min-heap нагрузок сотрудников (load, employee_id) с ленивым удалением:
+    при росте нагрузки старая запись не удаляется, а пропускается при чтении вершины.
+    Нагрузки только растут, поэтому актуальна ровно одна запись на сотрудника.
+    """
+
+    def __init__(self, load_by_employee: Dict[int, int]):
+        self.loads = dict(load_by_employee)
+        self.heap = [(load, employee_id) for employee_id, load in self.loads.items()]
+        heapq.heapify(self.heap)
+
+    def _top(self) -> Optional[Tuple[int, int]]:
+        while self.heap:
+            load, employee_id = self.heap[0]
+            if self.loads[employee_id] == load:
+                return self.heap[0]
+            heapq.heappop(self.heap)  # устаревшая запись
+        return None
+
+    def min_excluding(self, excluded_id: Optional[int]) -> Optional[Tuple[int, int]]:
+        """Наименее загруженный сотрудник, кроме excluded_id (владельца задачи)."""
+        top = self._top()
+        if top is None or top[1] != excluded_id:
+            return top
+
+        entry = heapq.heappop(self.heap)
+        second = self._top()
+        heapq.heappush(self.heap, entry)
+        return second
+
+    def add_task(self, employee_id: int) -> None:
+        self.loads[employee_id] += 1
+        heapq.heappush(self.heap, (self.loads[employee_id], employee_id))
+
+
+def suggest_assignees(
+    tasks: Iterable[Tuple[int, int, Optional[int]]],
+    load_by_employee: Dict[int, int],
+) -> List[Tuple[int, Optional[int]]]:
+    """
+    Пакетная рекомендация исполнителей с учётом уже выданных рекомендаций.
+
+    tasks - (task_id, owner_id, child_assignee_id) в порядке приоритета
+    load_by_employee - {employee_id: активных задач} по активным сотрудникам
+
+    Для каждой задачи:
+    - базовый кандидат: наименее загруженный сотрудник (не владелец задачи)
+    - исполнитель активной дочерней задачи, если его нагрузка <= min_load + 2
+    После выбора нагрузка кандидата увеличивается на 1, следующие задачи это учитывают.
+    Сложность O((E + T) log(E + T)) вместо O(T * E).
+
+    Возвращает [(task_id, employee_id | None)] в исходном порядке.
+    """
+    loads = _LoadHeap(load_by_employee)
+    suggestions = []
+
+    for task_id, owner_id, child_assignee_id in tasks:
+        base = loads.min_excluding(owner_id)
+        if base is None:
+            suggestions.append((task_id, None))
+            continue
+
+        min_load, suggested_id = base
+        if (
+            child_assignee_id is not None
+            and child_assignee_id != owner_id
+            and child_assignee_id in loads.loads
+            and loads.loads[child_assignee_id] <= min_load + CHILD_ASSIGNEE_LOAD_SLACK
+        ):
+            suggested_id = child_assignee_id
+
+        loads.add_task(suggested_id)
+        suggestions.append((task_id, suggested_id))
+
+    return suggestions
@@ -0,0 +1,110 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+from tracker.api.analytics import (
+    _active_employees,
+    _analytics_cache,
+    _analytics_key,
+    _busy_employees_json_agg_queryset,
+    _busy_employees_json_rows,
+    _busy_employees_querysets,
+    _group_busy_employees,
+    _important_task_rows,
+    _important_tasks_queryset,
+    _record_cache_access,
+    get_data_version,
+)
+from tracker.api.etags import make_etag
+
+
+# АСИНХРОННАЯ АНАЛИТИКА (ASGI)
+#
+# Те же расчёты, что в analytics.py, но без блокировки event loop.
+# Async ORM Django выполняет запросы в одном общем потоке (по очереди), поэтому
+# независимые запросы запускаются в отдельных потоках со своими соединениями
+# (sync_to_async(thread_sensitive=False)) и идут в БД параллельно.
+
+
+def _with_own_connection(func: Callable[[], Any]) -> Callable[[], Any]:
+    """
+    Функция для выполнения в отдельном потоке: соединение этого потока
+    закрывается/переиспользуется по правилам CONN_MAX_AGE, как в обычном запросе.
+    """
+    def run():
+        close_old_connections()
+        try:
+            return func()
+        finally:
+            close_old_connections()
+    return run
+
+
+async def run_concurrently(*funcs: Callable[[], Any]) -> List[Any]:
+    """
+    Выполнить независимые синхронные функции с запросами к БД параллельно.
+    Внутри транзакции (ATOMIC_REQUESTS, тесты) - по очереди в потоке транзакции:
+    другие соединения не видят её незакоммиченных данных.
+    """
+    in_transaction = await sync_to_async(lambda: connection.in_atomic_block)()
+    if in_transaction:
+        return [await sync_to_async(func)() for func in funcs]
+
+    return list(await asyncio.gather(
+        *(sync_to_async(_with_own_connection(func), thread_sensitive=False)() for func in funcs)
+    ))
+
+
+async def aget_busy_employees_payload() -> list[dict]:
+    """Async-вариант get_busy_employees_payload."""
+    if connection.vendor == "postgresql":
+        return _busy_employees_json_rows([row async for row in _busy_employees_json_agg_queryset()])
+
+    from tracker.api.serializers import BusyEmployeeSerializer
+
+    employees, active_tasks = _busy_employees_querysets()
+    employees, active_tasks = await run_concurrently(lambda: list(employees), lambda: list(active_tasks))
+    return BusyEmployeeSerializer(_group_busy_employees(employees, active_tasks), many=True).data
+
+
+async def aget_important_tasks_payload() -> list[dict]:
+    """
+    Async-вариант important-tasks (в формате ImportantTaskSerializer):
+    сотрудники (нагрузка + ФИО) и важные задачи (+ prefetch) загружаются параллельно.
+    """
+    from tracker.api.serializers import ImportantTaskSerializer
+
+    (load_by_employee, employee_names), important_tasks = await run_concurrently(
+        _active_employees,
+        lambda: list(_important_tasks_queryset()),
+    )
+    rows = _important_task_rows(important_tasks, load_by_employee, employee_names)
+    return ImportantTaskSerializer(rows, many=True).data
+
+
+async def acached_analytics(name: str, builder: Callable[[], Awaitable[Any]]) -> Tuple[Any, str, bool]:
+    """Async-вариант cached_analytics (тот же ключ и формат записи в кэше)."""
+    cache = _analytics_cache()
+    key = _analytics_key(name, await sync_to_async(get_data_version)())
+
+    entry = await cache.aget(key)
+    hit = entry is not None
+    _record_cache_access(hit)
+
+    if not hit:
+        value = await builder()
+        entry = (value, make_etag(name, value))
+        await cache.aset(key, entry, timeout=settings.ANALYTICS_CACHE_TTL)
+
+    value, etag = entry
+    return value, etag, hit
+
+
+# Имя в кэше -> построитель ответа (имена совпадают с синхронными эндпоинтами)
+ASYNC_ANALYTICS: Dict[str, Callable[[], Awaitable[Any]]] = {
+    "busy-employees": aget_busy_employees_payload,
+    "important-tasks": aget_important_tasks_payload,
+}
@@ -0,0 +1,84 @@
+import logging
+from typing import Optional
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, HttpResponseNotModified
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import APIException, AuthenticationFailed, NotAuthenticated, PermissionDenied
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from tracker.api.async_analytics import ASYNC_ANALYTICS, acached_analytics
+from tracker.api.etags import etag_matches
+from tracker.api.exceptions import custom_exception_handler
+from tracker.api.permissions import IsAdminOrManager
+
+
+logger = logging.getLogger("tracker")
+
+
+# Async-варианты эндпоинтов аналитики для запуска под ASGI (uvicorn).
+# DRF-представления синхронные, поэтому здесь обычные async-представления Django:
+# аутентификация и права - те же классы DRF (в потоке), ответ и ошибки - в том же формате.
+
+
+def _render(response) -> HttpResponse:
+    """DRF Response (из обработчика ошибок) -> обычный HttpResponse с JSON."""
+    rendered = HttpResponse(
+        JSONRenderer().render(response.data),
+        status=response.status_code,
+        content_type="application/json",
+    )
+    for header, value in response.items():
+        rendered.setdefault(header, value)
+    return rendered
+
+
+def _authorize(django_request) -> Optional[HttpResponse]:
+    """JWT-аутентификация + IsAdminOrManager. None - доступ разрешён, иначе - ответ с ошибкой."""
+    authenticators = [auth_class() for auth_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+    request = Request(django_request, authenticators=authenticators)
+    try:
+        if not request.user.is_authenticated:
+            raise NotAuthenticated()
+        if not IsAdminOrManager().has_permission(request, None):
+            raise PermissionDenied()
+    except APIException as exc:
+        response = custom_exception_handler(exc, {"request": request, "view": None})
+        if isinstance(exc, (NotAuthenticated, AuthenticationFailed)) and authenticators:
+            response["WWW-Authenticate"] = authenticators[0].authenticate_header(request)
+        return _render(response)
+
+    django_request.user = request.user  # для логов и middleware
+    return None
+
+
+async def _analytics_response(request, name: str) -> HttpResponse:
+    error = await sync_to_async(_authorize)(request)
+    if error is not None:
+        return error
+
+    logger.info("Analytics %s requested (async, user_id=%s)", name, getattr(request.user, "id", None))
+
+    data, etag, hit = await acached_analytics(name, ASYNC_ANALYTICS[name])
+    headers = {"ETag": etag, "X-Cache": "HIT" if hit else "MISS"}
+
+    if etag_matches(request, etag):
+        response = HttpResponseNotModified()
+        for header, value in headers.items():
+            response[header] = value
+        return response
+    return HttpResponse(JSONRenderer().render(data), content_type="application/json", headers=headers)
+
+
+@require_GET
+async def busy_employees(request):
+    """GET /api/async/analytics/busy-employees/ - то же, что /api/analytics/busy-employees/."""
+    return await _analytics_response(request, "busy-employees")
+
+
+@require_GET
+async def important_tasks(request):
+    """GET /api/async/analytics/important-tasks/ - то же, что GET /api/analytics/important-tasks/."""
+    return await _analytics_response(request, "important-tasks")
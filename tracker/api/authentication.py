@@ -0,0 +1,152 @@
+import hashlib
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from rest_framework_simplejwt.authentication import JWTAuthentication, JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tracker.api.roles import ROLES_CLAIM
+
+
+# Claim "штампа" состояния пользователя: хэш от пароля, is_active и ролей.
+# Смена пароля, блокировка или смена групп меняют штамп, и старые токены перестают приниматься
+AUTH_STAMP_CLAIM = "auth_stamp"
+# Штамп учётных данных (пароль и is_active, без ролей) - по нему проверяется refresh-токен:
+# после смены пароля или блокировки refresh отклоняется, а смена групп лишь обновляет роли в новом access
+CREDENTIALS_STAMP_CLAIM = "credentials_stamp"
+
+
+def _stamp_cache():
+    return caches[settings.AUTH_STAMP_CACHE_ALIAS]
+
+
+def _stamp_key(user_id) -> str:
+    return f"tracker:auth-stamp:{user_id}"
+
+
+def compute_auth_stamp(user_id, password: str, is_active: bool, roles: Iterable[str]) -> str:
+    raw = f"{user_id}:{password}:{is_active}:{','.join(sorted(roles))}"
+    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+
+
+def compute_credentials_stamp(user_id, password: str, is_active: bool) -> str:
+    return compute_auth_stamp(user_id, password, is_active, ())
+
+
+def _load_auth_state(user_id) -> Optional[tuple]:
+    """Пароль, is_active и роли пользователя одним запросом (LEFT JOIN на группы)."""
+    rows = list(
+        get_user_model().objects
+        .filter(pk=user_id)
+        .values_list("password", "is_active", "groups__name")
+    )
+    if not rows:
+        return None
+    password, is_active, _ = rows[0]
+    return password, is_active, [name for _, _, name in rows if name is not None]
+
+
+def get_auth_stamp(user_id) -> Optional[str]:
+    """
+    Текущий штамп пользователя: из кэша, при промахе - из БД (и снова в кэш).
+    None - пользователя нет.
+    """
+    stamp = _stamp_cache().get(_stamp_key(user_id))
+    if stamp is None:
+        state = _load_auth_state(user_id)
+        if state is None:
+            return None
+        stamp = compute_auth_stamp(user_id, *state)
+        _stamp_cache().set(_stamp_key(user_id), stamp, settings.AUTH_STAMP_CACHE_TTL)
+    return stamp
+
+
+def invalidate_auth_stamps(user_ids: Iterable) -> None:
+    """Сбросить штампы (следующий запрос пересчитает их по БД)."""
+    _stamp_cache().delete_many([_stamp_key(user_id) for user_id in user_ids])
+
+
+def add_user_claims(token, user_id, state: Optional[tuple] = None) -> None:
+    """Claims ролей и штампов для нового токена (один запрос к БД, если state не передан)."""
+    if state is None:
+        state = _load_auth_state(user_id)
+    if state is None:
+        raise AuthenticationFailed("Пользователь не найден.", code="user_not_found")
+    password, is_active, roles = state
+    token[ROLES_CLAIM] = sorted(roles)
+    token[AUTH_STAMP_CLAIM] = compute_auth_stamp(user_id, password, is_active, roles)
+    token[CREDENTIALS_STAMP_CLAIM] = compute_credentials_stamp(user_id, password, is_active)
+
+
+def refresh_token_is_current(refresh, user_id, state: Optional[tuple]) -> bool:
+    """
+    Refresh-токен выдан для текущих учётных данных пользователя.
+    Токены до появления credentials_stamp сверяются по auth_stamp, совсем старые (без штампов) - принимаются.
+    """
+    if state is None:
+        return False
+    password, is_active, roles = state
+    if CREDENTIALS_STAMP_CLAIM in refresh:
+        return refresh[CREDENTIALS_STAMP_CLAIM] == compute_credentials_stamp(user_id, password, is_active)
+    if AUTH_STAMP_CLAIM in refresh:
+        return refresh[AUTH_STAMP_CLAIM] == compute_auth_stamp(user_id, password, is_active, roles)
+    return True
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """
+    JWT-аутентификация без чтения пользователя из БД на каждый запрос.
+    request.user - TokenUser из claims (id, roles), актуальность проверяется
+    сравнением claim auth_stamp со штампом из кэша. В БД идём только
+    при промахе кэша, а для старых токенов без штампа - обычной проверкой пользователя.
+    """
+
+    def get_user(self, validated_token):
+        stamp = validated_token.get(AUTH_STAMP_CLAIM)
+        if stamp is None:
+            return JWTAuthentication.get_user(self, validated_token)
+
+        user = super().get_user(validated_token)
+        if stamp != get_auth_stamp(user.id):
+            raise AuthenticationFailed("Токен отозван: данные пользователя изменились.", code="token_revoked")
+        return user
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Выдача JWT с claims roles (имена групп) и auth_stamp.
+    Claims копируются и в access-токен.
+    """
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        add_user_claims(token, user.pk)
+        return token
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    При refresh roles и auth_stamp в новом access-токене берутся из БД,
+    а не копируются из refresh-токена (иначе смена групп потребовала бы нового входа).
+    Refresh-токен, выданный до смены пароля или блокировки пользователя, отклоняется (401).
+    """
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+
+        refresh = self.token_class(attrs["refresh"])
+        user_id = refresh[api_settings.USER_ID_CLAIM]
+        state = _load_auth_state(user_id)
+        if not refresh_token_is_current(refresh, user_id, state):
+            raise InvalidToken("Refresh-токен отозван: учётные данные пользователя изменились.")
+
+        access = AccessToken(data["access"])
+        add_user_claims(access, user_id, state)
+        data["access"] = str(access)
+        return data
@@ -0,0 +1,157 @@
+from typing import Any, Dict, List
+
+from django.db import transaction
+from rest_framework import serializers
+from rest_framework.relations import PrimaryKeyRelatedField
+
+from tracker.api.serializers import TaskBulkItemSerializer, task_rules_errors
+from tracker.models import Employee, Task
+
+
+# Максимальный размер одной пачки
+BULK_MAX_ROWS = 5000
+
+# Размер пачки для INSERT/UPDATE (ограничение на число параметров в одном запросе)
+BULK_BATCH_SIZE = 1000
+
+# Поля, которые можно менять через PATCH /tasks/bulk/
+BULK_UPDATE_FIELDS = ("title", "description", "assignee", "owner", "status", "due_date", "review_comment")
+
+
+def _validate_rows(data, partial: bool) -> tuple[list[dict], list[dict]]:
+    """
+    Поле за полем проверяем все строки (типы, длины, due_date) без запросов к БД.
+    Возвращаем (validated_rows, errors) - списки той же длины, что и вход,
+    для валидной строки ошибки - пустой словарь (как в ListSerializer).
+    """
+    if not isinstance(data, list):
+        raise serializers.ValidationError({"non_field_errors": ["Ожидается список задач."]})
+    if not data:
+        raise serializers.ValidationError({"non_field_errors": ["Список задач пуст."]})
+    if len(data) > BULK_MAX_ROWS:
+        raise serializers.ValidationError(
+            {"non_field_errors": [f"Не более {BULK_MAX_ROWS} задач за один запрос."]}
+        )
+
+    child = TaskBulkItemSerializer(partial=partial)
+    validated: list[dict] = []
+    errors: list[dict] = []
+
+    for row in data:
+        try:
+            validated.append(child.run_validation(row))
+            errors.append({})
+        except serializers.ValidationError as exc:
+            validated.append({})
+            errors.append(dict(exc.detail))
+
+    return validated, errors
+
+
+def _check_employees(rows: list[dict], errors: list[dict]) -> None:
+    """
+    Все assignee/owner всей пачки проверяем одним запросом.
+    """
+    ids = {row[field] for row in rows for field in ("assignee", "owner") if row.get(field) is not None}
+    existing = set(Employee.objects.filter(id__in=ids).values_list("id", flat=True))
+
+    message = PrimaryKeyRelatedField.default_error_messages["does_not_exist"]
+    for row, row_errors in zip(rows, errors):
+        for field in ("assignee", "owner"):
+            value = row.get(field)
+            if value is not None and value not in existing:
+                row_errors.setdefault(field, [str(message).format(pk_value=value)])
+
+
+def _raise_if_errors(errors: list[dict]) -> None:
+    if any(errors):
+        raise serializers.ValidationError(errors)
+
+
+def bulk_create_tasks(data: Any) -> List[Task]:
+    """
+    POST /tasks/bulk/: создание пачки задач.
+    Все строки проверяются целиком (ошибки возвращаются построчно, в порядке входа),
+    затем одна транзакция с bulk_create. Если хоть одна строка невалидна - не создаётся ничего.
+    """
+    rows, errors = _validate_rows(data, partial=False)
+    _check_employees(rows, errors)
+
+    for row, row_errors in zip(rows, errors):
+        if row_errors:
+            continue
+        if "id" in row:
+            row_errors["id"] = ["При создании id не передаётся."]
+            continue
+        row_errors.update(task_rules_errors(
+            row.get("status", Task.Status.NEW), None, row.get("owner"), row.get("assignee"),
+        ))
+
+    _raise_if_errors(errors)
+
+    tasks = [
+        Task(
+            title=row["title"],
+            description=row.get("description"),
+            assignee_id=row.get("assignee"),
+            owner_id=row.get("owner"),
+            status=row.get("status", Task.Status.NEW),
+            due_date=row["due_date"],
+            review_comment=row.get("review_comment"),
+        )
+        for row in rows
+    ]
+
+    # full_clean() не вызываем: правила уже проверены для всей пачки выше
+    with transaction.atomic():
+        return Task.objects.bulk_create(tasks, batch_size=BULK_BATCH_SIZE)
+
+
+def bulk_update_tasks(data: Any) -> List[Task]:
+    """
+    PATCH /tasks/bulk/: частичное обновление пачки задач (в каждой строке обязателен id).
+    Задачи читаются одним запросом (с блокировкой строк), правила проверяются
+    по итоговому состоянию каждой задачи, запись - одним bulk_update.
+    """
+    rows, errors = _validate_rows(data, partial=True)
+    _check_employees(rows, errors)
+
+    seen: set[int] = set()
+    for row, row_errors in zip(rows, errors):
+        if row_errors:
+            continue
+        if "id" not in row:
+            row_errors["id"] = ["Обязательное поле."]
+        elif row["id"] in seen:
+            row_errors["id"] = ["Задача повторяется в пачке."]
+        else:
+            seen.add(row["id"])
+
+    _raise_if_errors(errors)
+
+    with transaction.atomic():
+        instances: Dict[int, Task] = Task.objects.select_for_update().in_bulk(seen)
+
+        changed_fields: set[str] = set()
+        for row, row_errors in zip(rows, errors):
+            task = instances.get(row["id"])
+            if task is None:
+                row_errors["id"] = ["Задача не найдена."]
+                continue
+
+            for field in BULK_UPDATE_FIELDS:
+                if field not in row:
+                    continue
+                attname = f"{field}_id" if field in ("assignee", "owner") else field
+                setattr(task, attname, row[field])
+                changed_fields.add(field)
+
+            row_errors.update(task_rules_errors(task.status, task.report_file, task.owner_id, task.assignee_id))
+
+        _raise_if_errors(errors)
+
+        tasks = [instances[row["id"]] for row in rows]
+        if changed_fields:
+            Task.objects.bulk_update(tasks, sorted(changed_fields), batch_size=BULK_BATCH_SIZE)
+
+    return tasks
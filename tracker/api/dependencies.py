@@ -0,0 +1,104 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import connections
+from django.db.models.query import RawQuerySet
+
+from tracker.models import Task, TaskDependency
+
+
+# Ограничение глубины обхода: защита от слишком длинных цепочек (и от циклов в старых данных)
+DEPENDENCY_MAX_DEPTH = 100
+
+# Направление обхода: (колонка, по которой ищем, колонка, которую берём)
+# blockers   - задачи, от которых зависит данная (вверх по цепочке)
+# dependents - задачи, которые зависят от данной (вниз по цепочке)
+DEPENDENCY_DIRECTIONS = {
+    "blockers": ("child_task", "parent_task"),
+    "dependents": ("parent_task", "child_task"),
+}
+
+
+def get_dependency_closure(task_id: int, direction: str, max_depth: Optional[int] = None) -> RawQuerySet:
+    """
+    Транзитивное замыкание зависимостей задачи одним запросом WITH RECURSIVE.
+    Каждая задача возвращается один раз с минимальной глубиной (1 - прямая связь),
+    сортировка: depth, id.
+    """
+    from_field, to_field = DEPENDENCY_DIRECTIONS[direction]
+    max_depth = min(max_depth or DEPENDENCY_MAX_DEPTH, DEPENDENCY_MAX_DEPTH)
+
+    deps = TaskDependency._meta
+    from_column = deps.get_field(from_field).column
+    to_column = deps.get_field(to_field).column
+
+    # UNION (а не UNION ALL) отбрасывает повторы (задача, глубина) на ромбовидных связях,
+    # условие depth < max_depth гарантирует остановку
+    sql = f"""
+        WITH RECURSIVE closure (task_id, depth) AS (
+            SELECT d.{to_column}, 1
+            FROM {deps.db_table} d
+            WHERE d.{from_column} = %s
+            UNION
+            SELECT d.{to_column}, c.depth + 1
+            FROM {deps.db_table} d
+            JOIN closure c ON d.{from_column} = c.task_id
+            WHERE c.depth < %s
+        )
+        SELECT t.id, t.title, t.status, t.due_date, c.depth
+        FROM (
+            SELECT task_id, MIN(depth) AS depth
+            FROM closure
+            WHERE task_id <> %s
+            GROUP BY task_id
+        ) c
+        JOIN {Task._meta.db_table} t ON t.id = c.task_id
+        ORDER BY c.depth, t.id
+    """
+    return Task.objects.raw(sql, [task_id, max_depth, task_id])
+
+
+def dependency_path_exists(source_id: int, target_id: int, using: Optional[str] = None) -> bool:
+    """
+    Есть ли в БД путь source -> ... -> target по рёбрам parent -> child (один запрос WITH RECURSIVE).
+    Без ограничения глубины: UNION по одной колонке не добавляет уже найденные задачи,
+    поэтому обход конечен и на данных с циклами.
+    """
+    deps = TaskDependency._meta
+    parent_column = deps.get_field("parent_task").column
+    child_column = deps.get_field("child_task").column
+    sql = f"""
+        WITH RECURSIVE reachable (task_id) AS (
+            SELECT d.{child_column}
+            FROM {deps.db_table} d
+            WHERE d.{parent_column} = %s
+            UNION
+            SELECT d.{child_column}
+            FROM {deps.db_table} d
+            JOIN reachable r ON d.{parent_column} = r.task_id
+        )
+        SELECT 1 FROM reachable WHERE task_id = %s LIMIT 1
+    """
+    with connections[using or TaskDependency.objects.db].cursor() as cursor:
+        cursor.execute(sql, [source_id, target_id])
+        return cursor.fetchone() is not None
+
+
+def edges_have_cycle(edges: Iterable[Tuple[int, int]]) -> bool:
+    """Есть ли цикл среди рёбер parent -> child (топологическая сортировка Кана, O(V + E))."""
+    children: Dict[int, List[int]] = {}
+    in_degree: Dict[int, int] = {}
+    for parent, child in edges:
+        children.setdefault(parent, []).append(child)
+        in_degree.setdefault(parent, 0)
+        in_degree[child] = in_degree.get(child, 0) + 1
+
+    stack = [task_id for task_id, degree in in_degree.items() if not degree]
+    visited = 0
+    while stack:
+        task_id = stack.pop()
+        visited += 1
+        for child in children.get(task_id, ()):
+            in_degree[child] -= 1
+            if not in_degree[child]:
+                stack.append(child)
+    return visited < len(in_degree)
@@ -0,0 +1,126 @@
+import mimetypes
+import os
+import re
+from typing import Iterator, Optional, Tuple
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils.http import content_disposition_header
+
+from tracker.models import Task
+
+
+# СКАЧИВАНИЕ ОТЧЁТОВ
+#
+# Права проверяет Django, а сам файл отдаёт прокси (REPORT_DOWNLOAD_BACKEND):
+# - "nginx":    X-Accel-Redirect на internal location (REPORT_ACCEL_REDIRECT_PREFIX)
+# - "sendfile": X-Sendfile с путём к файлу (Apache mod_xsendfile, lighttpd)
+# - "django":   FileResponse (под gunicorn - sendfile через wsgi.file_wrapper),
+#               с поддержкой Range (206) для докачки больших отчётов.
+# При отдаче через прокси Range обрабатывает сам прокси.
+
+DOWNLOAD_BACKENDS = ("django", "nginx", "sendfile")
+RANGE_CHUNK_SIZE = 64 * 1024
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _report_filename(task: Task) -> str:
+    extension = os.path.splitext(task.report_file.name)[1]
+    return f"task-{task.pk}-report{extension}"
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Один диапазон "bytes=start-end" / "bytes=start-" / "bytes=-suffix" -> (start, end) включительно.
+    None - заголовка нет или он не поддерживается (несколько диапазонов): отдаём файл целиком.
+    ValueError - диапазон за пределами файла (416).
+    """
+    match = _RANGE_RE.match(header or "")
+    if match is None:
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        suffix = int(end)
+        if suffix == 0:
+            raise ValueError("empty suffix range")
+        return max(size - suffix, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise ValueError("unsatisfiable range")
+    return start, end
+
+
+def _iter_range(path: str, start: int, end: int) -> Iterator[bytes]:
+    with open(path, "rb") as report:
+        report.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = report.read(min(RANGE_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+def _django_response(request, task: Task, path: str, content_type: str, etag: Optional[str]):
+    size = os.path.getsize(path)
+
+    # If-Range: диапазон только для той же версии файла, иначе - целиком
+    if_range = request.headers.get("If-Range")
+    range_header = request.headers.get("Range") if not if_range or if_range == etag else None
+    try:
+        byte_range = parse_range(range_header, size)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+
+    if byte_range is None:
+        response = FileResponse(open(path, "rb"), content_type=content_type)
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(_iter_range(path, start, end), status=206, content_type=content_type)
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = str(end - start + 1)
+    response["Accept-Ranges"] = "bytes"
+    return response
+
+
+def report_response(request, task: Task):
+    """Ответ со скачиванием отчёта задачи (права уже проверены view)."""
+    if not task.report_file:
+        raise Http404("У задачи нет отчёта.")
+
+    storage = task.report_file.storage
+    name = task.report_file.name
+    try:
+        path = storage.path(name)
+    except NotImplementedError:
+        path = None
+    if path is None or not os.path.isfile(path):
+        raise Http404("Файл отчёта не найден.")
+
+    content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    etag = f'"{task.report_sha256}"' if task.report_sha256 else None
+
+    backend = settings.REPORT_DOWNLOAD_BACKEND
+    if backend not in DOWNLOAD_BACKENDS:
+        raise ImproperlyConfigured(f"REPORT_DOWNLOAD_BACKEND: ожидается одно из {DOWNLOAD_BACKENDS}, получено {backend!r}")
+    if backend == "nginx":
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = quote(f"{settings.REPORT_ACCEL_REDIRECT_PREFIX.rstrip('/')}/{name}")
+    elif backend == "sendfile":
+        response = HttpResponse(content_type=content_type)
+        response["X-Sendfile"] = path
+    else:
+        response = _django_response(request, task, path, content_type, etag)
+
+    response["Content-Disposition"] = content_disposition_header(True, _report_filename(task))
+    if etag:
+        response["ETag"] = etag
+    return response
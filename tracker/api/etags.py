@@ -0,0 +1,56 @@
+import hashlib
+import json
+
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+# ETAG / IF-NONE-MATCH
+#
+# ETag считается из данных, которые и так загружены для ответа (строки страницы,
+# updated_at задачи и связанных сотрудников), до сериализации. Если клиент прислал
+# тот же ETag в If-None-Match, отдаём 304 без сериализации и рендеринга.
+
+
+def make_etag(*parts) -> str:
+    """Сильный ETag из произвольных JSON-совместимых частей (даты приводятся к строке)."""
+    raw = json.dumps(parts, default=str, separators=(",", ":"), sort_keys=True)
+    return quote_etag(hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32])
+
+
+def supports_etag(request) -> bool:
+    """ETag только для GET/HEAD в JSON (HTML-страница DRF зависит от пользователя и сессии)."""
+    renderer = getattr(request, "accepted_renderer", None)
+    return request.method in ("GET", "HEAD") and renderer is not None and renderer.format == "json"
+
+
+def etag_matches(request, etag: str) -> bool:
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+    etags = parse_etags(if_none_match)
+    return "*" in etags or etag in etags
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+
+def task_etag_parts(task) -> tuple:
+    """
+    Версия задачи для ETag: её updated_at и updated_at сотрудников, если они загружены
+    (их ФИО попадают в ответ). Запросов к БД не делает.
+    """
+    parts = [task.pk, task.updated_at]
+    for relation in ("assignee", "owner"):
+        field = type(task)._meta.get_field(relation)
+        if field.is_cached(task):
+            related = field.get_cached_value(task)
+            parts.append(related.updated_at if related is not None else None)
+    return tuple(parts)
+
+
+def task_row_etag_parts(row: dict, columns) -> tuple:
+    """То же для строки values() (columns - task_etag_columns): совпадает с task_etag_parts."""
+    return (row["id"], *(row[column] for column in columns))
@@ -11,6 +11,8 @@ from rest_framework.exceptions import (
 from rest_framework.response import Response
 from rest_framework.views import exception_handler
 
+from tracker.metrics import record_exception
+
 
 # Получаем логгер с именем "tracker"
 logger = logging.getLogger("tracker")
@@ -27,6 +29,7 @@ def custom_exception_handler(exc, context):
 
     # Получаем request (чтобы знать какой метод и какой URL вызвал ошибку)
     request = context.get("request")
+    record_exception(request, exc)  # счётчик исключений по классу (/api/metrics/)
 
     # Попробуем обработать ошибку стандартным способом (ValidationError, PermissionDenied и т.д.)
     response = exception_handler(exc, context)
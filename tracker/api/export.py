@@ -0,0 +1,100 @@
+import csv
+from typing import Any, Dict, Iterable, Iterator
+
+from django.db.models import QuerySet
+from rest_framework import serializers
+from rest_framework.utils.encoders import JSONEncoder
+
+from tracker.models import Task
+
+
+# Колонки выгрузки совпадают с полями TaskSerializer: {колонка: lookup для values_list}
+EXPORT_COLUMNS = {
+    "id": "id",
+    "title": "title",
+    "description": "description",
+    "assignee": "assignee_id",
+    "assignee_full_name": "assignee__full_name",
+    "owner": "owner_id",
+    "owner_full_name": "owner__full_name",
+    "status": "status",
+    "due_date": "due_date",
+    "report_file": "report_file",
+    "report_sha256": "report_sha256",
+    "report_size": "report_size",
+    "review_comment": "review_comment",
+    "created_at": "created_at",
+}
+
+# Сколько строк читаем из серверного курсора за раз и сколько строк отдаём одним куском ответа
+EXPORT_CHUNK_SIZE = 2000
+
+
+def iter_task_rows(queryset: QuerySet[Task], request) -> Iterator[Dict[str, Any]]:
+    """
+    Потоково читает задачи из БД (server-side cursor на PostgreSQL)
+    и отдаёт их словарями в формате TaskSerializer.
+    Модели Task не создаются: берём кортежи values_list с уже подтянутыми ФИО.
+    """
+    created_at_field = serializers.DateTimeField()
+    storage = Task._meta.get_field("report_file").storage
+    columns = list(EXPORT_COLUMNS)
+
+    rows = (
+        queryset
+        .values_list(*EXPORT_COLUMNS.values())
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+
+    for values in rows:
+        row = dict(zip(columns, values))
+        row["due_date"] = row["due_date"].isoformat()
+        row["created_at"] = created_at_field.to_representation(row["created_at"])
+        if row["report_file"]:
+            row["report_file"] = request.build_absolute_uri(storage.url(row["report_file"]))
+        else:
+            row["report_file"] = None
+        yield row
+
+
+def _batched(lines: Iterable[str]) -> Iterator[str]:
+    """Склеиваем строки пачками, чтобы не писать в сокет по одной строке."""
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= EXPORT_CHUNK_SIZE:
+            yield "".join(batch)
+            batch = []
+    if batch:
+        yield "".join(batch)
+
+
+def stream_ndjson(rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Одна задача - одна JSON-строка."""
+    encoder = JSONEncoder(ensure_ascii=False)
+    return _batched(encoder.encode(row) + "\n" for row in rows)
+
+
+class _Echo:
+    """Псевдо-файл для csv.writer: write() просто возвращает строку."""
+    def write(self, value: str) -> str:
+        return value
+
+
+def stream_csv(rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """CSV: заголовок + по строке на задачу (None -> пустая ячейка)."""
+    writer = csv.writer(_Echo())
+
+    def _lines():
+        yield writer.writerow(EXPORT_COLUMNS)
+        for row in rows:
+            yield writer.writerow(row.values())
+
+    return _batched(_lines())
+
+
+# Формат -> (генератор, content-type)
+EXPORT_FORMATS = {
+    "ndjson": (stream_ndjson, "application/x-ndjson; charset=utf-8"),
+    "csv": (stream_csv, "text/csv; charset=utf-8"),
+}
@@ -0,0 +1,102 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorField, TrigramSimilarity
+from django.db import connections
+from django.db.models import FloatField
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast, Greatest
+from rest_framework.filters import OrderingFilter, SearchFilter
+
+from tracker.models import Task
+
+
+# Аннотация ранга полнотекстового поиска (по ней сортирует RankedOrderingFilter)
+SEARCH_RANK = "search_rank"
+
+# Конфигурации PostgreSQL для поиска: заголовки смешанные (русский + английский/коды)
+TASK_SEARCH_CONFIGS = ("russian", "simple")
+
+
+def _task_search_vector() -> RawSQL:
+    """
+    Генерируемая колонка tasks.search_vector (миграция 0007, только PostgreSQL).
+    В модели её нет, поэтому обращаемся к ней через RawSQL.
+    """
+    return RawSQL(f'"{Task._meta.db_table}"."search_vector"', [], output_field=SearchVectorField())
+
+
+def task_full_text_search(queryset, terms: str):
+    """
+    Полнотекстовый поиск задач по GIN-индексу: tsvector @@ websearch-запрос
+    (russian ИЛИ simple) + ранг ts_rank в аннотации search_rank.
+    """
+    query = None
+    for config in TASK_SEARCH_CONFIGS:
+        part = SearchQuery(terms, config=config, search_type="websearch")
+        query = part if query is None else query | part
+
+    vector = _task_search_vector()
+    return (
+        queryset
+        .alias(search_vector=vector)
+        .filter(search_vector=query)
+        # float8: значение ранга в курсоре пагинации должно совпадать с БД без потери точности
+        .annotate(**{SEARCH_RANK: Cast(SearchRank(vector, query), FloatField())})
+    )
+
+
+class TaskFullTextSearchFilter(SearchFilter):
+    """
+    ?q= - полнотекстовый поиск по задачам (PostgreSQL, tsvector + GIN).
+    На других БД - поведение обычного SearchFilter (ILIKE по search_fields).
+    """
+
+    search_param = "q"
+    search_title = "Полнотекстовый поиск"
+    search_description = "Поиск по заголовку и описанию (результаты упорядочены по релевантности)."
+
+    def filter_queryset(self, request, queryset, view):
+        terms = request.query_params.get(self.search_param, "").strip()
+        if not terms:
+            return queryset
+        if connections[queryset.db].vendor != "postgresql":
+            return super().filter_queryset(request, queryset, view)
+        return task_full_text_search(queryset, terms)
+
+
+def trigram_rank(fields, terms: str):
+    """
+    Ранг похожести строки поиска на поля (pg_trgm similarity, максимум по полям), float8.
+    """
+    similarities = [TrigramSimilarity(field, terms) for field in fields]
+    rank = similarities[0] if len(similarities) == 1 else Greatest(*similarities)
+    return Cast(rank, FloatField())
+
+
+class TrigramRankedSearchFilter(SearchFilter):
+    """
+    ?search= с сортировкой по похожести (PostgreSQL, pg_trgm).
+    Отбор строк - как у SearchFilter (ILIKE по search_fields), на PostgreSQL он
+    идёт по GIN-индексам gin_trgm_ops (миграция 0008), а найденные строки
+    получают аннотацию search_rank. На других БД - обычный SearchFilter.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        queryset = super().filter_queryset(request, queryset, view)
+
+        terms = request.query_params.get(self.search_param, "").strip()
+        if not terms or connections[queryset.db].vendor != "postgresql":
+            return queryset
+
+        fields = [field.lstrip("^=@$") for field in self.get_search_fields(view, request)]
+        return queryset.annotate(**{SEARCH_RANK: trigram_rank(fields, terms)})
+
+
+class RankedOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter, который без явного ?ordering= сортирует результаты поиска по релевантности.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        params = request.query_params.get(self.ordering_param)
+        if not params and SEARCH_RANK in queryset.query.annotations:
+            return [f"-{SEARCH_RANK}"]
+        return super().get_ordering(request, queryset, view)
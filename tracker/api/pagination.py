@@ -0,0 +1,192 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, _reverse_ordering
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _encode_value(value):
+    """Значение ключа -> JSON (даты без потери микросекунд)."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Курсорная (keyset) пагинация по составному ключу: (поля сортировки..., id).
+
+    В отличие от стандартной CursorPagination из DRF, курсор хранит значения
+    ВСЕХ полей ключа, поэтому следующая страница выбирается условием
+    WHERE (created_at, id) < (:created_at, :id) без OFFSET - стоимость
+    запроса O(page) на любой глубине таблицы (при наличии составного индекса).
+
+    Сортировка берётся из OrderingFilter (?ordering=...), id добавляется
+    в конец ключа в том же направлении, что и первое поле, чтобы один индекс
+    (field, id) обслуживал и прямой, и обратный порядок.
+    Поля сортировки должны быть NOT NULL.
+    """
+
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    ordering = "-created_at"
+    tiebreaker = "id"
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+
+        names = [order.lstrip("-") for order in ordering]
+        if self.tiebreaker not in names and "pk" not in names:
+            prefix = "-" if ordering[0].startswith("-") else ""
+            ordering = (*ordering, prefix + self.tiebreaker)
+
+        return ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        reverse = bool(self.cursor and self.cursor.reverse)
+        position = self._parse_position(queryset.model) if self.cursor else None
+
+        # Курсорная пагинация всегда задаёт порядок сама
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if position is not None:
+            queryset = queryset.filter(self._position_filter(position, reverse))
+
+        # Берём на одну строку больше, чтобы понять, есть ли следующая страница
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_more = len(results) > len(self.page)
+
+        if reverse:
+            # Запрос шёл в обратном порядке, разворачиваем страницу обратно
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+
+        if not self.page:
+            # Пустая страница при движении назад: до позиции курсора строк нет
+            return remove_query_param(self.base_url, self.cursor_query_param)
+
+        position = self._get_position_from_instance(self.page[-1], self.ordering)
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+
+        if self.page:
+            position = self._get_position_from_instance(self.page[0], self.ordering)
+        else:
+            position = self.cursor.position
+
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            payload = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            position = payload["p"]
+            reverse = bool(payload.get("r", 0))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(position, list):
+            raise NotFound(self.invalid_cursor_message)
+
+        return Cursor(offset=0, reverse=reverse, position=position)
+
+    def encode_cursor(self, cursor):
+        payload = {"p": cursor.position}
+        if cursor.reverse:
+            payload["r"] = 1
+
+        raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        encoded = urlsafe_b64encode(raw).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def _get_position_from_instance(self, instance, ordering):
+        position = []
+        for order in ordering:
+            name = order.lstrip("-")
+            value = instance[name] if isinstance(instance, dict) else getattr(instance, name)
+            position.append(_encode_value(value))
+        return position
+
+    def _parse_position(self, model) -> list:
+        """
+        Проверяем курсор: длина совпадает с ключом сортировки,
+        значения приводим к типам полей модели (иначе 404 Invalid cursor).
+        """
+        position = self.cursor.position
+        if len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        parsed = []
+        for order, value in zip(self.ordering, position):
+            name = order.lstrip("-")
+            try:
+                field = model._meta.get_field("id" if name == "pk" else name)
+            except FieldDoesNotExist:
+                # аннотация (например, ранг поиска) - используем как есть
+                parsed.append(value)
+                continue
+            try:
+                parsed.append(field.to_python(value))
+            except ValidationError:
+                raise NotFound(self.invalid_cursor_message)
+        return parsed
+
+    def _position_filter(self, position: list, reverse: bool) -> Q:
+        """
+        Лексикографическое условие "строго после позиции" для ключа (a, b, id):
+        a > x OR (a = x AND b > y) OR (a = x AND b = y AND id > z),
+        плюс a >= x, чтобы планировщик сразу ограничил диапазон индекса.
+        """
+        condition = Q()
+        equal = Q()
+
+        for order, value in zip(self.ordering, position):
+            name = order.lstrip("-")
+            descending = order.startswith("-")
+            lookup = "lt" if descending != reverse else "gt"
+
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+
+        first = self.ordering[0]
+        first_lookup = "lte" if first.startswith("-") != reverse else "gte"
+        return Q(**{f"{first.lstrip('-')}__{first_lookup}": position[0]}) & condition
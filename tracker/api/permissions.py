@@ -1,22 +1,26 @@
 from rest_framework.permissions import BasePermission
 
+from tracker.api.roles import get_request_roles
+
+
+# Роли определяются один раз на запрос (tracker/api/roles.py), а не запросом к группам в каждом классе
 
 class IsAdminGroup(BasePermission):
     """Доступ только для группы Admin."""
     def has_permission(self, request, view) -> bool:
-        return request.user.is_authenticated and request.user.groups.filter(name="Admin").exists()
+        return request.user.is_authenticated and "Admin" in get_request_roles(request)
 
 
 class IsManagerGroup(BasePermission):
     """Доступ только для группы Manager."""
     def has_permission(self, request, view) -> bool:
-        return request.user.is_authenticated and request.user.groups.filter(name="Manager").exists()
+        return request.user.is_authenticated and "Manager" in get_request_roles(request)
 
 
 class IsEmployeeGroup(BasePermission):
     """Доступ только для группы Employee."""
     def has_permission(self, request, view) -> bool:
-        return request.user.is_authenticated and request.user.groups.filter(name="Employee").exists()
+        return request.user.is_authenticated and "Employee" in get_request_roles(request)
 
 
 class IsAdminOrManager(BasePermission):
@@ -24,4 +28,4 @@ class IsAdminOrManager(BasePermission):
     def has_permission(self, request, view) -> bool:
         if not request.user.is_authenticated:
             return False
-        return request.user.groups.filter(name__in=["Admin", "Manager"]).exists()
+        return not get_request_roles(request).isdisjoint({"Admin", "Manager"})
@@ -0,0 +1,45 @@
+from django.db.models import QuerySet
+
+from tracker.models import Task
+
+
+# Поля сериализатора, которым нужен JOIN на сотрудника: {поле ответа: FK в Task}
+TASK_RELATED_FIELDS = {
+    "assignee_full_name": "assignee",
+    "owner_full_name": "owner",
+}
+
+# Те же поля для values() (быстрый путь списка, tracker/api/rows.py): {поле ответа: колонка JOIN}
+TASK_VALUES_SOURCES = {field: f"{fk}__full_name" for field, fk in TASK_RELATED_FIELDS.items()}
+
+# Колонки задачи, которые нужны всегда: ключ и версия для ETag
+TASK_REQUIRED_COLUMNS = ("id", "updated_at")
+
+
+def task_queryset_for_fields(queryset: QuerySet[Task], fields) -> QuerySet[Task]:
+    """
+    Подстраивает QuerySet задач под набор полей, которые реально будут сериализованы (?fields=):
+    - для *_full_name делаем select_related (один JOIN вместо запроса на каждую строку),
+      без них JOIN не делается вовсе
+    - из задачи и сотрудников выбираются только нужные колонки (only), остальные не читаются
+    """
+    fields = set(fields)
+    concrete = {field.name for field in Task._meta.concrete_fields}
+    columns = {*TASK_REQUIRED_COLUMNS, *(field for field in fields if field in concrete)}
+
+    related = [fk for field, fk in TASK_RELATED_FIELDS.items() if field in fields]
+    if related:
+        queryset = queryset.select_related(*related)
+        for fk in related:
+            columns |= {fk, f"{fk}__full_name", f"{fk}__updated_at"}
+
+    return queryset.only(*columns)
+
+
+def task_etag_columns(fields) -> tuple:
+    """
+    Колонки values() для ETag строки задачи (как task_etag_parts): updated_at задачи
+    и updated_at сотрудников, чьи ФИО попадают в ответ.
+    """
+    fields = set(fields)
+    return ("updated_at", *(f"{fk}__updated_at" for field, fk in TASK_RELATED_FIELDS.items() if field in fields))
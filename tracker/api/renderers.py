@@ -0,0 +1,30 @@
+import json
+
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class _ExportErrorRenderer(BaseRenderer):
+    """
+    Рендереры форматов выгрузки.
+    Сами строки выгрузки потоково формирует view (StreamingHttpResponse),
+    рендерер нужен DRF для выбора формата по ?format= и для ответов с ошибкой.
+    """
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return json.dumps(data, ensure_ascii=False, cls=JSONEncoder).encode(self.charset)
+
+
+class NDJSONRenderer(_ExportErrorRenderer):
+    """Newline-delimited JSON: одна задача - одна строка."""
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+
+class CSVRenderer(_ExportErrorRenderer):
+    """CSV с заголовком из названий колонок."""
+    media_type = "text/csv"
+    format = "csv"
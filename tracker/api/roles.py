@@ -0,0 +1,91 @@
+import threading
+import time
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+
+from django.conf import settings
+from rest_framework_simplejwt.models import TokenUser
+
+
+# Claim access-токена со списком ролей (имён групп) пользователя
+ROLES_CLAIM = "roles"
+
+
+# КЭШ РОЛЕЙ
+#
+# Роли (группы) пользователя определяются один раз на запрос и хранятся в request.
+# Между запросами - кэш в памяти процесса на ROLE_CACHE_TTL секунд:
+# изменения групп в этом процессе сбрасывают его после коммита (tracker/signals.py),
+# в остальных процессах роли обновятся не позже чем через TTL.
+# Истёкшие записи удаляются при записи новых (не чаще раза в TTL), поэтому в кэше
+# только пользователи, приходившие за последние ~2 TTL.
+
+_role_cache: Dict[int, Tuple[float, FrozenSet[str]]] = {}
+_role_cache_lock = threading.Lock()
+_next_prune = 0.0
+
+
+def _prune_role_cache(now: float) -> None:
+    """Удалить истёкшие записи (вызывается под _role_cache_lock)."""
+    global _next_prune
+    if now < _next_prune:
+        return
+    for user_id in [user_id for user_id, (expires, _) in _role_cache.items() if expires <= now]:
+        del _role_cache[user_id]
+    _next_prune = now + settings.ROLE_CACHE_TTL
+
+
+def get_user_roles(user) -> FrozenSet[str]:
+    """Имена групп пользователя: из кэша процесса или одним запросом к БД."""
+    if not user.is_authenticated:
+        return frozenset()
+
+    now = time.monotonic()
+    cached = _role_cache.get(user.pk)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    roles = frozenset(user.groups.values_list("name", flat=True))
+    with _role_cache_lock:
+        _prune_role_cache(now)
+        _role_cache[user.pk] = (now + settings.ROLE_CACHE_TTL, roles)
+    return roles
+
+
+def invalidate_user_roles(user_ids: Optional[Iterable[int]] = None) -> None:
+    """Сбросить кэш ролей указанных пользователей (None - всех)."""
+    with _role_cache_lock:
+        if user_ids is None:
+            _role_cache.clear()
+        else:
+            for user_id in user_ids:
+                _role_cache.pop(user_id, None)
+
+
+def _roles_from_token(request) -> Optional[FrozenSet[str]]:
+    """
+    Роли из подписанного claim access-токена:
+    - при ROLE_CLAIM_TRUSTED (claim фиксируется при выдаче токена,
+      изменения групп вступают в силу только с новым токеном)
+    - всегда для StatelessJWTAuthentication (TokenUser): актуальность claim
+      там проверена по auth_stamp
+    """
+    if request.auth is None:
+        return None
+    if not (settings.ROLE_CLAIM_TRUSTED or isinstance(request.user, TokenUser)):
+        return None
+
+    roles = getattr(request.auth, "payload", {}).get(ROLES_CLAIM)
+    if not isinstance(roles, list):
+        return None  # старый токен без claim - берём роли из БД/кэша
+    return frozenset(roles)
+
+
+def get_request_roles(request) -> FrozenSet[str]:
+    """Роли текущего пользователя, вычисляются не больше одного раза за запрос."""
+    roles = getattr(request, "_tracker_roles", None)
+    if roles is None:
+        roles = _roles_from_token(request)
+        if roles is None:
+            roles = get_user_roles(request.user)
+        request._tracker_roles = roles
+    return roles
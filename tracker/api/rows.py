@@ -0,0 +1,154 @@
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models.fields.files import FieldFile
+from rest_framework import serializers
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from tracker.timing import span
+
+
+# БЫСТРЫЙ ПУТЬ ДЛЯ СПИСКОВ
+#
+# ModelSerializer на каждую строку и каждое поле вызывает get_attribute/to_representation,
+# плюс SerializerMethodField - это основная часть CPU на больших списках.
+# Для list строки берутся через values() (ФИО сотрудников - колонками из JOIN),
+# а dict ответа собирает функция, скомпилированная один раз на процесс из полей того же сериализатора:
+# - поля, где DRF не меняет значение из БД (int, str, bool, id связи), копируются как есть
+# - остальные (даты, файлы, Decimal...) - через to_representation того же поля DRF,
+#   поэтому JSON совпадает байт в байт с ответом сериализатора
+# Сериализатор остаётся для записи и для детальных ответов.
+
+# Рендереров в кэше процесса: сериализатор x набор полей ?fields=
+RENDERER_CACHE_SIZE = 256
+
+# Поля, чьё представление совпадает со значением из БД
+_PASSTHROUGH_FIELDS = (
+    serializers.IntegerField,
+    serializers.CharField,
+    serializers.BooleanField,
+    serializers.ReadOnlyField,
+    serializers.SerializerMethodField,
+)
+
+
+def _passes_through(field) -> bool:
+    if isinstance(field, PrimaryKeyRelatedField):
+        return field.pk_field is None
+    if isinstance(field, serializers.ChoiceField):
+        # DRF отдаёт ключ выбора; у строковых ключей он равен значению из БД
+        return all(isinstance(key, str) for key in field.choices)
+    return isinstance(field, _PASSTHROUGH_FIELDS)
+
+
+def _file_converter(field, model_field):
+    """
+    FileField DRF ждёт FieldFile (url из хранилища), а values() отдаёт имя файла.
+    Абсолютный URL - от request текущего запроса, как в FileField.to_representation.
+    """
+    use_url = getattr(field, "use_url", api_settings.UPLOADED_FILES_USE_URL)
+
+    def convert(name, request):
+        value = field.to_representation(FieldFile(None, model_field, name))
+        if use_url and value is not None and request is not None:
+            return request.build_absolute_uri(value)
+        return value
+    return convert
+
+
+class RowRenderer:
+    """
+    Функция "строка values() -> dict ответа" для полей field_names сериализатора.
+    sources - ключ values() для полей, у которых нет колонки (SerializerMethodField).
+    Не зависит от запроса (request передаётся в render), поэтому кэшируется: get_row_renderer().
+    """
+
+    def __init__(self, serializer_class, field_names: Iterable[str], sources: Optional[Dict[str, str]] = None):
+        sources = sources or {}
+        serializer = serializer_class()
+        model = serializer.Meta.model
+        namespace = {}
+        columns: List[str] = []
+        items: List[str] = []
+
+        for index, name in enumerate(field_names):
+            field = serializer.fields[name]
+            if field.write_only:
+                continue
+            column = sources.get(name) or field.source.replace(".", "__")
+            if column == "*" or isinstance(field, serializers.ManyRelatedField):
+                raise ImproperlyConfigured(f"{serializer_class.__name__}.{name}: нет колонки для values().")
+            columns.append(column)
+
+            if name in sources or _passes_through(field):
+                items.append(f"{name!r}: row[{column!r}]")
+                continue
+
+            if isinstance(field, serializers.FileField):
+                namespace[f"convert_{index}"] = _file_converter(field, model._meta.get_field(column))
+                converted = f"convert_{index}(value_{index}, request)"
+            else:
+                namespace[f"convert_{index}"] = field.to_representation
+                converted = f"convert_{index}(value_{index})"
+            # как ModelSerializer: None отдаётся как None без to_representation
+            items.append(f"{name!r}: None if (value_{index} := row[{column!r}]) is None else {converted}")
+
+        code = "def render_row(row, request):\n    return {\n        " + ",\n        ".join(items) + ",\n    }\n"
+        exec(compile(code, f"<{serializer_class.__name__} row renderer>", "exec"), namespace)
+
+        self.render_row = namespace["render_row"]
+        self.columns = tuple(dict.fromkeys(columns))
+
+    def render(self, rows: Iterable[dict], request=None) -> list:
+        with span("serialize"):
+            return [self.render_row(row, request) for row in rows]
+
+
+@lru_cache(maxsize=RENDERER_CACHE_SIZE)
+def _cached_row_renderer(serializer_class, field_names: Tuple[str, ...], sources: Tuple[Tuple[str, str], ...]):
+    return RowRenderer(serializer_class, field_names, dict(sources))
+
+
+def get_row_renderer(serializer_class, field_names: Iterable[str], sources: Optional[Dict[str, str]] = None) -> RowRenderer:
+    """RowRenderer из кэша процесса: компиляция - один раз на сериализатор и набор полей (?fields=)."""
+    return _cached_row_renderer(serializer_class, tuple(field_names), tuple(sorted((sources or {}).items())))
+
+
+class RowListMixin:
+    """
+    list() через values() и RowRenderer вместо сериализатора (ответ тот же).
+    row_sources - ключи values() для полей без колонки, get_row_columns - доп. колонки
+    (для ETag). Колонки текущей сортировки выбираются всегда - по ним курсор.
+    """
+
+    row_sources: Dict[str, str] = {}
+
+    def get_row_fields(self) -> Tuple[str, ...]:
+        """Поля ответа: запрошенные через ?fields= (SparseFieldsMixin) или все поля сериализатора."""
+        if hasattr(self, "get_requested_fields"):
+            return tuple(self.get_requested_fields())
+        return tuple(self.get_serializer_class()().fields)
+
+    def get_row_renderer(self) -> RowRenderer:
+        return get_row_renderer(self.get_serializer_class(), self.get_row_fields(), self.row_sources)
+
+    def get_row_columns(self, renderer: RowRenderer) -> Iterable[str]:
+        return renderer.columns
+
+    def get_row_queryset(self, renderer: RowRenderer):
+        queryset = self.filter_queryset(self.get_queryset())
+        paginator = self.paginator
+        ordering = paginator.get_ordering(self.request, queryset, self) if hasattr(paginator, "get_ordering") else ()
+        keys = [order.lstrip("-") for order in ordering]
+        return queryset.values(*dict.fromkeys([*self.get_row_columns(renderer), "id", *keys]))
+
+    def list(self, request, *args, **kwargs):
+        renderer = self.get_row_renderer()
+        queryset = self.get_row_queryset(renderer)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(renderer.render(page, request))
+        return Response(renderer.render(queryset, request))
@@ -1,8 +1,9 @@
 from rest_framework import serializers
 from tracker.models import Employee, Task
+from tracker.timing import ServerTimingSerializerMixin
 
 
-class EmployeeSerializer(serializers.ModelSerializer):
+class EmployeeSerializer(ServerTimingSerializerMixin, serializers.ModelSerializer):
     """
     Сериализатор для модели Employee.
     Отвечает за:
@@ -74,7 +75,30 @@ class EmployeeSerializer(serializers.ModelSerializer):
         return attrs
 
 
-class TaskSerializer(serializers.ModelSerializer):
+def task_rules_errors(status, report_file, owner, assignee) -> dict:
+    """
+    Бизнес-правила задачи (те же, что в Task.clean), без обращения к БД.
+    owner/assignee можно передавать объектами или id - сравниваются между собой.
+    Возвращает первую найденную ошибку {поле: сообщение} или пустой словарь.
+    """
+    allowed_statuses = {Task.Status.DONE, Task.Status.REVIEW}
+
+    # 1) Если report_file прикреплён, то статус должен быть DONE или REVIEW
+    if report_file and status not in allowed_statuses:
+        return {"report_file": "Отчёт можно прикреплять только для задач со статусом DONE или REVIEW."}
+
+    # 2) Если статус DONE, то отчёт обязателен
+    if status == Task.Status.DONE and not report_file:
+        return {"report_file": "Для статуса DONE необходимо прикрепить отчёт."}
+
+    # 3) Владелец не может быть исполнителем
+    if assignee is not None and owner == assignee:
+        return {"assignee": "Владелец задачи не может быть её исполнителем."}
+
+    return {}
+
+
+class TaskSerializer(ServerTimingSerializerMixin, serializers.ModelSerializer):
     """
     Сериализатор для задач.
     Принимаем FK (assignee/owner) как id, но отдает -> *_full_name.
@@ -96,10 +120,12 @@ class TaskSerializer(serializers.ModelSerializer):
             "status",
             "due_date",
             "report_file",
+            "report_sha256",
+            "report_size",
             "review_comment",
             "created_at",
         )
-        read_only_fields = ("id", "created_at", "assignee_full_name", "owner_full_name")
+        read_only_fields = ("id", "created_at", "assignee_full_name", "owner_full_name", "report_sha256", "report_size")
 
     def get_assignee_full_name(self, obj: Task) -> str | None:
         """Возвращаем ФИО исполнителя, если он назначен."""
@@ -143,31 +169,46 @@ class TaskSerializer(serializers.ModelSerializer):
             if "owner" not in attrs:
                 owner = self.instance.owner
 
-        allowed_statuses = {Task.Status.DONE, Task.Status.REVIEW}
+        errors = task_rules_errors(status, report_file, owner, assignee)
+        if errors:
+            raise serializers.ValidationError(errors)
 
-        # 1) Если report_file прикреплён, то статус должен быть DONE или REVIEW
-        if report_file and status not in allowed_statuses:
-            raise serializers.ValidationError(
-                {"report_file": "Отчёт можно прикреплять только для задач со статусом DONE или REVIEW."}
-            )
+        return attrs
 
-        # 2) Если статус DONE, то отчёт обязателен
-        if status == Task.Status.DONE and not report_file:
-            raise serializers.ValidationError(
-                {"report_file": "Для статуса DONE необходимо прикрепить отчёт."}
-            )
 
-        # 3) Владелец не может быть исполнителем
-        if assignee is not None and owner == assignee:
-            raise serializers.ValidationError(
-                {"assignee": "Владелец задачи не может быть её исполнителем."}
-            )
+class TaskBulkItemSerializer(TaskSerializer):
+    """
+    Одна строка пакетного создания/обновления задач (POST/PATCH /tasks/bulk/).
+    assignee/owner принимаем как id без запроса к БД на каждую строку:
+    все id всей пачки проверяются одним запросом в tracker/api/bulk.py,
+    там же применяются межполевые правила (task_rules_errors).
+    Файл отчёта через пакетный API не передаётся (JSON).
+    """
+
+    id = serializers.IntegerField(required=False)
+    assignee = serializers.IntegerField(allow_null=True, required=False)
+    owner = serializers.IntegerField(allow_null=True, required=False)
 
+    class Meta(TaskSerializer.Meta):
+        fields = (
+            "id",
+            "title",
+            "description",
+            "assignee",
+            "owner",
+            "status",
+            "due_date",
+            "review_comment",
+        )
+        read_only_fields = ()
+
+    def validate(self, attrs: dict) -> dict:
+        # Межполевые правила проверяются для всей пачки сразу (нужны сотрудники и instance)
         return attrs
 
 
 # Это не ModelSerializer ибо формат ответа "аналитический", а не CRUD
-class TaskShortSerializer(serializers.ModelSerializer):
+class TaskShortSerializer(ServerTimingSerializerMixin, serializers.ModelSerializer):
     """
     Короткий сериализатор задачи для аналитики.
     Используется в списке активных задач сотрудника.
@@ -177,7 +218,18 @@ class TaskShortSerializer(serializers.ModelSerializer):
         fields = ("id", "title", "status", "due_date")
 
 
-class BusyEmployeeSerializer(serializers.Serializer):
+class TaskDependencyNodeSerializer(TaskShortSerializer):
+    """
+    Задача из транзитивной цепочки зависимостей (blockers/dependents).
+    depth - расстояние в связях от исходной задачи (1 - прямая зависимость).
+    """
+    depth = serializers.IntegerField()
+
+    class Meta(TaskShortSerializer.Meta):
+        fields = TaskShortSerializer.Meta.fields + ("depth",)
+
+
+class BusyEmployeeSerializer(ServerTimingSerializerMixin, serializers.Serializer):
     """
     Короткий сериализатор задачи для аналитики "Занятые сотрудники".
     Используется в списке активных задач сотрудника.
@@ -188,7 +240,7 @@ class BusyEmployeeSerializer(serializers.Serializer):
     active_tasks = TaskShortSerializer(many=True)       # список активных задач сотрудника
 
 
-class ImportantTaskSerializer(serializers.Serializer):
+class ImportantTaskSerializer(ServerTimingSerializerMixin, serializers.Serializer):
     """
     Сериализатор для выдачи "важных задач" в аналитике.
     Результат: "важная задача" + "рекомендованный сотрудник"
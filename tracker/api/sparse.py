@@ -0,0 +1,49 @@
+from typing import Optional, Sequence, Tuple
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+
+# SPARSE FIELDSETS (?fields=)
+#
+# GET /api/tasks/?fields=id,title,status,due_date - в ответе только перечисленные поля.
+# Список полей доходит до SQL: в values()/only() попадают только нужные колонки,
+# JOIN на сотрудника - только если запрошено его ФИО (tracker/api/querysets.py).
+# Порядок ключей в ответе - как в сериализаторе. Для записи (POST/PUT/PATCH)
+# сериализатор всегда полный.
+
+FIELDS_PARAM = "fields"
+
+
+def parse_fields_param(value: Optional[str], available: Sequence[str]) -> Optional[Tuple[str, ...]]:
+    """"id,title" -> поля в порядке сериализатора; None - параметр не передан. Неизвестные поля - 400."""
+    if value is None:
+        return None
+    requested = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = sorted(requested - set(available))
+    if unknown:
+        raise ValidationError({FIELDS_PARAM: [f"Неизвестные поля: {', '.join(unknown)}."]})
+    if not requested:
+        raise ValidationError({FIELDS_PARAM: ["Укажите хотя бы одно поле."]})
+    return tuple(name for name in available if name in requested)
+
+
+class SparseFieldsMixin:
+    """?fields= для чтения (list/retrieve): сериализатор без лишних полей, get_requested_fields() - для SQL."""
+
+    sparse_actions = ("list", "retrieve")
+
+    def get_requested_fields(self):
+        """Поля сериализатора, которые будут в ответе."""
+        available = self.get_serializer_class().Meta.fields
+        if self.action not in self.sparse_actions or self.request.method not in SAFE_METHODS:
+            return available
+        return parse_fields_param(self.request.query_params.get(FIELDS_PARAM), available) or available
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        requested = set(self.get_requested_fields())
+        target = getattr(serializer, "child", serializer)
+        for name in [name for name in target.fields if name not in requested]:
+            target.fields.pop(name)
+        return serializer
@@ -0,0 +1,254 @@
+import os
+import re
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.http import UnreadablePostError
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.exceptions import APIException, NotFound
+
+from tracker.api.serializers import task_rules_errors
+from tracker.models import ReportUpload, Task
+from tracker.storage import StagedFile, file_sha256
+
+
+# ДОКАЧИВАЕМАЯ ЗАГРУЗКА ОТЧЁТОВ
+#
+# 1) POST /api/report-uploads/ {"task", "filename", "size", "sha256"?} - сессия и пустой файл
+#    в REPORT_UPLOAD_DIR
+# 2) PUT /api/report-uploads/{id}/ с "Content-Range: bytes start-end/size" и байтами части в теле:
+#    часть пишется в файл по смещению прямо из потока запроса, без буферизации.
+#    start должен совпадать с принятым смещением (offset), иначе 409 - клиент узнаёт offset
+#    через GET и продолжает с него. Если соединение оборвалось, принятое до обрыва сохраняется.
+# 3) POST /api/report-uploads/{id}/finalize/ {"status"?} - проверка правил Task.clean
+#    (только здесь: статус задачи мог смениться за время загрузки), файл переносится
+#    в хранилище отчётов переименованием и прикрепляется к задаче.
+# Сессии без новых частей дольше REPORT_UPLOAD_EXPIRE_HOURS удаляет manage.py cleanup_report_uploads.
+
+WRITE_CHUNK_SIZE = 1024 * 1024
+PART_SUFFIX = ".part"
+_CONTENT_RANGE_RE = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+
+
+class UploadOffsetConflict(APIException):
+    """Часть начинается не с принятого смещения (повтор или пропуск части)."""
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Смещение части не совпадает с принятым."
+    default_code = "offset_conflict"
+
+
+def upload_path(upload: ReportUpload) -> str:
+    return os.path.join(settings.REPORT_UPLOAD_DIR, f"{upload.pk.hex}{PART_SUFFIX}")
+
+
+def upload_expiry() -> timedelta:
+    return timedelta(hours=settings.REPORT_UPLOAD_EXPIRE_HOURS)
+
+
+def active_uploads():
+    """Сессии, в которые ещё можно писать (брошенные ждут удаления командой)."""
+    return ReportUpload.objects.filter(updated_at__gte=timezone.now() - upload_expiry())
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def discard_upload(upload: ReportUpload) -> None:
+    """Удалить сессию и (после коммита) её файл."""
+    path = upload_path(upload)
+    upload.delete()
+    transaction.on_commit(lambda: _remove(path))
+
+
+class ReportUploadSerializer(serializers.ModelSerializer):
+    """Сессия загрузки: клиент задаёт задачу, имя и размер файла, сервер ведёт offset."""
+
+    expires_at = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ReportUpload
+        fields = ("id", "task", "filename", "size", "sha256", "offset", "created_at", "expires_at")
+        read_only_fields = ("id", "offset", "created_at", "expires_at")
+
+    def get_expires_at(self, obj: ReportUpload) -> datetime:
+        return obj.updated_at + upload_expiry()
+
+    def validate_filename(self, value: str) -> str:
+        value = os.path.basename(value.replace("\\", "/")).strip()
+        if not value:
+            raise serializers.ValidationError("Имя файла не может быть пустым.")
+        return value
+
+    def validate_size(self, value: int) -> int:
+        if not 0 < value <= settings.REPORT_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(
+                f"Размер файла должен быть от 1 до {settings.REPORT_UPLOAD_MAX_SIZE} байт."
+            )
+        return value
+
+    def validate_sha256(self, value: str) -> str:
+        value = value.lower()
+        if value and not re.fullmatch(r"[0-9a-f]{64}", value):
+            raise serializers.ValidationError("Ожидается SHA-256 в hex (64 символа).")
+        return value
+
+    def create(self, validated_data):
+        upload = super().create(validated_data)
+        os.makedirs(settings.REPORT_UPLOAD_DIR, exist_ok=True)
+        open(upload_path(upload), "wb").close()
+        return upload
+
+
+class ReportUploadFinalizeSerializer(serializers.Serializer):
+    """Статус задачи, с которым прикрепляется отчёт (по умолчанию - текущий)."""
+    status = serializers.ChoiceField(choices=Task.Status.choices, required=False)
+
+
+def parse_content_range(header: Optional[str], size: int) -> Tuple[int, int]:
+    """"bytes start-end/size" -> (start, end) включительно, size - размер файла сессии."""
+    match = _CONTENT_RANGE_RE.match(header or "")
+    if match is None:
+        raise serializers.ValidationError({"Content-Range": ["Ожидается заголовок вида bytes start-end/size."]})
+    start, end, total = (int(value) for value in match.groups())
+    if total != size or start > end or end >= size:
+        raise serializers.ValidationError({"Content-Range": [f"Диапазон за пределами файла ({size} байт)."]})
+    return start, end
+
+
+def write_chunk(upload: ReportUpload, request) -> ReportUpload:
+    """
+    Записать часть из тела запроса по смещению upload.offset.
+    Тело читается из потока кусками по WRITE_CHUNK_SIZE и сразу пишется в файл.
+    """
+    start, end = parse_content_range(request.headers.get("Content-Range"), upload.size)
+    if start != upload.offset:
+        raise UploadOffsetConflict(f"Принято байт: {upload.offset}, часть должна начинаться с этого смещения.")
+    length = end - start + 1
+    if request.headers.get("Content-Length") != str(length):
+        raise serializers.ValidationError({"Content-Length": [f"Ожидается длина части {length}."]})
+
+    path = upload_path(upload)
+    if not os.path.isfile(path):
+        raise NotFound("Файл сессии загрузки не найден.")
+
+    received = 0
+    interrupted = False
+    with open(path, "r+b") as part:
+        part.seek(start)
+        try:
+            while received < length:
+                data = request.read(min(WRITE_CHUNK_SIZE, length - received))
+                if not data:
+                    break
+                part.write(data)
+                received += len(data)
+        except UnreadablePostError:
+            interrupted = True  # клиент оборвал соединение: сохраняем то, что успело прийти
+        part.flush()
+        os.fsync(part.fileno())  # offset подтверждается только для данных, уже записанных на диск
+
+    # Смещение двигаем, только если его не сдвинул параллельный запрос с той же частью
+    now = timezone.now()
+    moved = ReportUpload.objects.filter(pk=upload.pk, offset=start).update(offset=start + received, updated_at=now)
+    if not moved:
+        upload.refresh_from_db()
+        raise UploadOffsetConflict(f"Часть уже принята другим запросом, принято байт: {upload.offset}.")
+    upload.offset, upload.updated_at = start + received, now
+
+    if interrupted or received < length:
+        raise serializers.ValidationError(
+            {"Content-Range": [f"Часть получена не полностью, принято байт: {upload.offset}."]}
+        )
+    return upload
+
+
+def finalize_upload(upload: ReportUpload, new_status: Optional[str] = None) -> Task:
+    """
+    Прикрепить загруженный файл к задаче. Правила Task.clean проверяются здесь,
+    а не при создании сессии: статус задачи мог измениться, пока шла загрузка.
+    """
+    if upload.offset != upload.size:
+        raise serializers.ValidationError(
+            {"offset": [f"Файл загружен не полностью: {upload.offset} из {upload.size} байт."]}
+        )
+
+    path = upload_path(upload)
+    if not os.path.isfile(path):
+        raise NotFound("Файл сессии загрузки не найден.")
+    os.truncate(path, upload.size)  # хвост от оборванных повторов части, если он был
+
+    # Хеш считаем до транзакции: чтение сотен МБ не должно держать блокировку задачи
+    with open(path, "rb") as part:
+        sha256 = file_sha256(File(part))
+    if upload.sha256 and sha256 != upload.sha256:
+        discard_upload(upload)
+        raise serializers.ValidationError(
+            {"sha256": ["Хеш загруженного файла не совпадает с ожидаемым, загрузку нужно начать заново."]}
+        )
+
+    with transaction.atomic():
+        if not ReportUpload.objects.select_for_update().filter(pk=upload.pk).exists():
+            raise NotFound("Сессия загрузки уже завершена.")
+        task = Task.objects.select_for_update().get(pk=upload.task_id)
+        new_status = new_status or task.status
+
+        errors = task_rules_errors(new_status, True, task.owner_id, task.assignee_id)
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        staged = StagedFile(path, f"report{os.path.splitext(upload.filename)[1]}", sha256)
+        try:
+            task.report_file = staged
+            task.status = new_status
+            task.save()
+        finally:
+            staged.close()
+        upload.delete()
+        # При дедупликации файл не переносится - удаляем его после коммита
+        transaction.on_commit(lambda: _remove(path))
+    return task
+
+
+def cleanup_expired_uploads(dry_run: bool = False) -> Tuple[int, int]:
+    """
+    Удалить брошенные сессии и их файлы, а также файлы без сессии
+    (задачу удалили вместе с сессией) старше срока жизни сессии.
+    Возвращает (сессий, файлов).
+    """
+    cutoff = timezone.now() - upload_expiry()
+    expired = list(ReportUpload.objects.filter(updated_at__lt=cutoff).values_list("pk", flat=True))
+    if not dry_run and expired:
+        ReportUpload.objects.filter(pk__in=expired, updated_at__lt=cutoff).delete()
+        for upload_id in expired:
+            _remove(os.path.join(settings.REPORT_UPLOAD_DIR, f"{upload_id.hex}{PART_SUFFIX}"))
+
+    try:
+        names = os.listdir(settings.REPORT_UPLOAD_DIR)
+    except FileNotFoundError:
+        return len(expired), 0
+
+    alive = {upload_id.hex for upload_id in ReportUpload.objects.values_list("pk", flat=True)}
+    removed = 0
+    for name in names:
+        upload_id, suffix = os.path.splitext(name)
+        path = os.path.join(settings.REPORT_UPLOAD_DIR, name)
+        if suffix != PART_SUFFIX or upload_id in alive:
+            continue
+        try:
+            # файл без сессии моложе срока жизни - возможно, строка сессии ещё не закоммичена
+            if os.path.getmtime(path) >= cutoff.timestamp():
+                continue
+        except FileNotFoundError:
+            continue
+        if not dry_run:
+            _remove(path)
+        removed += 1
+    return len(expired), removed
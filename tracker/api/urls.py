@@ -1,8 +1,12 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 
+from tracker.api import async_views
+
 from tracker.api.views import (
     EmployeeViewSet,
     TaskViewSet,
+    ReportUploadViewSet,
     AnalyticsViewSet,
 )
 
@@ -10,7 +14,12 @@ from tracker.api.views import (
 router = DefaultRouter()
 router.register("employees", EmployeeViewSet, basename="employees")
 router.register("tasks", TaskViewSet, basename="tasks")
+router.register("report-uploads", ReportUploadViewSet, basename="report-uploads")
 router.register("analytics", AnalyticsViewSet, basename="analytics")
 
 # готовый список urlpattern'ов
-urlpatterns = router.urls
+urlpatterns = router.urls + [
+    # async-варианты аналитики (имеют смысл под ASGI-сервером)
+    path("async/analytics/busy-employees/", async_views.busy_employees, name="async-busy-employees"),
+    path("async/analytics/important-tasks/", async_views.important_tasks, name="async-important-tasks"),
+]
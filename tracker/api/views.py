@@ -1,21 +1,55 @@
-from rest_framework.viewsets import ModelViewSet, ViewSet
+from rest_framework.viewsets import GenericViewSet, ModelViewSet, ViewSet
+from rest_framework import mixins
 from rest_framework.decorators import action  # создать кастомный URL
 from rest_framework.response import Response  # вернуть JSON корректно
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import SearchFilter
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.permissions import SAFE_METHODS
-from drf_spectacular.utils import extend_schema
+from django.http import StreamingHttpResponse
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter, OpenApiTypes
 import logging                                 # для логов
 
 from tracker.api.permissions import IsAdminOrManager, IsAdminGroup
+from tracker.api.querysets import TASK_VALUES_SOURCES, task_etag_columns, task_queryset_for_fields
+from tracker.api.etags import (
+    etag_matches,
+    make_etag,
+    not_modified,
+    supports_etag,
+    task_etag_parts,
+    task_row_etag_parts,
+)
+from tracker.api.filters import RankedOrderingFilter, TaskFullTextSearchFilter, TrigramRankedSearchFilter
+from tracker.api.export import EXPORT_FORMATS, iter_task_rows
+from tracker.api.bulk import bulk_create_tasks, bulk_update_tasks
+from tracker.api.dependencies import DEPENDENCY_MAX_DEPTH, get_dependency_closure
+from tracker.api.downloads import report_response
+from tracker.api.uploads import (
+    ReportUploadFinalizeSerializer,
+    ReportUploadSerializer,
+    active_uploads,
+    discard_upload,
+    finalize_upload,
+    write_chunk,
+)
+from tracker.api.renderers import NDJSONRenderer, CSVRenderer
+from tracker.api.rows import RowListMixin
+from tracker.api.sparse import FIELDS_PARAM, SparseFieldsMixin
 from tracker.models import Employee, Task
+from tracker.timing import ServerTimingViewMixin
 from tracker.api.analytics import (
-    get_busy_employees,
+    apply_important_task_suggestions,
+    cached_analytics,
+    get_busy_employees_payload,
     get_important_tasks_with_suggestion,
 )
 from tracker.api.serializers import (
     EmployeeSerializer,
     TaskSerializer,
+    TaskBulkItemSerializer,
+    TaskDependencyNodeSerializer,
     BusyEmployeeSerializer,
     ImportantTaskSerializer,
 )
@@ -23,13 +57,22 @@ from tracker.api.serializers import (
 
 logger = logging.getLogger("tracker")
 
+# ?fields=id,title - только перечисленные поля в ответе (и в SQL)
+FIELDS_PARAMETER = OpenApiParameter(
+    FIELDS_PARAM, OpenApiTypes.STR, description="Поля ответа через запятую (по умолчанию - все)."
+)
+
 
-class EmployeeViewSet(ModelViewSet):
+@extend_schema_view(
+    list=extend_schema(parameters=[FIELDS_PARAMETER]),
+    retrieve=extend_schema(parameters=[FIELDS_PARAMETER]),
+)
+class EmployeeViewSet(ServerTimingViewMixin, SparseFieldsMixin, RowListMixin, ModelViewSet):
     """
     ViewSet для CRUD-операций с сотрудниками.
     По правилам ролей: доступ только для Admin.
     ModelViewSet автоматически реализует:
-    - list   (GET /employees/)
+    - list   (GET /employees/, через values() - RowListMixin)
     - create (POST /employees/)
     - retrieve (GET /employees/{id}/)
     - update (PUT /employees/{id}/)
@@ -43,8 +86,8 @@ class EmployeeViewSet(ModelViewSet):
     # Сериализатор, который будет использоваться
     serializer_class = EmployeeSerializer
 
-    # Подключаем DRF SearchFilter
-    filter_backends = [SearchFilter, OrderingFilter]
+    # Поиск (на PostgreSQL - по trigram-индексам с сортировкой по похожести) и сортировка
+    filter_backends = [TrigramRankedSearchFilter, RankedOrderingFilter]
 
     # Поля, по которым разрешён поиск
     search_fields = ["full_name", "position", "email"]
@@ -53,12 +96,23 @@ class EmployeeViewSet(ModelViewSet):
     ordering_fields = ["created_at", "full_name", "position", "is_active"]
     ordering = ["-created_at"]
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == "retrieve":
+            # ?fields= - только запрошенные колонки (список идёт через values() - RowListMixin)
+            queryset = queryset.only("id", *self.get_requested_fields())
+        return queryset
+
     def get_permissions(self):
         # Любые действия с сотрудниками разрешены только Admin
         return [IsAdminGroup()]
 
 
-class TaskViewSet(ModelViewSet):
+@extend_schema_view(
+    list=extend_schema(parameters=[FIELDS_PARAMETER]),
+    retrieve=extend_schema(parameters=[FIELDS_PARAMETER]),
+)
+class TaskViewSet(ServerTimingViewMixin, SparseFieldsMixin, RowListMixin, ModelViewSet):
     """
     CRUD API для задач.
     Роли:
@@ -71,19 +125,78 @@ class TaskViewSet(ModelViewSet):
     # Сериализатор, который будет использоваться
     serializer_class = TaskSerializer
 
-    # Фильтрация, поиск, сортировка
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    # Фильтрация, поиск (?search= - ILIKE, ?q= - полнотекстовый), сортировка
+    filter_backends = [DjangoFilterBackend, SearchFilter, TaskFullTextSearchFilter, RankedOrderingFilter]
 
     # Минимальные фильтры
     filterset_fields = ["status", "assignee", "owner"]
 
-    # Поиск
+    # Поиск (для ?q= - запасной вариант на БД без полнотекстового поиска)
     search_fields = ["title", "description"]
 
     # Сортировка
     ordering_fields = ["created_at", "due_date", "status"]
     ordering = ["-created_at"]
 
+    # Действия, которые отдают задачи через TaskSerializer
+    serialized_actions = ("list", "retrieve", "update", "partial_update")
+
+    # ФИО сотрудников в списке (values()) - колонками из JOIN
+    row_sources = TASK_VALUES_SOURCES
+
+    def get_queryset(self):
+        """
+        QuerySet строим от полей, которые пойдут в ответ (?fields=):
+        JOIN на assignee/owner вместо N+1 запросов в get_*_full_name, только нужные колонки.
+        """
+        queryset = super().get_queryset()
+        if self.action in self.serialized_actions:
+            queryset = task_queryset_for_fields(queryset, self.get_requested_fields())
+        return queryset
+
+    def get_row_columns(self, renderer):
+        return (*renderer.columns, *task_etag_columns(self.get_requested_fields()))
+
+    def list(self, request, *args, **kwargs):
+        """
+        Список задач с ETag: страница строк values() выбирается как обычно, ETag считается по ним
+        (id, updated_at задач и сотрудников) и ссылкам, совпал с If-None-Match - 304 без рендеринга.
+        Строки ответа собирает RowRenderer (JSON тот же, что у TaskSerializer).
+        """
+        renderer = self.get_row_renderer()
+        queryset = self.get_row_queryset(renderer)
+        page = self.paginate_queryset(queryset)
+        rows = page if page is not None else list(queryset)
+
+        etag = None
+        if supports_etag(request):
+            columns = task_etag_columns(self.get_requested_fields())
+            links = (self.paginator.get_next_link(), self.paginator.get_previous_link()) if page is not None else ()
+            etag = make_etag(request.build_absolute_uri(), links, [task_row_etag_parts(row, columns) for row in rows])
+            if etag_matches(request, etag):
+                return not_modified(etag)
+
+        data = renderer.render(rows, request)
+        response = self.get_paginated_response(data) if page is not None else Response(data)
+        if etag:
+            response["ETag"] = etag
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        """Задача с ETag (updated_at задачи и сотрудников из того же запроса)."""
+        task = self.get_object()
+
+        etag = None
+        if supports_etag(request):
+            etag = make_etag(request.build_absolute_uri(), task_etag_parts(task))
+            if etag_matches(request, etag):
+                return not_modified(etag)
+
+        response = Response(self.get_serializer(task).data)
+        if etag:
+            response["ETag"] = etag
+        return response
+
     def get_permissions(self):
         # SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
         # Чтение разрешаем всем, кто прошёл IsAuthenticated (он в settings)
@@ -93,8 +206,198 @@ class TaskViewSet(ModelViewSet):
         # Любые изменения только Admin/Manager
         return [IsAdminOrManager()]
 
+    @extend_schema(
+        summary="Выгрузка задач",
+        description=(
+                "Потоковая выгрузка всех задач в формате NDJSON или CSV. "
+                "Поддерживает те же фильтры, поиск и сортировку, что и список задач, без пагинации."
+        ),
+        parameters=[OpenApiParameter("format", OpenApiTypes.STR, enum=[*EXPORT_FORMATS])],
+        responses={(200, "application/x-ndjson"): OpenApiTypes.STR, (200, "text/csv"): OpenApiTypes.STR},
+    )
+    @action(detail=False, methods=["get"], url_path="export", renderer_classes=[NDJSONRenderer, CSVRenderer])
+    def export(self, request):
+        """
+        Выгрузка для BI: строки читаются из БД курсором пачками
+        и сразу пишутся в ответ, в памяти воркера целиком не собираются.
+        """
+        export_format = request.accepted_renderer.format  # выбран DRF по ?format=ndjson|csv
+        stream, content_type = EXPORT_FORMATS[export_format]
+
+        logger.info("Tasks export requested (user_id=%s, format=%s)", getattr(request.user, "id", None), export_format)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(stream(iter_task_rows(queryset, request)), content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="tasks.{export_format}"'
+        return response
+
+    @extend_schema(
+        summary="Пакетное создание/обновление задач",
+        description=(
+                "POST - создание списка задач, PATCH - частичное обновление списка задач (в каждой строке id). "
+                "Вся пачка проверяется целиком, ошибки возвращаются списком по строкам; "
+                "запись выполняется одной транзакцией (всё или ничего)."
+        ),
+        request=TaskBulkItemSerializer(many=True),
+        responses={200: TaskSerializer(many=True), 201: TaskSerializer(many=True)},
+    )
+    @action(detail=False, methods=["post", "patch"], url_path="bulk")
+    def bulk(self, request):
+        """
+        Импорт задач пачкой вместо тысяч отдельных POST/PATCH.
+        """
+        if request.method == "POST":
+            tasks = bulk_create_tasks(request.data)
+            response_status = status.HTTP_201_CREATED
+        else:
+            tasks = bulk_update_tasks(request.data)
+            response_status = status.HTTP_200_OK
+
+        logger.info(
+            "Tasks bulk %s: %s rows (user_id=%s)",
+            request.method, len(tasks), getattr(request.user, "id", None),
+        )
+
+        # Ответ в формате TaskSerializer: перечитываем задачи одним запросом с JOIN на сотрудников
+        queryset = task_queryset_for_fields(
+            Task.objects.filter(id__in=[task.id for task in tasks]),
+            TaskSerializer.Meta.fields,
+        )
+        by_id = {task.id: task for task in queryset}
+        serializer = TaskSerializer([by_id[task.id] for task in tasks], many=True, context=self.get_serializer_context())
+        return Response(serializer.data, status=response_status)
+
+    @extend_schema(
+        summary="Скачать отчёт задачи",
+        description=(
+                "Отдаёт файл отчёта (attachment). Права проверяются как для чтения задачи, "
+                "сам файл отдаёт прокси (X-Accel-Redirect / X-Sendfile) или Django с поддержкой Range."
+        ),
+        responses={(200, "application/octet-stream"): OpenApiTypes.BINARY, 206: OpenApiTypes.BINARY},
+    )
+    @action(detail=True, methods=["get"], url_path="report")
+    def report(self, request, pk=None):
+        task = self.get_object()
+        logger.info("Task report download (task_id=%s, user_id=%s)", task.pk, getattr(request.user, "id", None))
+        return report_response(request, task)
+
+    def _dependency_closure_response(self, request, direction: str) -> Response:
+        """Общая часть blockers/dependents: проверка задачи и ?max_depth, один рекурсивный запрос."""
+        task = self.get_object()  # 404, если задачи нет
+
+        max_depth = request.query_params.get("max_depth")
+        if max_depth is not None:
+            if not max_depth.isdigit() or int(max_depth) < 1:
+                raise ValidationError({"max_depth": ["Ожидается целое число от 1."]})
+            max_depth = int(max_depth)
+
+        closure = get_dependency_closure(task.id, direction, max_depth)
+        return Response(TaskDependencyNodeSerializer(closure, many=True).data)
+
+    @extend_schema(
+        summary="Блокирующие задачи",
+        description=(
+                "Все задачи, от которых транзитивно зависит данная, с глубиной связи (1 - прямая зависимость). "
+                f"Глубина обхода ограничена параметром max_depth (не больше {DEPENDENCY_MAX_DEPTH})."
+        ),
+        parameters=[OpenApiParameter("max_depth", OpenApiTypes.INT)],
+        responses={200: TaskDependencyNodeSerializer(many=True)},
+    )
+    @action(detail=True, methods=["get"], url_path="blockers", pagination_class=None)
+    def blockers(self, request, pk=None):
+        return self._dependency_closure_response(request, "blockers")
+
+    @extend_schema(
+        summary="Зависимые задачи",
+        description=(
+                "Все задачи, которые транзитивно зависят от данной, с глубиной связи (1 - прямая зависимость). "
+                f"Глубина обхода ограничена параметром max_depth (не больше {DEPENDENCY_MAX_DEPTH})."
+        ),
+        parameters=[OpenApiParameter("max_depth", OpenApiTypes.INT)],
+        responses={200: TaskDependencyNodeSerializer(many=True)},
+    )
+    @action(detail=True, methods=["get"], url_path="dependents", pagination_class=None)
+    def dependents(self, request, pk=None):
+        return self._dependency_closure_response(request, "dependents")
+
+
+class ReportUploadViewSet(
+    ServerTimingViewMixin,
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.DestroyModelMixin,
+    GenericViewSet,
+):
+    """
+    Докачиваемая загрузка больших отчётов (tracker/api/uploads.py):
+    - create   (POST /report-uploads/) - открыть сессию
+    - update   (PUT /report-uploads/{id}/) - часть файла с Content-Range
+    - retrieve (GET /report-uploads/{id}/) - сколько байт принято (offset), с него продолжать
+    - finalize (POST /report-uploads/{id}/finalize/) - прикрепить файл к задаче
+    - destroy  (DELETE /report-uploads/{id}/) - отменить загрузку
+    Как и изменение задач - только Admin/Manager, каждый видит только свои сессии.
+    """
+
+    serializer_class = ReportUploadSerializer
+    pagination_class = None
+
+    def get_permissions(self):
+        return [IsAdminOrManager()]
+
+    def get_queryset(self):
+        return active_uploads().filter(created_by_id=self.request.user.id)
+
+    def perform_create(self, serializer):
+        upload = serializer.save(created_by_id=self.request.user.id)
+        logger.info(
+            "Report upload started (upload_id=%s, task_id=%s, size=%s, user_id=%s)",
+            upload.pk, upload.task_id, upload.size, self.request.user.id,
+        )
 
-class AnalyticsViewSet(ViewSet):
+    @extend_schema(
+        summary="Часть файла отчёта",
+        description=(
+                "Тело запроса - байты части (application/octet-stream), положение части - в заголовке "
+                "Content-Range: bytes start-end/size. start должен совпадать с offset сессии, иначе 409."
+        ),
+        parameters=[OpenApiParameter("Content-Range", OpenApiTypes.STR, OpenApiParameter.HEADER, required=True)],
+        request={"application/octet-stream": OpenApiTypes.BINARY},
+        responses={200: ReportUploadSerializer},
+    )
+    def update(self, request, pk=None):
+        # request.data не трогаем: тело читается потоком прямо в файл сессии
+        upload = write_chunk(self.get_object(), request)
+        return Response(self.get_serializer(upload).data)
+
+    def perform_destroy(self, instance):
+        discard_upload(instance)
+
+    @extend_schema(
+        summary="Завершить загрузку отчёта",
+        description=(
+                "Прикрепляет загруженный файл к задаче (можно сразу сменить статус). "
+                "Правила задачи (отчёт только для DONE/REVIEW) проверяются здесь, а не при создании сессии."
+        ),
+        request=ReportUploadFinalizeSerializer,
+        responses={200: TaskSerializer},
+    )
+    @action(detail=True, methods=["post"], url_path="finalize")
+    def finalize(self, request, pk=None):
+        params = ReportUploadFinalizeSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+        upload = self.get_object()
+
+        task = finalize_upload(upload, params.validated_data.get("status"))
+        logger.info(
+            "Report upload finished (upload_id=%s, task_id=%s, user_id=%s)",
+            upload.pk, task.pk, getattr(request.user, "id", None),
+        )
+
+        task = task_queryset_for_fields(Task.objects.filter(pk=task.pk), TaskSerializer.Meta.fields).get()
+        return Response(TaskSerializer(task, context=self.get_serializer_context()).data)
+
+
+class AnalyticsViewSet(ServerTimingViewMixin, ViewSet):
     """
     Аналитические эндпоинты проекта.
     Только чтение (GET).
@@ -105,6 +408,21 @@ class AnalyticsViewSet(ViewSet):
         # Аналитика доступна только Admin/Manager
         return [IsAdminOrManager()]
 
+    @staticmethod
+    def _cached_response(request, name, builder) -> Response:
+        """Ответ из кэша аналитики с ETag по содержимому; совпал с If-None-Match - 304."""
+        data, etag, hit = cached_analytics(name, builder)
+        headers = {"X-Cache": "HIT" if hit else "MISS"}
+
+        if not supports_etag(request):
+            return Response(data, headers=headers)
+        if etag_matches(request, etag):
+            response = not_modified(etag)
+        else:
+            response = Response(data, headers={**headers, "ETag": etag})
+        response["X-Cache"] = headers["X-Cache"]
+        return response
+
     @extend_schema(
         summary="Занятые сотрудники",
         description=(
@@ -120,26 +438,42 @@ class AnalyticsViewSet(ViewSet):
         """
         logger.info("Analytics busy-employees requested (user_id=%s)", getattr(request.user, "id", None))
 
-        data = get_busy_employees()  # возвращает list[dict]
-
-        serializer = BusyEmployeeSerializer(data, many=True)
-        return Response(serializer.data)  # (режим ввода)
+        # В кэш кладём уже готовый ответ (на PostgreSQL он собирается одним запросом в БД)
+        return self._cached_response(request, "busy-employees", get_busy_employees_payload)
 
     @extend_schema(
         summary="Важные задачи",
         description=(
                 "Возвращает список важных задач и рекомендованного сотрудника для каждой задачи. "
-                "Рекомендация может быть пустой (null), если подходящий сотрудник не найден."
+                "Рекомендации распределяются с учётом нагрузки, уже выданной предыдущим задачам списка. "
+                "Рекомендация может быть пустой (null), если подходящий сотрудник не найден. "
+                "POST с ?commit=true назначает рекомендованных исполнителей одним обновлением."
         ),
+        parameters=[OpenApiParameter("commit", OpenApiTypes.BOOL, description="Только для POST")],
         responses={200: ImportantTaskSerializer(many=True)},
     )
-    @action(detail=False, methods=["get"], url_path="important-tasks")
+    @action(detail=False, methods=["get", "post"], url_path="important-tasks")
     def important_tasks(self, request):
         """
         Возвращает важные задачи + рекомендуемого сотрудника.
+        POST ?commit=true - ещё и применяет рекомендации (без commit - пробный расчёт).
         """
         logger.info("Analytics important-tasks requested (user_id=%s)", getattr(request.user, "id", None))
 
-        data = get_important_tasks_with_suggestion()
-        serializer = ImportantTaskSerializer(data, many=True)
-        return Response(serializer.data)
+        if request.method == "POST":
+            commit = request.query_params.get("commit", "").lower() in ("1", "true", "yes")
+            if commit:
+                results = apply_important_task_suggestions()
+                logger.info(
+                    "Important tasks assigned: %s tasks (user_id=%s)",
+                    len(results), getattr(request.user, "id", None),
+                )
+            else:
+                results = get_important_tasks_with_suggestion()
+            return Response(ImportantTaskSerializer(results, many=True).data)
+
+        return self._cached_response(
+            request,
+            "important-tasks",
+            lambda: ImportantTaskSerializer(get_important_tasks_with_suggestion(), many=True).data,
+        )
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class TrackerConfig(AppConfig):
     name = 'tracker'
+
+    def ready(self):
+        # Подключаем обработчики сигналов (инвалидация кэшей при изменении данных)
+        from tracker import signals  # noqa: F401
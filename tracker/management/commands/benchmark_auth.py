@@ -0,0 +1,68 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from tracker.api.authentication import ClaimsTokenObtainPairSerializer, StatelessJWTAuthentication
+from tracker.api.permissions import IsAdminOrManager
+from tracker.api.roles import invalidate_user_roles
+
+
+class Command(BaseCommand):
+    """
+    Бенчмарк накладных расходов аутентификации на запрос: JWT + проверка роли (IsAdminOrManager).
+    Пользователь создаётся внутри транзакции и откатывается в конце, БД не меняется.
+    python manage.py benchmark_auth --requests 2000
+    """
+
+    help = "Сравнивает время и число SQL-запросов аутентификации: JWTAuthentication против StatelessJWTAuthentication."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = get_user_model().objects.create_user(username="bench-auth-user", password="bench-pass-123")
+            user.groups.add(Group.objects.get_or_create(name="Manager")[0])
+            access = str(ClaimsTokenObtainPairSerializer.get_token(user).access_token)
+
+            variants = {
+                # как было: пользователь из БД + запрос групп на каждый запрос
+                "jwt_db_roles": (JWTAuthentication, True),
+                "jwt_cached_roles": (JWTAuthentication, False),
+                "stateless": (StatelessJWTAuthentication, False),
+            }
+            for name, (auth_class, reset_roles) in variants.items():
+                timings, queries = self._measure(auth_class(), access, options["requests"], reset_roles)
+                self.stdout.write(
+                    f"{name:18} median={statistics.median(timings) * 1e6:8.1f} us  "
+                    f"mean={statistics.mean(timings) * 1e6:8.1f} us  queries/request={queries:.2f}"
+                )
+
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def _measure(authenticator, access: str, requests: int, reset_roles: bool):
+        factory = APIRequestFactory()
+        permission = IsAdminOrManager()
+        timings = []
+
+        with CaptureQueriesContext(connection) as captured:
+            for _ in range(requests):
+                if reset_roles:
+                    invalidate_user_roles()
+                request = Request(factory.get("/api/tasks/", HTTP_AUTHORIZATION=f"Bearer {access}"))
+
+                started = time.perf_counter()
+                request.user, request.auth = authenticator.authenticate(request)
+                assert permission.has_permission(request, None)
+                timings.append(time.perf_counter() - started)
+
+        return timings, len(captured.captured_queries) / requests
@@ -0,0 +1,60 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from rest_framework.renderers import JSONRenderer
+
+from tracker.api.analytics import _busy_employees_json_agg, get_busy_employees
+from tracker.api.serializers import BusyEmployeeSerializer
+from tracker.management.seeding import seed_dataset
+
+
+class Command(BaseCommand):
+    """
+    Бенчмарк busy-employees: ORM + BusyEmployeeSerializer против одного запроса с jsonb_agg.
+    Данные создаются внутри транзакции и откатываются в конце, БД не меняется.
+    python manage.py benchmark_busy_employees --employees 1000 --tasks 100000
+    """
+
+    help = "Сравнивает время расчёта busy-employees двумя способами на синтетических данных."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--employees", type=int, default=1000)
+        parser.add_argument("--tasks", type=int, default=100_000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            created = seed_dataset(options["employees"], options["tasks"], seed=options["seed"])
+            self.stdout.write(f"seeded: {created}, vendor={connection.vendor}")
+
+            variants = {
+                "orm_serializer": lambda: BusyEmployeeSerializer(get_busy_employees(), many=True).data,
+            }
+            if connection.vendor == "postgresql":
+                variants["json_agg"] = _busy_employees_json_agg
+
+            payloads = {}
+            for name, func in variants.items():
+                timings, payloads[name] = self._measure(func, options["repeat"])
+                self.stdout.write(
+                    f"{name:16} median={statistics.median(timings) * 1000:8.1f} ms  "
+                    f"min={min(timings) * 1000:8.1f} ms  rows={len(payloads[name])}"
+                )
+
+            rendered = {JSONRenderer().render(payload) for payload in payloads.values()}
+            self.stdout.write(f"identical JSON: {len(rendered) == 1}")
+
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def _measure(func, repeat: int):
+        timings = []
+        result = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = func()
+            timings.append(time.perf_counter() - started)
+        return timings, result
@@ -0,0 +1,82 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from rest_framework.renderers import JSONRenderer
+
+from tracker.api.querysets import TASK_VALUES_SOURCES, task_queryset_for_fields
+from tracker.api.rows import RowRenderer
+from tracker.api.serializers import EmployeeSerializer, TaskSerializer
+from tracker.management.seeding import seed_dataset
+from tracker.models import Employee, Task
+
+
+class Command(BaseCommand):
+    """
+    Бенчмарк списков: ModelSerializer против values() + RowRenderer (быстрый путь list).
+    Проверяет, что JSON совпадает байт в байт. Данные создаются внутри транзакции и откатываются.
+    python manage.py benchmark_list_rendering --employees 1000 --tasks 20000 --rows 5000
+    """
+
+    help = "Сравнивает время сборки JSON списков задач и сотрудников сериализатором и через values()."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--employees", type=int, default=1000)
+        parser.add_argument("--tasks", type=int, default=20_000)
+        parser.add_argument("--rows", type=int, default=5000, help="Строк в одном ответе.")
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        with transaction.atomic():
+            created = seed_dataset(options["employees"], options["tasks"], seed=options["seed"])
+            self.stdout.write(f"seeded: {created}, vendor={connection.vendor}, rows={rows}")
+
+            tasks = Task.objects.order_by("-created_at", "-id")
+            employees = Employee.objects.order_by("-created_at", "-id")
+            cases = {
+                "tasks": (
+                    lambda: TaskSerializer(task_queryset_for_fields(tasks, TaskSerializer.Meta.fields)[:rows], many=True).data,
+                    RowRenderer(TaskSerializer, TaskSerializer.Meta.fields, TASK_VALUES_SOURCES),
+                    tasks,
+                ),
+                "employees": (
+                    lambda: EmployeeSerializer(employees[:rows], many=True).data,
+                    RowRenderer(EmployeeSerializer, EmployeeSerializer.Meta.fields),
+                    employees,
+                ),
+            }
+
+            for name, (serializer_data, renderer, queryset) in cases.items():
+                variants = {
+                    "serializer": serializer_data,
+                    "values_rows": lambda: renderer.render(queryset.values(*renderer.columns)[:rows]),
+                }
+                medians, payloads = {}, {}
+                for variant, func in variants.items():
+                    timings, payloads[variant] = self._measure(lambda: JSONRenderer().render(func()), options["repeat"])
+                    medians[variant] = statistics.median(timings)
+                    self.stdout.write(
+                        f"{name:10} {variant:12} median={medians[variant] * 1000:8.1f} ms  "
+                        f"min={min(timings) * 1000:8.1f} ms  bytes={len(payloads[variant])}"
+                    )
+
+                if payloads["serializer"] != payloads["values_rows"]:
+                    raise CommandError(f"{name}: JSON быстрого пути отличается от сериализатора")
+                self.stdout.write(
+                    f"{name:10} identical JSON: True, speedup x{medians['serializer'] / medians['values_rows']:.1f}"
+                )
+
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def _measure(func, repeat: int):
+        timings = []
+        result = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = func()
+            timings.append(time.perf_counter() - started)
+        return timings, result
@@ -0,0 +1,203 @@
+import json
+import platform
+import statistics
+import subprocess
+import time
+from contextlib import nullcontext
+from datetime import datetime, timezone
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from tracker.api import analytics
+from tracker.management.seeding import seed_dataset
+from tracker.models import Employee, Task
+
+
+# Функции analytics.py: имя -> (функция, меняет ли данные)
+ANALYTICS_FUNCTIONS = {
+    "get_busy_employees": (analytics.get_busy_employees, False),
+    "get_busy_employees_payload": (analytics.get_busy_employees_payload, False),
+    "get_important_tasks": (lambda: list(analytics.get_important_tasks()), False),
+    "get_active_load_by_employee": (analytics.get_active_load_by_employee, False),
+    "get_important_tasks_with_suggestion": (analytics.get_important_tasks_with_suggestion, False),
+    "apply_important_task_suggestions": (analytics.apply_important_task_suggestions, True),
+}
+
+# Маршруты, которые не замеряются: у сгенерированных отчётов нет файлов на диске,
+# сессий загрузки отчётов в сгенерированных данных нет
+SKIPPED_ROUTES = {"tasks-report", "report-uploads-detail"}
+
+
+def _parse_scale(value: str) -> tuple:
+    """'1000x100000' -> (1000, 100000): сотрудники x задачи."""
+    try:
+        employees, tasks = (int(part) for part in value.lower().split("x"))
+    except ValueError:
+        raise CommandError(f"Неверный масштаб '{value}', ожидается <сотрудники>x<задачи>.")
+    return employees, tasks
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    """
+    Бенчмарк всех GET-эндпоинтов tracker/api/urls.py и функций analytics.py на нескольких масштабах.
+    Данные каждого масштаба создаются внутри транзакции и откатываются, БД не меняется.
+    Результаты пишутся в JSON; --compare печатает разницу медиан с прошлым запуском.
+    python manage.py benchmark_tracker --scales 100x1000,1000x100000 --output bench.json --compare prev.json
+    """
+
+    help = "Замеряет время и число SQL-запросов эндпоинтов API и функций аналитики."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scales", default="100x1000,1000x10000", help="Список <сотрудники>x<задачи>.")
+        parser.add_argument("--dependency-density", type=float, default=1.0)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--output", default="benchmark_results.json")
+        parser.add_argument("--compare", help="JSON прошлого запуска для сравнения.")
+
+    def handle(self, *args, **options):
+        scales = [_parse_scale(value) for value in options["scales"].split(",") if value.strip()]
+        results = []
+
+        # тестовый клиент ходит на host "testserver"
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            for employees, tasks in scales:
+                results += self._run_scale(employees, tasks, options)
+
+        report = {
+            "meta": {
+                "commit": _git_commit(),
+                "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "vendor": connection.vendor,
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "repeat": options["repeat"],
+                "seed": options["seed"],
+                "dependency_density": options["dependency_density"],
+            },
+            "results": results,
+        }
+        with open(options["output"], "w", encoding="utf-8") as output:
+            json.dump(report, output, ensure_ascii=False, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Результаты записаны в {options['output']}"))
+
+        if options["compare"]:
+            self._compare(options["compare"], results)
+
+    def _run_scale(self, employees: int, tasks: int, options) -> list:
+        scale = f"{employees}x{tasks}"
+        results = []
+
+        with transaction.atomic():
+            started = time.perf_counter()
+            created = seed_dataset(employees, tasks, options["dependency_density"], options["seed"])
+            self.stdout.write(
+                f"[{scale}] seeded {created} in {time.perf_counter() - started:.1f} s (vendor={connection.vendor})"
+            )
+
+            # Admin видит все эндпоинты (сотрудники доступны только ему)
+            user = get_user_model().objects.create_user(username="bench-tracker-admin", password="bench-pass-123")
+            user.groups.add(Group.objects.get_or_create(name="Admin")[0])
+            client = APIClient()
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+
+            task_id = Task.objects.order_by("id").values_list("id", flat=True)[tasks // 2]
+            employee_id = Employee.objects.order_by("id").values_list("id", flat=True)[employees // 2]
+
+            for name, path in self._endpoints(task_id, employee_id):
+                results.append(self._measure(scale, "endpoint", name, lambda: client.get(path), options["repeat"]))
+
+            for name, (func, mutating) in ANALYTICS_FUNCTIONS.items():
+                results.append(self._measure(scale, "function", name, func, options["repeat"], mutating))
+
+            transaction.set_rollback(True)
+
+        return results
+
+    @staticmethod
+    def _endpoints(task_id: int, employee_id: int):
+        """GET-маршруты API (DRF-роутер и обычные path) с подставленным pk."""
+        from tracker.api.urls import urlpatterns
+
+        for pattern in urlpatterns:
+            regex = pattern.pattern.regex
+            if not pattern.name or pattern.name in SKIPPED_ROUTES or "format" in regex.groupindex:
+                continue
+            actions = getattr(pattern.callback, "actions", None)
+            if actions is not None and "get" not in actions:
+                continue
+            kwargs = {}
+            if "pk" in regex.groupindex:
+                kwargs["pk"] = employee_id if pattern.name.startswith("employees") else task_id
+            path = reverse(pattern.name, kwargs=kwargs)
+            yield f"GET {path}", path
+
+    def _measure(self, scale: str, kind: str, name: str, func, repeat: int, mutating: bool = False) -> dict:
+        """
+        Время без кэша аналитики (он очищается перед каждым вызовом).
+        Изменяющие данные вызовы выполняются в точке сохранения и откатываются.
+        """
+        timings = []
+        queries = status = None
+        for _ in range(repeat):
+            caches["analytics"].clear()
+            with transaction.atomic() if mutating else nullcontext(), CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                result = func()
+                timings.append(time.perf_counter() - started)
+                if mutating:
+                    transaction.set_rollback(True)
+            queries = len(captured.captured_queries)
+            status = getattr(result, "status_code", None)
+
+        row = {
+            "scale": scale,
+            "kind": kind,
+            "name": name,
+            "median_ms": round(statistics.median(timings) * 1000, 3),
+            "min_ms": round(min(timings) * 1000, 3),
+            "max_ms": round(max(timings) * 1000, 3),
+            "queries": queries,
+        }
+        if status is not None:
+            row["status"] = status
+        self.stdout.write(
+            f"[{scale}] {name:60} median={row['median_ms']:9.1f} ms  queries={queries}"
+            + (f"  status={status}" if status is not None else "")
+        )
+        return row
+
+    def _compare(self, path: str, results: list) -> None:
+        with open(path, encoding="utf-8") as previous_file:
+            previous = json.load(previous_file)
+        baseline = {(row["scale"], row["name"]): row for row in previous.get("results", [])}
+
+        self.stdout.write(f"Сравнение с {path} (commit={previous.get('meta', {}).get('commit')}):")
+        for row in results:
+            before = baseline.get((row["scale"], row["name"]))
+            if before is None or not before["median_ms"]:
+                continue
+            change = (row["median_ms"] - before["median_ms"]) / before["median_ms"] * 100
+            self.stdout.write(
+                f"[{row['scale']}] {row['name']:60} {before['median_ms']:9.1f} -> {row['median_ms']:9.1f} ms "
+                f"({change:+.1f}%)  queries {before['queries']} -> {row['queries']}"
+            )
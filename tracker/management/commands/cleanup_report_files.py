@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from tracker.storage import collect_orphan_report_files
+
+
+class Command(BaseCommand):
+    """
+    Удаление файлов отчётов, на которые не ссылается ни одна задача
+    (файл записан при сохранении задачи, а транзакция откатилась).
+    python manage.py cleanup_report_files            # удалить
+    python manage.py cleanup_report_files --dry-run  # только посчитать
+    Запускать по расписанию (cron), например раз в сутки.
+    """
+
+    help = "Удаляет файлы отчётов без ссылок из задач (после откаченных транзакций)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--min-age-hours",
+            type=float,
+            default=1.0,
+            help="Не трогать файлы моложе этого возраста (часы).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Ничего не удалять, только вывести, сколько будет удалено.",
+        )
+
+    def handle(self, *args, **options):
+        removed = collect_orphan_report_files(options["min_age_hours"] * 3600, dry_run=options["dry_run"])
+        action = "Будет удалено" if options["dry_run"] else "Удалено"
+        self.stdout.write(self.style.SUCCESS(f"{action} файлов отчётов без ссылок: {removed}."))
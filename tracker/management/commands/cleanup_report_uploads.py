@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tracker.api.uploads import cleanup_expired_uploads
+
+
+class Command(BaseCommand):
+    """
+    Удаление брошенных сессий докачиваемой загрузки отчётов и их файлов.
+    python manage.py cleanup_report_uploads            # удалить
+    python manage.py cleanup_report_uploads --dry-run  # только посчитать
+    Запускать по расписанию (cron), например раз в час.
+    """
+
+    help = "Удаляет сессии загрузки отчётов без новых частей дольше REPORT_UPLOAD_EXPIRE_HOURS."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Ничего не удалять, только вывести, сколько будет удалено.",
+        )
+
+    def handle(self, *args, **options):
+        sessions, files = cleanup_expired_uploads(dry_run=options["dry_run"])
+        action = "Будет удалено" if options["dry_run"] else "Удалено"
+        self.stdout.write(self.style.SUCCESS(
+            f"{action}: сессий {sessions}, файлов без сессии {files} "
+            f"(срок жизни {settings.REPORT_UPLOAD_EXPIRE_HOURS} ч)."
+        ))
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, F, Q
+
+from tracker.models import Employee, Task
+
+
+class Command(BaseCommand):
+    """
+    Сверка и пересборка денормализованного счётчика Employee.active_tasks_count.
+    python manage.py rebuild_active_load          # пересчитать у всех
+    python manage.py rebuild_active_load --check  # только проверить (код выхода 1 при расхождении)
+    """
+
+    help = "Проверяет и пересобирает счётчики активных задач сотрудников."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Только проверить счётчики, ничего не меняя.",
+        )
+
+    def handle(self, *args, **options):
+        # Эталон: честный COUNT по таблице задач
+        mismatched = list(
+            Employee.objects
+            .annotate(actual=Count("tasks", filter=Q(tasks__status__in=Task.ACTIVE_STATUSES)))
+            .exclude(active_tasks_count=F("actual"))
+            .values_list("id", "active_tasks_count", "actual")
+        )
+
+        for employee_id, stored, actual in mismatched:
+            self.stdout.write(f"employee_id={employee_id}: stored={stored}, actual={actual}")
+
+        if options["check"]:
+            if mismatched:
+                raise CommandError(f"Расхождений: {len(mismatched)}")
+            self.stdout.write(self.style.SUCCESS("Счётчики активных задач совпадают."))
+            return
+
+        with transaction.atomic():
+            updated = Employee.objects.all().refresh_active_tasks_count()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Пересчитано сотрудников: {updated}, исправлено расхождений: {len(mismatched)}."
+        ))
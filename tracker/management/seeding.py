@@ -0,0 +1,116 @@
+import random
+from datetime import date, timedelta
+from typing import Dict, List
+
+from django.db import transaction
+
+from tracker.models import Employee, Task, TaskDependency
+
+
+# СИНТЕТИЧЕСКИЕ ДАННЫЕ
+#
+# Воспроизводимый набор данных для бенчмарков: при одинаковом seed получаются
+# одинаковые сотрудники, задачи и граф зависимостей. Всё пишется bulk_create-ом пачками,
+# счётчики нагрузки и версии данных обновляются штатно (TaskQuerySet / data_changed).
+
+SEED_EMAIL_DOMAIN = "seed.example.com"  # по нему находятся и удаляются сгенерированные данные
+BATCH_SIZE = 5000
+
+POSITIONS = ["Backend Developer", "Frontend Developer", "QA Engineer", "Analyst", "Team Lead", "DevOps"]
+
+# Распределение статусов: большая часть задач либо ещё не начата, либо закрыта
+STATUS_WEIGHTS = {
+    Task.Status.NEW: 30,
+    Task.Status.IN_PROGRESS: 25,
+    Task.Status.REVIEW: 10,
+    Task.Status.DONE: 35,
+}
+
+# Зависимости берутся среди ближайших предыдущих задач: получаются цепочки, похожие на реальные
+DEPENDENCY_WINDOW = 50
+
+
+def _due_date(rng: random.Random, today: date) -> date:
+    """Срок в будущем: чаще ближайшие недели, реже - через несколько месяцев."""
+    return today + timedelta(days=int(rng.triangular(0, 120, 14)))
+
+
+def _dependency_edges(rng: random.Random, tasks: int, density: float) -> List[tuple]:
+    """
+    Рёбра DAG (индекс блокирующей задачи, индекс зависимой).
+    Блокирующая задача всегда создана раньше зависимой, поэтому циклов нет.
+    density - среднее число блокеров на задачу.
+    """
+    edges = set()
+    for child in range(1, tasks):
+        count = min(child, int(rng.expovariate(1 / density))) if density > 0 else 0
+        window_start = max(0, child - DEPENDENCY_WINDOW)
+        for parent in rng.sample(range(window_start, child), min(count, child - window_start)):
+            edges.add((parent, child))
+    return sorted(edges)
+
+
+def clear_seed_data() -> int:
+    """Удалить ранее сгенерированные данные (зависимости удаляются каскадно вместе с задачами)."""
+    seeded = Employee.objects.filter(email__endswith=f"@{SEED_EMAIL_DOMAIN}")
+    with transaction.atomic():
+        # owner защищён от удаления (PROTECT): сначала задачи, потом сотрудники
+        tasks, _ = Task.objects.filter(owner__in=seeded).delete()
+        employees, _ = seeded.delete()
+    return tasks + employees
+
+
+def seed_dataset(employees: int, tasks: int, dependency_density: float = 1.0, seed: int = 42) -> Dict[str, int]:
+    """Сгенерировать набор данных. Возвращает число созданных строк по таблицам."""
+    if employees < 2:
+        raise ValueError("Нужно минимум 2 сотрудника: владелец задачи не может быть её исполнителем.")
+
+    rng = random.Random(seed)
+    today = date.today()
+    statuses = list(STATUS_WEIGHTS)
+    weights = list(STATUS_WEIGHTS.values())
+
+    with transaction.atomic():
+        people = Employee.objects.bulk_create(
+            (
+                Employee(
+                    full_name=f"Seed Employee {i:06}",
+                    position=rng.choice(POSITIONS),
+                    email=f"employee{i}@{SEED_EMAIL_DOMAIN}",
+                    is_active=rng.random() > 0.05,
+                )
+                for i in range(employees)
+            ),
+            batch_size=BATCH_SIZE,
+        )
+
+        created_tasks = []
+        batch = []
+        for i in range(tasks):
+            owner, assignee = rng.sample(people, 2)
+            status = rng.choices(statuses, weights)[0]
+            batch.append(Task(
+                title=f"Seed task {i:07}",
+                description=f"Synthetic task {i} for benchmarks",
+                status=status,
+                # для DONE отчёт обязателен (Task.clean), сам файл бенчмаркам не нужен
+                report_file=f"reports/seed/{i}.pdf" if status == Task.Status.DONE else "",
+                owner=owner,
+                assignee=None if status == Task.Status.NEW and rng.random() < 0.2 else assignee,
+                due_date=_due_date(rng, today),
+            ))
+            if len(batch) == BATCH_SIZE:
+                created_tasks += Task.objects.bulk_create(batch)
+                batch = []
+        created_tasks += Task.objects.bulk_create(batch)
+
+        edges = _dependency_edges(rng, len(created_tasks), dependency_density)
+        TaskDependency.objects.bulk_create(
+            (
+                TaskDependency(parent_task=created_tasks[parent], child_task=created_tasks[child])
+                for parent, child in edges
+            ),
+            batch_size=BATCH_SIZE,
+        )
+
+    return {"employees": len(people), "tasks": len(created_tasks), "dependencies": len(edges)}
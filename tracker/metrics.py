@@ -0,0 +1,101 @@
+import os
+import threading
+import time
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client import multiprocess
+
+
+# МЕТРИКИ PROMETHEUS
+#
+# Под gunicorn у каждого воркера свои счётчики. Если задан PROMETHEUS_MULTIPROC_DIR
+# (его выставляет gunicorn.conf.py), prometheus_client пишет значения в файлы этой папки,
+# а /api/metrics/ собирает их по всем воркерам. Без переменной - метрики текущего процесса.
+# Метка view - имя маршрута (tasks-list, analytics-busy-employees), а не путь: число рядов ограничено.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+UNMATCHED_VIEW = "<unmatched>"
+
+REQUEST_DURATION = Histogram(
+    "tracker_http_request_duration_seconds",
+    "Время обработки запроса",
+    ["method", "view"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS = Counter(
+    "tracker_http_requests",
+    "Запросы по коду ответа",
+    ["method", "view", "status"],
+)
+DB_QUERIES = Histogram(
+    "tracker_db_queries_per_request",
+    "Число SQL-запросов за запрос",
+    ["method", "view"],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+DB_DURATION = Histogram(
+    "tracker_db_duration_seconds_per_request",
+    "Суммарное время SQL-запросов за запрос",
+    ["method", "view"],
+    buckets=LATENCY_BUCKETS,
+)
+RESPONSE_SIZE = Histogram(
+    "tracker_http_response_size_bytes",
+    "Размер тела ответа (потоковые ответы не учитываются)",
+    ["method", "view"],
+    buckets=SIZE_BUCKETS,
+)
+ANALYTICS_CACHE = Counter(
+    "tracker_analytics_cache",
+    "Обращения к кэшу аналитики (result: hit/miss)",
+    ["result"],
+)
+EXCEPTIONS = Counter(
+    "tracker_exceptions",
+    "Исключения по классу",
+    ["view", "exception"],
+)
+
+
+def view_name(request) -> str:
+    resolver_match = getattr(request, "resolver_match", None)
+    return resolver_match.view_name if resolver_match is not None else UNMATCHED_VIEW
+
+
+def record_exception(request, exc: BaseException) -> None:
+    EXCEPTIONS.labels(view=view_name(request), exception=exc.__class__.__name__).inc()
+
+
+class QueryTimer:
+    """
+    execute_wrapper: считает SQL-запросы и их суммарное время (работает и без DEBUG).
+    Под ASGI запросы одного HTTP-запроса могут идти из нескольких потоков одновременно.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.count += 1
+                self.duration += elapsed
+
+
+def render_metrics() -> tuple:
+    """(тело, content type) в текстовом формате Prometheus."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
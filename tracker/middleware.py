@@ -0,0 +1,167 @@
+import logging
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from tracker import metrics, profiler, sqlhooks, timing
+
+
+logger = logging.getLogger("tracker")
+
+
+class AsyncCapableMiddleware:
+    """
+    Основа middleware для WSGI и ASGI: под ASGI цепочка остаётся асинхронной
+    (Django не переключает каждый запрос в поток ради sync-only middleware).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.call(request)
+
+    def call(self, request):
+        raise NotImplementedError
+
+    async def __acall__(self, request):
+        raise NotImplementedError
+
+
+class MetricsMiddleware(AsyncCapableMiddleware):
+    """
+    Метрики каждого запроса: длительность, число и время SQL-запросов, размер ответа,
+    код ответа и необработанные исключения. Включается настройкой METRICS_ENABLED.
+    SQL считается во всех потоках запроса (tracker/sqlhooks.py), в том числе под ASGI.
+    """
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed()
+        super().__init__(get_response)
+
+    def call(self, request):
+        timer, started = metrics.QueryTimer(), time.perf_counter()
+        with sqlhooks.observe_queries(timer):
+            response = self.get_response(request)
+        return self._record(request, response, timer, started)
+
+    async def __acall__(self, request):
+        timer, started = metrics.QueryTimer(), time.perf_counter()
+        with sqlhooks.observe_queries(timer):
+            response = await self.get_response(request)
+        return self._record(request, response, timer, started)
+
+    def _record(self, request, response, timer, started):
+        duration = time.perf_counter() - started
+        view = metrics.view_name(request)
+        method = request.method
+        metrics.REQUEST_DURATION.labels(method=method, view=view).observe(duration)
+        metrics.REQUESTS.labels(method=method, view=view, status=str(response.status_code)).inc()
+        metrics.DB_QUERIES.labels(method=method, view=view).observe(timer.count)
+        metrics.DB_DURATION.labels(method=method, view=view).observe(timer.duration)
+        if not response.streaming:
+            metrics.RESPONSE_SIZE.labels(method=method, view=view).observe(len(response.content))
+        return response
+
+    def process_exception(self, request, exception):
+        # ошибки DRF-представлений учитывает custom_exception_handler, сюда доходят остальные
+        metrics.record_exception(request, exception)
+
+
+class ServerTimingMiddleware(AsyncCapableMiddleware):
+    """
+    Заголовок Server-Timing (auth, perm, db, serialize, render, other, total) и строка в debug-логе
+    для доли запросов SERVER_TIMING_SAMPLE_RATE (0 - выключено, 1 - все запросы).
+    Запросы вне выборки обходятся одной проверкой random().
+    """
+
+    def __init__(self, get_response):
+        if settings.SERVER_TIMING_SAMPLE_RATE <= 0:
+            raise MiddlewareNotUsed()
+        super().__init__(get_response)
+        self.sample_rate = settings.SERVER_TIMING_SAMPLE_RATE
+
+    def call(self, request):
+        if random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        recorder, token = timing.start()
+        started = time.perf_counter()
+        try:
+            with sqlhooks.observe_queries(recorder.query_wrapper):
+                response = self.get_response(request)
+        finally:
+            timing.stop(token)
+        return self._add_header(request, response, recorder, started)
+
+    async def __acall__(self, request):
+        if random.random() >= self.sample_rate:
+            return await self.get_response(request)
+
+        recorder, token = timing.start()
+        started = time.perf_counter()
+        try:
+            with sqlhooks.observe_queries(recorder.query_wrapper):
+                response = await self.get_response(request)
+        finally:
+            timing.stop(token)
+        return self._add_header(request, response, recorder, started)
+
+    def _add_header(self, request, response, recorder, started):
+        header = recorder.header(time.perf_counter() - started)
+        response["Server-Timing"] = header
+        logger.debug("Server-Timing %s %s: %s", request.method, request.path, header)
+        return response
+
+
+class ProfilerMiddleware(AsyncCapableMiddleware):
+    """
+    Профиль запроса /api/ по требованию Admin: заголовок X-Profile: 1 или ?_profile=1
+    (см. tracker/profiler.py). В ответе - заголовок X-Profile-Id, профиль - в админке.
+    Под ASGI cProfile видит только поток event loop (код в sync_to_async - нет, его SQL - да).
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILER_ENABLED:
+            raise MiddlewareNotUsed()
+        super().__init__(get_response)
+
+    @staticmethod
+    def _wanted(request) -> bool:
+        return request.path.startswith("/api/") and profiler.is_requested(request)
+
+    def call(self, request):
+        if not (self._wanted(request) and profiler.can_profile(request)):
+            return self.get_response(request)
+
+        profile = profiler.RequestProfile()
+        with sqlhooks.observe_queries(profile.query_wrapper), profile:
+            response = self.get_response(request)
+        return self._save(request, response, profile)
+
+    async def __acall__(self, request):
+        if not (self._wanted(request) and await sync_to_async(profiler.can_profile)(request)):
+            return await self.get_response(request)
+
+        profile = profiler.RequestProfile()
+        with sqlhooks.observe_queries(profile.query_wrapper), profile:
+            response = await self.get_response(request)
+        # EXPLAIN и запись файла - синхронные
+        return await sync_to_async(self._save)(request, response, profile)
+
+    def _save(self, request, response, profile):
+        profile_id = profiler.save_profile(profile.to_dict(request, response))
+        logger.info("Request profiled: %s %s -> %s", request.method, request.path, profile_id)
+        response["X-Profile-Id"] = profile_id
+        return response
@@ -0,0 +1,37 @@
+# Generated by Django 6.0.2 on 2026-10-17 10:40
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_active_tasks_count(apps, schema_editor):
+    """Первичное заполнение счётчика по текущим задачам."""
+    Employee = apps.get_model("tracker", "Employee")
+    Task = apps.get_model("tracker", "Task")
+
+    active_count = (
+        Task.objects
+        .filter(assignee=OuterRef("pk"), status__in=["IN_PROGRESS", "REVIEW"])
+        .order_by()
+        .values("assignee")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    Employee.objects.update(active_tasks_count=Coalesce(Subquery(active_count), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0004_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employee',
+            name='active_tasks_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Активных задач'),
+        ),
+        migrations.RunPython(fill_active_tasks_count, migrations.RunPython.noop),
+    ]
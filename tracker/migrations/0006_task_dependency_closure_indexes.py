@@ -0,0 +1,29 @@
+# Generated by Django 6.0.2 on 2026-10-17 11:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0005_employee_active_tasks_count'),
+    ]
+
+    operations = [
+        # Сначала новый составной индекс, затем удаление одиночных индексов FK
+        migrations.AddIndex(
+            model_name='taskdependency',
+            index=models.Index(fields=['child_task', 'parent_task'], name='idx_task_deps_child_parent'),
+        ),
+        migrations.AlterField(
+            model_name='taskdependency',
+            name='child_task',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='parent_dependencies', to='tracker.task', verbose_name='Дочерняя задача'),
+        ),
+        migrations.AlterField(
+            model_name='taskdependency',
+            name='parent_task',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='child_dependencies', to='tracker.task', verbose_name='Родительская задача'),
+        ),
+    ]
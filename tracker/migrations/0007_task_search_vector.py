@@ -0,0 +1,41 @@
+# Generated by Django 6.0.2 on 2026-10-17 12:05
+
+from django.db import migrations
+
+
+# Генерируемая колонка tsvector для полнотекстового поиска задач + GIN-индекс.
+# Заголовок важнее описания (вес A против B); russian даёт морфологию,
+# simple - точные совпадения для английских слов, кодов и аббревиатур.
+CREATE_SQL = """
+ALTER TABLE tasks ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+    setweight(to_tsvector('russian'::regconfig, coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('simple'::regconfig, coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('russian'::regconfig, coalesce(description, '')), 'B') ||
+    setweight(to_tsvector('simple'::regconfig, coalesce(description, '')), 'B')
+) STORED;
+CREATE INDEX idx_tasks_search_vector ON tasks USING GIN (search_vector);
+"""
+
+DROP_SQL = """
+DROP INDEX IF EXISTS idx_tasks_search_vector;
+ALTER TABLE tasks DROP COLUMN IF EXISTS search_vector;
+"""
+
+
+def _run_on_postgresql(sql):
+    """Только PostgreSQL: на других БД поиск работает через SearchFilter (ILIKE)."""
+    def operation(apps, schema_editor):
+        if schema_editor.connection.vendor == "postgresql":
+            schema_editor.execute(sql)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0006_task_dependency_closure_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(_run_on_postgresql(CREATE_SQL), _run_on_postgresql(DROP_SQL)),
+    ]
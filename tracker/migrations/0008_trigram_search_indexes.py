@@ -0,0 +1,45 @@
+# Generated by Django 6.0.2 on 2026-10-17 12:40
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+# GIN-индексы pg_trgm под ILIKE '%term%' из SearchFilter/админки.
+# Выражение совпадает с тем, что генерирует Django для icontains на PostgreSQL:
+# UPPER("col"::text) LIKE UPPER('%term%'), иначе планировщик индекс не использует.
+TRIGRAM_INDEXES = {
+    "idx_employees_full_name_trgm": ("employees", "full_name"),
+    "idx_employees_position_trgm": ("employees", "position"),
+    "idx_employees_email_trgm": ("employees", "email"),
+    "idx_tasks_title_trgm": ("tasks", "title"),
+    "idx_tasks_description_trgm": ("tasks", "description"),
+}
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return  # на других БД поиск остаётся обычным ILIKE
+    for name, (table, column) in TRIGRAM_INDEXES.items():
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON {table} USING GIN (UPPER("{column}"::text) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0007_task_search_vector'),
+    ]
+
+    operations = [
+        # CREATE EXTENSION pg_trgm (на других БД операция ничего не делает)
+        TrigramExtension(),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 6.0.2 on 2026-10-17 14:05
+
+import tracker.storage
+from django.db import migrations, models
+
+
+def fill_report_hashes(apps, schema_editor):
+    """
+    Хеш и размер уже загруженных отчётов (сами файлы остаются на своих местах:
+    они не хранятся по содержимому и при очистке не удаляются).
+    """
+    Task = apps.get_model("tracker", "Task")
+    storage = Task._meta.get_field("report_file").storage
+    tasks = Task.objects.using(schema_editor.connection.alias).exclude(report_file="").exclude(report_file__isnull=True)
+    for task in tasks.only("id", "report_file").iterator():
+        try:
+            with storage.open(task.report_file.name, "rb") as report:
+                sha256, size = tracker.storage.file_sha256(report), report.size
+        except FileNotFoundError:
+            continue
+        Task.objects.using(schema_editor.connection.alias).filter(pk=task.pk).update(
+            report_sha256=sha256, report_size=size,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0009_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='report_sha256',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=64, verbose_name='SHA-256 отчёта'),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='report_size',
+            field=models.PositiveBigIntegerField(blank=True, editable=False, null=True, verbose_name='Размер отчёта, байт'),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='report_file',
+            field=models.FileField(blank=True, null=True, storage=tracker.storage.get_report_storage, upload_to='task_reports/', verbose_name='Отчёт/документ'),
+        ),
+        migrations.RunPython(fill_report_hashes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 6.0.2 on 2026-10-17 15:40
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0010_task_report_content_hash'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportUpload',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('filename', models.CharField(max_length=255, verbose_name='Имя файла')),
+                ('size', models.PositiveBigIntegerField(verbose_name='Размер файла, байт')),
+                ('offset', models.PositiveBigIntegerField(default=0, verbose_name='Принято байт')),
+                ('sha256', models.CharField(blank=True, default='', max_length=64, verbose_name='Ожидаемый SHA-256')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Дата изменения')),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Кто загружает')),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='report_uploads', to='tracker.task', verbose_name='Задача')),
+            ],
+            options={
+                'verbose_name': 'Загрузка отчёта',
+                'verbose_name_plural': 'Загрузки отчётов',
+                'db_table': 'report_uploads',
+                'indexes': [models.Index(fields=['updated_at'], name='idx_report_uploads_updated')],
+            },
+        ),
+    ]
@@ -1,7 +1,91 @@
+import uuid
+
+from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import connections, models, transaction
 from django.db.models import Q, F   # Q - логические условия AND, OR, NOT
                                     # F - ссылается на значение другого поля в этой же строке БД
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.dispatch import Signal
+from django.utils import timezone
+
+from tracker.storage import file_sha256, get_report_storage, lock_report_hash, release_report_files, sha256_from_name
+
+
+# Сигнал "данные модели изменены массовой операцией QuerySet".
+# При update()/bulk_create()/bulk_update() Django не отправляет post_save/post_delete,
+# а кэшам (аналитика, граф зависимостей) нужно знать о любых изменениях.
+data_changed = Signal()
+
+
+class NotifyingQuerySet(models.QuerySet):
+    """
+    QuerySet, который после массовых операций отправляет data_changed(sender=модель).
+    Если у модели есть updated_at, update()/bulk_update() проставляют его сами
+    (auto_now срабатывает только в save()), кроме полей из TOUCH_EXEMPT_FIELDS модели.
+    """
+
+    def _notify_data_changed(self) -> None:
+        data_changed.send(sender=self.model)
+
+    def _touches_updated_at(self, fields) -> bool:
+        if not any(field.name == "updated_at" for field in self.model._meta.concrete_fields):
+            return False
+        exempt = set(getattr(self.model, "TOUCH_EXEMPT_FIELDS", ()))
+        return "updated_at" not in fields and bool(set(fields) - exempt)
+
+    def update(self, **kwargs):
+        if self._touches_updated_at(kwargs):
+            kwargs["updated_at"] = timezone.now()
+        rows = super().update(**kwargs)
+        self._notify_data_changed()
+        return rows
+
+    def delete(self):
+        result = super().delete()
+        self._notify_data_changed()
+        return result
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        self._notify_data_changed()
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        if self._touches_updated_at(fields):
+            objs = list(objs)
+            now = timezone.now()
+            for obj in objs:
+                obj.updated_at = now
+            fields = [*fields, "updated_at"]
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        self._notify_data_changed()
+        return rows
+
+
+class EmployeeQuerySet(NotifyingQuerySet):
+    """QuerySet сотрудников с пересчётом счётчика активных задач."""
+
+    def refresh_active_tasks_count(self) -> int:
+        """
+        Пересчитывает active_tasks_count для сотрудников из QuerySet одним UPDATE
+        (подзапрос COUNT по индексу tasks(assignee_id, status)).
+        Строки сотрудников сначала блокируются (по порядку id): параллельная транзакция,
+        изменившая задачи того же сотрудника, ждёт нашего коммита, и её UPDATE
+        (новый снимок в READ COMMITTED) уже посчитает наши задачи - без потерянных обновлений.
+        """
+        active_count = (
+            Task.objects
+            .filter(assignee=OuterRef("pk"), status__in=Task.ACTIVE_STATUSES)
+            .order_by()
+            .values("assignee")
+            .annotate(count=Count("id"))
+            .values("count")
+        )
+        with transaction.atomic(using=self.db, savepoint=False):
+            list(self.select_for_update().order_by("pk").values_list("pk", flat=True))
+            return self.update(active_tasks_count=Coalesce(Subquery(active_count), 0))
 
 
 class Employee(models.Model):
@@ -30,21 +114,107 @@ class Employee(models.Model):
         verbose_name="Активен",
     )
 
+    # Денормализованный счётчик задач в активных статусах (IN_PROGRESS/REVIEW), где сотрудник - исполнитель.
+    # Поддерживается TaskQuerySet/Task.save/Task.delete, сверка: manage.py rebuild_active_load --check
+    active_tasks_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Активных задач",
+    )
+
     # Время создания записи (ставится автоматически при создании)
     created_at = models.DateTimeField(
         auto_now_add=True,
         verbose_name="Дата создания",
     )
+    # Время последнего изменения (в том числе массовыми операциями QuerySet), для ETag ответов API
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Дата изменения",
+    )
+
+    # Пересчёт денормализованного счётчика не считается изменением сотрудника
+    TOUCH_EXEMPT_FIELDS = ("active_tasks_count",)
+
+    objects = EmployeeQuerySet.as_manager()
 
     class Meta:
         db_table = "employees"  # имя таблицы в PostgreSQL
         verbose_name = "Сотрудник"
         verbose_name_plural = "Сотрудники"
 
+        # Составные индексы (поле сортировки, id) под курсорную пагинацию API
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="idx_employees_created_id"),
+            models.Index(fields=["full_name", "id"], name="idx_employees_name_id"),
+            models.Index(fields=["position", "id"], name="idx_employees_position_id"),
+            models.Index(fields=["is_active", "id"], name="idx_employees_active_id"),
+        ]
+
     def __str__(self) -> str:
         return self.full_name
 
 
+def _refresh_active_load(employee_ids) -> None:
+    """Пересчитать счётчики активных задач у перечисленных сотрудников."""
+    employee_ids = {employee_id for employee_id in employee_ids if employee_id is not None}
+    if employee_ids:
+        Employee.objects.filter(id__in=employee_ids).refresh_active_tasks_count()
+
+
+class TaskQuerySet(NotifyingQuerySet):
+    """
+    QuerySet задач, который поддерживает Employee.active_tasks_count
+    и при массовых операциях (update/delete/bulk_create/bulk_update),
+    где сигналы и Task.save() не вызываются.
+    Пересчёт идёт только для затронутых сотрудников и в той же транзакции.
+    """
+
+    def _assignee_ids(self) -> set:
+        return set(
+            self.order_by()
+            .exclude(assignee__isnull=True)
+            .values_list("assignee_id", flat=True)
+            .distinct()
+        )
+
+    def update(self, **kwargs):
+        assignee_key = next((key for key in ("assignee", "assignee_id") if key in kwargs), None)
+        if assignee_key is None and "status" not in kwargs:
+            return super().update(**kwargs)
+
+        with transaction.atomic(using=self.db, savepoint=False):
+            affected = self._assignee_ids()
+            rows = super().update(**kwargs)
+
+            if assignee_key is not None:
+                value = kwargs[assignee_key]
+                if hasattr(value, "resolve_expression"):
+                    # Значение - выражение (например Case из bulk_update): перечитываем итог
+                    affected |= self._assignee_ids()
+                else:
+                    affected.add(getattr(value, "pk", value))
+
+            _refresh_active_load(affected)
+        return rows
+
+    def delete(self):
+        with transaction.atomic(using=self.db, savepoint=False):
+            affected = self.filter(status__in=Task.ACTIVE_STATUSES)._assignee_ids()
+            reports = list(self.exclude(report_sha256="").values_list("report_file", "report_sha256").distinct())
+            result = super().delete()
+            _refresh_active_load(affected)
+            if reports:
+                transaction.on_commit(lambda: release_report_files(reports), using=self.db)
+        return result
+
+    def bulk_create(self, objs, *args, **kwargs):
+        with transaction.atomic(using=self.db, savepoint=False):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            _refresh_active_load(obj.assignee_id for obj in objs if obj.status in Task.ACTIVE_STATUSES)
+        return objs
+
+
 class Task(models.Model):
     """
     Модель задачи (tasks).
@@ -58,6 +228,9 @@ class Task(models.Model):
         REVIEW = "REVIEW", "На проверке"
         DONE = "DONE", "Завершена"
 
+    # Статусы, которые считаем "активными" (нагрузка сотрудника)
+    ACTIVE_STATUSES = (Status.IN_PROGRESS, Status.REVIEW)
+
     title = models.CharField(
         max_length=255,
         verbose_name="Название задачи",
@@ -67,12 +240,30 @@ class Task(models.Model):
         null=True,
         verbose_name="Описание задачи",
     )
+    # Файлы хранятся по SHA-256 содержимого (tracker/storage.py): одинаковые отчёты - один файл
     report_file = models.FileField(
         upload_to="task_reports/",
+        storage=get_report_storage,
         blank=True,
         null=True,
         verbose_name="Отчёт/документ",
     )
+    # Хеш и размер отчёта пишутся при сохранении файла: API отдаёт их без обращения к файлу,
+    # по хешу (индекс) считаются ссылки на файл
+    report_sha256 = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        db_index=True,
+        editable=False,
+        verbose_name="SHA-256 отчёта",
+    )
+    report_size = models.PositiveBigIntegerField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name="Размер отчёта, байт",
+    )
     review_comment = models.TextField(
         blank=True,
         null=True,
@@ -107,6 +298,11 @@ class Task(models.Model):
         auto_now_add=True,
         verbose_name="Дата создания",
     )
+    # Время последнего изменения (в том числе массовыми операциями QuerySet), для ETag ответов API
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Дата изменения",
+    )
 
     def clean(self) -> None:
         """
@@ -131,13 +327,102 @@ class Task(models.Model):
         if self.assignee is not None and self.owner == self.assignee:
             raise ValidationError({"assignee": "Владелец задачи не может быть её исполнителем."})
 
+    objects = TaskQuerySet.as_manager()
+
+    def _remember_loaded(self, refreshed=None) -> None:
+        """
+        Запоминаем значения из БД (refreshed - какие поля только что прочитаны, None - все):
+        - исполнителя и статус, чтобы при save() понять, изменилась ли нагрузка
+        - отчёт: если файл заменят или уберут, прежний удаляется, когда на него не останется ссылок
+        """
+        for attr, names in (("_loaded_load_state", ("assignee_id", "status")),
+                            ("_loaded_report", ("report_file", "report_sha256"))):
+            previous = getattr(self, attr, None) or (models.DEFERRED,) * len(names)
+            setattr(self, attr, tuple(
+                self.__dict__.get(name, models.DEFERRED) if refreshed is None or name in refreshed else value
+                for name, value in zip(names, previous)
+            ))
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_loaded()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        refreshed = None
+        if fields is not None:
+            attnames = {field.name: field.attname for field in self._meta.concrete_fields}
+            refreshed = {attnames.get(name, name) for name in fields}
+        self._remember_loaded(refreshed)
+
+    def _store_report_file(self, kwargs) -> None:
+        """
+        Новый файл отчёта сохраняем в хранилище до записи строки,
+        чтобы хеш и размер попали в тот же INSERT/UPDATE.
+        Если транзакция откатится, файл без ссылок удалит manage.py cleanup_report_files.
+        """
+        report = self.report_file
+        if report and not report._committed:
+            size = report.size
+            sha256 = file_sha256(report.file)
+            report.file.sha256 = sha256  # хранилище не будет считать хеш повторно
+            # до коммита файл с этим хешем не удалит release_report_files другой транзакции
+            lock_report_hash(sha256, using=kwargs.get("using"))
+            report.save(report.name, report.file, save=False)
+            self.report_sha256 = sha256_from_name(report.name) or ""
+            self.report_size = size
+        elif not report:
+            self.report_sha256, self.report_size = "", None
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "report_file" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "report_sha256", "report_size"}
+
     def save(self, *args, **kwargs):
         # Запускает:
         # - clean_fields()
         # - clean()
         # - validate_unique()
         self.full_clean()
-        return super().save(*args, **kwargs)
+
+        previous = getattr(self, "_loaded_load_state", None)
+        previous_report = getattr(self, "_loaded_report", None)
+        with transaction.atomic(using=kwargs.get("using"), savepoint=False):
+            if (previous is None and self.pk is not None) or (previous is not None and models.DEFERRED in previous):
+                # Объект не из БД или поле было отложено (defer/only) - берём прежние значения из БД
+                previous = type(self).objects.filter(pk=self.pk).values_list("assignee_id", "status").first()
+            if (previous_report is None and self.pk is not None) or (
+                previous_report is not None and models.DEFERRED in previous_report
+            ):
+                previous_report = type(self).objects.filter(pk=self.pk).values_list("report_file", "report_sha256").first()
+
+            self._store_report_file(kwargs)
+            result = super().save(*args, **kwargs)
+
+            if previous_report and previous_report[0] != self.report_file.name:
+                transaction.on_commit(lambda: release_report_files([previous_report]), using=kwargs.get("using"))
+
+            current = (self.assignee_id, self.status)
+            was_active = previous is not None and previous[1] in self.ACTIVE_STATUSES
+            if previous != current and (was_active or self.status in self.ACTIVE_STATUSES):
+                _refresh_active_load({self.assignee_id, previous[0] if previous else None})
+
+        self._loaded_load_state = current
+        self._loaded_report = (self.report_file.name, self.report_sha256)
+        return result
+
+    def delete(self, *args, **kwargs):
+        # Берём значения до удаления: после него у объекта уже не будет pk
+        assignee_id, was_active = self.assignee_id, self.status in self.ACTIVE_STATUSES
+        report = (self.report_file.name, self.report_sha256)
+        with transaction.atomic(using=kwargs.get("using"), savepoint=False):
+            result = super().delete(*args, **kwargs)
+            if was_active:
+                _refresh_active_load({assignee_id})
+            transaction.on_commit(lambda: release_report_files([report]), using=kwargs.get("using"))
+        return result
 
     class Meta:
         db_table = "tasks"
@@ -153,9 +438,11 @@ class Task(models.Model):
         ]
 
         # Индексы ускоряют фильтры в API (assignee/status/due_date)
+        # и курсорную пагинацию: ключ (поле сортировки, id) читается по индексу в обе стороны
         indexes = [
-            models.Index(fields=["status"], name="idx_tasks_status"),
-            models.Index(fields=["due_date"], name="idx_tasks_due_date"),
+            models.Index(fields=["status", "id"], name="idx_tasks_status_id"),
+            models.Index(fields=["due_date", "id"], name="idx_tasks_due_date_id"),
+            models.Index(fields=["created_at", "id"], name="idx_tasks_created_id"),
             models.Index(fields=["assignee", "status"], name="idx_tasks_assignee_status"),
         ]
 
@@ -163,31 +450,74 @@ class Task(models.Model):
         return self.title
 
 
+class TaskDependencyQuerySet(NotifyingQuerySet):
+    """
+    Массовые записи зависимостей - под той же блокировкой, что и save(), с проверкой
+    циклов по всем рёбрам после записи (в той же транзакции: при цикле она откатывается).
+    """
+
+    def _check_acyclic(self) -> None:
+        from tracker.api.dependencies import edges_have_cycle
+
+        edges = self.model.objects.using(self.db).values_list("parent_task_id", "child_task_id")
+        if edges_have_cycle(edges.iterator(chunk_size=10_000)):
+            raise ValidationError({"child_task": "Зависимости создают цикл."})
+
+    def bulk_create(self, objs, *args, **kwargs):
+        with transaction.atomic(using=self.db):
+            self.model.lock_graph(self.db)
+            objs = super().bulk_create(objs, *args, **kwargs)
+            self._check_acyclic()
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        with transaction.atomic(using=self.db):
+            self.model.lock_graph(self.db)
+            rows = super().bulk_update(objs, fields, *args, **kwargs)
+            self._check_acyclic()
+        return rows
+
+    def update(self, **kwargs):
+        with transaction.atomic(using=self.db):
+            self.model.lock_graph(self.db)
+            rows = super().update(**kwargs)
+            self._check_acyclic()
+        return rows
+
+
 class TaskDependency(models.Model):
     """
     Модель зависимости задач (task_dependencies).
     Описывает связь: родительская задача -> дочерняя задача.
     """
 
+    # Одиночные индексы на FK не нужны: их заменяют составные индексы ниже
     parent_task = models.ForeignKey(            # блокирующая задача
         Task,
         on_delete=models.CASCADE,
         related_name="child_dependencies",
         verbose_name="Родительская задача",
+        db_index=False,
     )
     child_task = models.ForeignKey(             # зависимая задача
         Task,
         on_delete=models.CASCADE,
         related_name="parent_dependencies",
         verbose_name="Дочерняя задача",
+        db_index=False,
     )
 
     class Meta:
         db_table = "task_dependencies"
         verbose_name = "Зависимость задачи"
         verbose_name_plural = "Зависимости задач"
+        indexes = [
+            # Обход "вверх" (блокеры): WHERE child_task_id = ... -> parent_task_id из индекса.
+            # Обход "вниз" (зависимые) покрывает уникальный индекс (parent_task, child_task)
+            models.Index(fields=["child_task", "parent_task"], name="idx_task_deps_child_parent"),
+        ]
         constraints = [
-            # Запрет дублирования связей
+            # Запрет дублирования связей (он же индекс для обхода "вниз")
             models.UniqueConstraint(
                 fields=["parent_task", "child_task"],
                 name="unique_task_dependency",
@@ -199,6 +529,107 @@ class TaskDependency(models.Model):
             ),
         ]
 
+    objects = TaskDependencyQuerySet.as_manager()
+
+    # Ключ advisory-блокировки PostgreSQL: записи зависимостей выполняются по одной,
+    # чтобы две параллельные транзакции не замкнули цикл, не видя рёбер друг друга
+    GRAPH_LOCK_ID = 7_341_001
+
+    @classmethod
+    def lock_graph(cls, using=None) -> None:
+        """Блокировка записи зависимостей до конца текущей транзакции (на SQLite записи и так по одной)."""
+        conn = connections[using or cls.objects.db]
+        if conn.vendor == "postgresql":
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_xact_lock(%s)", [cls.GRAPH_LOCK_ID])
+
+    def clean(self) -> None:
+        """
+        Запрет циклов: A -> B -> C -> A.
+        Проверка по БД (WITH RECURSIVE): видит рёбра всех процессов. В save() выполняется под lock_graph().
+        """
+        from tracker.api.dependencies import dependency_path_exists
+
+        if self.parent_task_id is None or self.child_task_id is None or self.parent_task_id == self.child_task_id:
+            return  # обязательность и самоссылку проверяют поля и CheckConstraint
+
+        if dependency_path_exists(self.child_task_id, self.parent_task_id, using=self._state.db):
+            raise ValidationError(
+                {"child_task": "Зависимость создаёт цикл: родительская задача уже зависит от дочерней."}
+            )
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get("using")):
+            self.lock_graph(kwargs.get("using"))
+            # clean_fields() + clean() + ограничения (уникальность, самоссылка)
+            self.full_clean()
+            return super().save(*args, **kwargs)
+
     # возвращаю объекты, а не id (возможно поменяю)
     def __str__(self) -> str:
         return f"{self.parent_task} -> {self.child_task}"
+
+
+class ReportUpload(models.Model):
+    """
+    Сессия докачиваемой загрузки отчёта (report_uploads).
+    Части пишутся сразу в файл на диске (REPORT_UPLOAD_DIR), в строке - сколько байт уже принято.
+    При завершении файл прикрепляется к Task.report_file, сессия удаляется.
+    """
+
+    # uuid, а не порядковый номер: id сессии есть в URL загрузки
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False,
+    )
+    task = models.ForeignKey(
+        Task,
+        on_delete=models.CASCADE,
+        related_name="report_uploads",
+        verbose_name="Задача",
+    )
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name="Кто загружает",
+    )
+    filename = models.CharField(
+        max_length=255,
+        verbose_name="Имя файла",
+    )
+    size = models.PositiveBigIntegerField(
+        verbose_name="Размер файла, байт",
+    )
+    offset = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name="Принято байт",
+    )
+    # Если клиент передал хеш файла, при завершении он сверяется с полученным
+    sha256 = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        verbose_name="Ожидаемый SHA-256",
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Дата создания",
+    )
+    # Время последней принятой части: по нему удаляются брошенные сессии
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Дата изменения",
+    )
+
+    class Meta:
+        db_table = "report_uploads"
+        verbose_name = "Загрузка отчёта"
+        verbose_name_plural = "Загрузки отчётов"
+        indexes = [
+            models.Index(fields=["updated_at"], name="idx_report_uploads_updated"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.filename} ({self.offset}/{self.size})"
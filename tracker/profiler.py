@@ -0,0 +1,193 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+
+# ПРОФИЛИРОВАНИЕ ЗАПРОСОВ ПО ТРЕБОВАНИЮ
+#
+# Admin добавляет к запросу /api/ заголовок "X-Profile: 1" (или ?_profile=1):
+# запрос выполняется под cProfile, все SQL-запросы пишутся с временем, для самых
+# медленных SELECT выполняется EXPLAIN (без ANALYZE - запрос повторно не выполняется).
+# Профиль сохраняется JSON-файлом в PROFILER_DIR; файлов не больше PROFILER_MAX_ENTRIES
+# (старые удаляются - кольцевой буфер), просмотр - в админке (/admin/profiles/).
+# В ответ добавляется заголовок X-Profile-Id.
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_PARAM = "_profile"
+PROFILE_ID_RE = re.compile(r"^[0-9]{8}T[0-9]{12}-[0-9a-f]{8}$")
+# EXPLAIN только для чтения: SELECT и WITH без изменяющих данные подзапросов
+READ_ONLY_SQL_RE = re.compile(r"^\s*(SELECT\b|WITH\b(?!.*\b(INSERT|UPDATE|DELETE)\b))", re.IGNORECASE | re.DOTALL)
+
+STATS_LINES = 60  # строк pstats в профиле (по cumulative time)
+
+
+def is_requested(request) -> bool:
+    return request.headers.get(PROFILE_HEADER) == "1" or request.GET.get(PROFILE_PARAM) == "1"
+
+
+def can_profile(request) -> bool:
+    """Суперпользователь (сессия админки) или пользователь группы Admin (JWT)."""
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated and user.is_superuser:
+        return True
+
+    from rest_framework.exceptions import APIException
+    from rest_framework.request import Request
+    from rest_framework.settings import api_settings
+
+    from tracker.api.roles import get_request_roles
+
+    drf_request = Request(request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+    try:
+        return drf_request.user.is_authenticated and "Admin" in get_request_roles(drf_request)
+    except APIException:
+        return False
+
+
+class RequestProfile:
+    """Сбор профиля одного запроса: cProfile + список SQL-запросов с временем."""
+
+    def __init__(self):
+        self.profiler = cProfile.Profile()
+        self.queries: List[dict] = []
+        self.query_count = 0
+        self.sql_seconds = 0.0
+        self.started = None
+        self.duration = 0.0
+        self._lock = threading.Lock()
+
+    def query_wrapper(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:  # под ASGI SQL запроса может идти из нескольких потоков
+                self._record_query(sql, params, many, context, elapsed)
+
+    def _record_query(self, sql, params, many, context, elapsed) -> None:
+        self.query_count += 1
+        self.sql_seconds += elapsed
+        if len(self.queries) < settings.PROFILER_MAX_QUERIES:
+            self.queries.append({
+                "alias": context["connection"].alias,
+                "sql": sql,
+                "params": None if many else params,
+                "duration_ms": round(elapsed * 1000, 3),
+            })
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        try:
+            self.profiler.enable()
+        except ValueError:
+            # в этом процессе уже идёт профилирование (другой поток): остаются SQL и время
+            self.profiler = None
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.profiler is not None:
+            self.profiler.disable()
+        self.duration = time.perf_counter() - self.started
+
+    def stats_text(self) -> str:
+        if self.profiler is None:
+            return "cProfile занят другим запросом этого процесса."
+        stream = io.StringIO()
+        pstats.Stats(self.profiler, stream=stream).sort_stats("cumulative").print_stats(STATS_LINES)
+        return stream.getvalue()
+
+    def explain_slowest(self) -> List[dict]:
+        """EXPLAIN для самых медленных SELECT (синтаксис EXPLAIN берётся у бэкенда БД)."""
+        selects = [
+            query for query in self.queries
+            if READ_ONLY_SQL_RE.match(query["sql"]) and query["params"] is not None
+        ]
+        slowest = sorted(selects, key=lambda query: query["duration_ms"], reverse=True)
+        explains = []
+        for query in slowest[:settings.PROFILER_EXPLAIN_TOP]:
+            connection = connections[query["alias"]]
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(f"{connection.ops.explain_query_prefix()} {query['sql']}", query["params"])
+                    plan = "\n".join(" ".join(str(value) for value in row) for row in cursor.fetchall())
+            except DatabaseError as exc:
+                plan = f"EXPLAIN failed: {exc}"
+            explains.append({"sql": query["sql"], "duration_ms": query["duration_ms"], "plan": plan})
+        return explains
+
+    def to_dict(self, request, response) -> dict:
+        return {
+            "method": request.method,
+            "path": request.path,
+            "query_string": request.META.get("QUERY_STRING", ""),
+            "status": response.status_code,
+            "user_id": getattr(getattr(request, "user", None), "id", None),
+            "duration_ms": round(self.duration * 1000, 3),
+            "sql_count": self.query_count,
+            "sql_ms": round(self.sql_seconds * 1000, 3),
+            "queries": self.queries,
+            "explains": self.explain_slowest(),
+            "profile": self.stats_text(),
+        }
+
+
+# ХРАНИЛИЩЕ (кольцевой буфер файлов)
+
+def _profile_dir() -> str:
+    return str(settings.PROFILER_DIR)
+
+
+def _profile_path(profile_id: str) -> str:
+    return os.path.join(_profile_dir(), f"{profile_id}.json")
+
+
+def save_profile(data: dict) -> str:
+    """Записать профиль (атомарно, через временный файл) и удалить самые старые сверх лимита."""
+    os.makedirs(_profile_dir(), exist_ok=True)
+    now = datetime.now(timezone.utc)
+    profile_id = f"{now:%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}"
+    data = {"id": profile_id, "created_at": now.isoformat(timespec="seconds"), **data}
+
+    tmp_path = f"{_profile_path(profile_id)}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as tmp_file:
+        json.dump(data, tmp_file, ensure_ascii=False, default=str)
+    os.replace(tmp_path, _profile_path(profile_id))
+
+    for old_id in list_profile_ids()[settings.PROFILER_MAX_ENTRIES:]:
+        try:
+            os.remove(_profile_path(old_id))
+        except FileNotFoundError:
+            pass  # уже удалил другой воркер
+    return profile_id
+
+
+def list_profile_ids() -> List[str]:
+    """id профилей, новые первыми (id начинается с времени создания)."""
+    try:
+        names = os.listdir(_profile_dir())
+    except FileNotFoundError:
+        return []
+    ids = [name[:-len(".json")] for name in names if name.endswith(".json")]
+    return sorted((profile_id for profile_id in ids if PROFILE_ID_RE.match(profile_id)), reverse=True)
+
+
+def load_profile(profile_id: str) -> Optional[dict]:
+    if not PROFILE_ID_RE.match(profile_id):
+        return None
+    try:
+        with open(_profile_path(profile_id), encoding="utf-8") as profile_file:
+            return json.load(profile_file)
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,91 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+
+from tracker import sqlhooks
+from tracker.api.analytics import bump_data_version
+from tracker.api.authentication import invalidate_auth_stamps
+from tracker.api.roles import invalidate_user_roles
+from tracker.models import Employee, Task, TaskDependency, data_changed
+
+
+# Модели, от которых зависят результаты аналитики
+TRACKED_MODELS = (Employee, Task, TaskDependency)
+
+
+def _on_data_changed(sender, **kwargs) -> None:
+    """
+    Любая запись в отслеживаемые модели -> новая версия данных.
+    Версию увеличиваем только после коммита: иначе параллельный запрос
+    успеет закэшировать под новой версией ещё старые данные.
+    """
+    if sender in TRACKED_MODELS:
+        transaction.on_commit(bump_data_version)
+
+
+for model in TRACKED_MODELS:
+    post_save.connect(_on_data_changed, sender=model, dispatch_uid=f"tracker_data_version_save_{model.__name__}")
+    post_delete.connect(_on_data_changed, sender=model, dispatch_uid=f"tracker_data_version_delete_{model.__name__}")
+
+data_changed.connect(_on_data_changed, dispatch_uid="tracker_data_version_bulk")
+
+
+def _invalidate_user_roles_on_commit(user_ids=None) -> None:
+    """Кэш ролей - тоже после коммита (иначе в него успеют попасть роли из старых строк)."""
+    if user_ids is not None:
+        user_ids = list(user_ids)
+    transaction.on_commit(lambda: invalidate_user_roles(user_ids))
+
+
+def _invalidate_auth_stamps_on_commit(user_ids) -> None:
+    """
+    Штампы сбрасываем только после коммита: иначе параллельный запрос успеет
+    пересчитать штамп по ещё старой строке и закэшировать его на AUTH_STAMP_CACHE_TTL.
+    """
+    user_ids = list(user_ids)
+    transaction.on_commit(lambda: invalidate_auth_stamps(user_ids))
+
+
+def _on_user_groups_changed(sender, instance, action, reverse, pk_set, **kwargs) -> None:
+    """
+    Изменение состава групп -> сброс кэша ролей и штампов затронутых пользователей.
+    user.groups.add(...) - instance = пользователь, group.user_set.add(...) - pk_set = пользователи.
+    """
+    if reverse and action == "pre_clear":
+        # group.user_set.clear(): после очистки состав группы уже не получить
+        user_ids = list(instance.user_set.values_list("pk", flat=True))
+    elif not action.startswith("post_") or action == "post_clear" and reverse:
+        return
+    elif not reverse:
+        user_ids = [instance.pk]
+    else:
+        user_ids = list(pk_set or ())
+
+    _invalidate_user_roles_on_commit(user_ids)
+    _invalidate_auth_stamps_on_commit(user_ids)
+
+
+def _on_group_changed(sender, instance, **kwargs) -> None:
+    """Переименование/удаление группы меняет роли всех её участников."""
+    _invalidate_user_roles_on_commit()
+    _invalidate_auth_stamps_on_commit(instance.user_set.values_list("pk", flat=True))
+
+
+def _on_user_changed(sender, instance, **kwargs) -> None:
+    """Смена пароля, блокировка или удаление пользователя -> пересчёт штампа (отзыв токенов)."""
+    _invalidate_auth_stamps_on_commit([instance.pk])
+
+
+User = get_user_model()
+
+m2m_changed.connect(_on_user_groups_changed, sender=User.groups.through, dispatch_uid="tracker_roles_groups_changed")
+post_save.connect(_on_group_changed, sender=Group, dispatch_uid="tracker_roles_group_save")
+# pre_delete: после удаления участников группы уже не получить
+pre_delete.connect(_on_group_changed, sender=Group, dispatch_uid="tracker_roles_group_delete")
+post_save.connect(_on_user_changed, sender=User, dispatch_uid="tracker_auth_user_save")
+post_delete.connect(_on_user_changed, sender=User, dispatch_uid="tracker_auth_user_delete")
+
+# SQL-запросы любых потоков запроса (в том числе sync_to_async под ASGI) - в его замеры
+connection_created.connect(sqlhooks.install, dispatch_uid="tracker_sql_observers")
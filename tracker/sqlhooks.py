@@ -0,0 +1,42 @@
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Tuple
+
+
+# НАБЛЮДЕНИЕ ЗА SQL-ЗАПРОСАМИ ЗАПРОСА
+#
+# connection.execute_wrapper() действует только на соединение текущего потока.
+# Под ASGI SQL выполняется в потоках sync_to_async, а с thread_sensitive=False
+# (tracker/api/async_analytics.py) - ещё и в других потоках со своими соединениями.
+# Поэтому обёртка ставится на каждое соединение при его открытии (сигнал connection_created),
+# а обработчики текущего запроса она берёт из ContextVar: sync_to_async переносит контекст в поток.
+# Вне observe_queries() обёртка стоит одного ContextVar.get().
+
+QueryWrapper = Callable  # (execute, sql, params, many, context) -> результат execute
+
+_observers: ContextVar[Tuple[QueryWrapper, ...]] = ContextVar("tracker_query_observers", default=())
+
+
+def _dispatch(execute, sql, params, many, context):
+    observers = _observers.get()
+    # первый добавленный обработчик - внешний, как у вложенных execute_wrapper()
+    for observer in reversed(observers):
+        execute = functools.partial(observer, execute)
+    return execute(sql, params, many, context)
+
+
+def install(connection, **kwargs) -> None:
+    """Обработчик connection_created. Обёртка - первой в списке: execute_wrapper() снимает последнюю."""
+    if _dispatch not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _dispatch)
+
+
+@contextmanager
+def observe_queries(wrapper: QueryWrapper):
+    """Передавать wrapper все SQL-запросы этого контекста (в любых потоках и соединениях)."""
+    token = _observers.set((*_observers.get(), wrapper))
+    try:
+        yield
+    finally:
+        _observers.reset(token)
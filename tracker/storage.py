@@ -0,0 +1,187 @@
+import hashlib
+import os
+import re
+import time
+from typing import Iterable, Optional, Tuple
+
+from django.core.files import File
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.utils.deconstruct import deconstructible
+
+
+# ХРАНЕНИЕ ОТЧЁТОВ ПО СОДЕРЖИМОМУ (SHA-256)
+#
+# Загрузка пишется во временный файл на диске по частям и сразу хешируется
+# (HashingFileUploadHandler), в памяти файл целиком не держится.
+# Имя файла в хранилище - его SHA-256: одинаковые отчёты хранятся один раз,
+# временный файл переносится на место переименованием, без копирования.
+# Ссылки на файл - задачи с тем же report_sha256 (поле с индексом): файл удаляется
+# после коммита, когда на него не осталось задач (Task.delete/save, TaskQuerySet.delete).
+# Сохранение (проверка "файл уже есть") и удаление одного хеша сериализуются блокировкой
+# по хешу до конца транзакции (lock_report_hash), иначе удаление могло бы пройти между
+# дедупликацией и коммитом задачи, которая ссылается на этот файл.
+# Файлы, записанные в откаченных транзакциях, собирает manage.py cleanup_report_files.
+
+REPORT_PREFIX = "task_reports/sha256"
+HASH_CHUNK_SIZE = 1024 * 1024
+_HASHED_NAME_RE = re.compile(rf"^{re.escape(REPORT_PREFIX)}/[0-9a-f]{{2}}/(?P<sha256>[0-9a-f]{{64}})(\.[\w]+)?$")
+
+
+class HashingFileUploadHandler(TemporaryFileUploadHandler):
+    """Загрузка во временный файл с подсчётом SHA-256 по мере приёма частей."""
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.sha256 = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.sha256.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        uploaded = super().file_complete(file_size)
+        uploaded.sha256 = self.sha256.hexdigest()
+        return uploaded
+
+
+class StagedFile(File):
+    """
+    Файл, уже целиком лежащий на диске (сессия докачиваемой загрузки):
+    FileSystemStorage переносит его по temporary_file_path() переименованием, без копирования.
+    """
+
+    def __init__(self, path: str, name: str, sha256: str):
+        super().__init__(open(path, "rb"), name)
+        self.path = path
+        self.sha256 = sha256
+
+    def temporary_file_path(self) -> str:
+        return self.path
+
+
+def file_sha256(content) -> str:
+    """SHA-256 файла: готовый от HashingFileUploadHandler или читаем по частям."""
+    known = getattr(content, "sha256", None)
+    if known:
+        return known
+    sha256 = hashlib.sha256()
+    if hasattr(content, "seek"):
+        content.seek(0)
+    for chunk in content.chunks(HASH_CHUNK_SIZE):
+        sha256.update(chunk)
+    if hasattr(content, "seek"):
+        content.seek(0)
+    return sha256.hexdigest()
+
+
+def lock_report_hash(sha256: str, using: Optional[str] = None) -> None:
+    """
+    Блокировка по хешу отчёта до конца текущей транзакции (PostgreSQL advisory lock).
+    На других БД ничего не делает (SQLite и так выполняет записи по одной).
+    """
+    connection = connections[using or DEFAULT_DB_ALIAS]
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", [f"tracker:report:{sha256}"])
+
+
+def sha256_from_name(name: Optional[str]) -> Optional[str]:
+    """Хеш из имени файла хранилища (None - файл сохранён не по содержимому, например старый)."""
+    match = _HASHED_NAME_RE.match(name or "")
+    return match.group("sha256") if match else None
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    FileSystemStorage, где имя файла - SHA-256 содержимого (расширение сохраняется для Content-Type):
+    task_reports/sha256/ab/ab12...ef.pdf. Уже сохранённое содержимое повторно не пишется.
+    """
+
+    def hashed_name(self, name: str, sha256: str) -> str:
+        extension = os.path.splitext(name)[1].lower()
+        if not re.fullmatch(r"\.\w{1,16}", extension):
+            extension = ""
+        return f"{REPORT_PREFIX}/{sha256[:2]}/{sha256}{extension}"
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        target = self.hashed_name(name, file_sha256(content))
+        if self.exists(target):
+            return target  # такой отчёт уже есть - дедупликация
+
+        saved = super().save(target, content, max_length=max_length)
+        if saved != target:
+            # параллельная загрузка того же содержимого успела раньше: копия не нужна
+            self.delete(saved)
+        return target
+
+
+def get_report_storage() -> ContentAddressedStorage:
+    """Хранилище Task.report_file (callable - в миграциях хранится ссылка, а не настройки)."""
+    return ContentAddressedStorage()
+
+
+def release_report_files(references: Iterable[Tuple[str, str]]) -> None:
+    """
+    Удалить файлы отчётов (имя, SHA-256), на которые больше не ссылается ни одна задача.
+    Вызывается после коммита: при откате файлы должны остаться.
+    """
+    from tracker.models import Task
+
+    references = {(name, sha256) for name, sha256 in references if name and sha256}
+    if not references:
+        return
+    hashes = sorted({sha256 for _, sha256 in references})
+    storage = Task._meta.get_field("report_file").storage
+    with transaction.atomic():
+        for sha256 in hashes:  # в одном порядке во всех транзакциях - без взаимных блокировок
+            lock_report_hash(sha256)
+        still_used = set(
+            Task.objects
+            .filter(report_sha256__in=hashes)
+            .values_list("report_sha256", flat=True)
+            .distinct()
+        )
+        for name, sha256 in references:
+            if sha256 not in still_used and sha256_from_name(name) == sha256:
+                storage.delete(name)
+
+
+def collect_orphan_report_files(min_age: float, dry_run: bool = False) -> int:
+    """
+    Удалить файлы хранилища отчётов, на которые не ссылается ни одна задача
+    (записаны в транзакции, которая потом откатилась). Файлы моложе min_age секунд не трогаем.
+    Возвращает число удалённых (при dry_run - найденных) файлов.
+    """
+    from tracker.models import Task
+
+    storage = Task._meta.get_field("report_file").storage
+    root = storage.path(REPORT_PREFIX)
+    cutoff = time.time() - min_age
+    removed = 0
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(directory, filename)
+            name = os.path.relpath(path, storage.location).replace(os.sep, "/")
+            sha256 = sha256_from_name(name)
+            try:
+                if sha256 is None or os.path.getmtime(path) >= cutoff:
+                    continue
+            except FileNotFoundError:
+                continue
+            with transaction.atomic():
+                # ждём транзакции, которые сейчас сохраняют задачу с этим файлом
+                lock_report_hash(sha256)
+                if Task.objects.filter(report_sha256=sha256).exists():
+                    continue
+                if not dry_run:
+                    storage.delete(name)
+            removed += 1
+    return removed
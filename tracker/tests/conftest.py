@@ -2,9 +2,11 @@ import pytest
 from datetime import date, timedelta
 
 from django.contrib.auth.models import Group
+from django.core.cache import caches
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from tracker.api.roles import invalidate_user_roles
 from tracker.models import Employee, Task
 
 
@@ -140,3 +142,24 @@ def task_base(db, emp_owner, emp_assignee, valid_due_date) -> Task:
         assignee=emp_assignee,
         due_date=valid_due_date,
     )
+
+
+@pytest.fixture(autouse=True)
+def clear_analytics_cache():
+    """
+    Кэш аналитики живёт в памяти процесса, а БД откатывается после каждого теста:
+    очищаем кэш, чтобы тесты не видели результаты друг друга.
+    """
+    caches["analytics"].clear()
+    yield
+    caches["analytics"].clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_role_cache():
+    """
+    Кэш ролей тоже в памяти процесса, а id пользователей после отката БД повторяются.
+    """
+    invalidate_user_roles()
+    yield
+    invalidate_user_roles()
@@ -0,0 +1,99 @@
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from tracker.models import Employee, Task
+
+pytestmark = pytest.mark.django_db  # - это "глобальная метка" для всего файла.
+
+
+def _load(*employees) -> list[int]:
+    """Текущие значения счётчика из БД."""
+    return [Employee.objects.get(pk=e.pk).active_tasks_count for e in employees]
+
+
+def _task(owner, assignee, due_date, status=Task.Status.IN_PROGRESS, title="t") -> Task:
+    return Task.objects.create(title=title, status=status, owner=owner, assignee=assignee, due_date=due_date)
+
+
+def test_counter_follows_save_and_delete(emp_owner, emp_assignee, valid_due_date):
+    """
+    Создание, смена статуса, переназначение и удаление задачи меняют счётчик.
+    """
+    task = _task(emp_owner, emp_assignee, valid_due_date)
+    assert _load(emp_assignee) == [1]
+
+    task.status = Task.Status.NEW
+    task.save()
+    assert _load(emp_assignee) == [0]
+
+    other = Employee.objects.create(full_name="Other Worker", position="Dev", email="ow@example.com")
+    task = Task.objects.get(pk=task.pk)
+    task.status = Task.Status.REVIEW
+    task.assignee = other
+    task.save()
+    assert _load(emp_assignee, other) == [0, 1]
+
+    task.delete()
+    assert _load(other) == [0]
+
+
+def test_counter_follows_queryset_operations(emp_owner, emp_assignee, valid_due_date):
+    """
+    Массовые операции (update/bulk_create/bulk_update/delete) тоже поддерживают счётчик.
+    """
+    other = Employee.objects.create(full_name="Other Worker", position="Dev", email="ow@example.com")
+
+    tasks = Task.objects.bulk_create([
+        Task(title=f"b{i}", status=Task.Status.IN_PROGRESS, owner=emp_owner, assignee=emp_assignee, due_date=valid_due_date)
+        for i in range(3)
+    ])
+    assert _load(emp_assignee) == [3]
+
+    Task.objects.filter(pk=tasks[0].pk).update(assignee=other)
+    assert _load(emp_assignee, other) == [2, 1]
+
+    tasks[1].assignee = other
+    Task.objects.bulk_update(tasks[1:], ["assignee"])
+    assert _load(emp_assignee, other) == [1, 2]
+
+    Task.objects.filter(assignee=other).update(status=Task.Status.NEW)
+    assert _load(emp_assignee, other) == [1, 0]
+
+    Task.objects.all().delete()
+    assert _load(emp_assignee, other) == [0, 0]
+
+
+def test_rebuild_active_load_command(emp_owner, emp_assignee, valid_due_date):
+    """
+    --check находит расхождение, команда без флага его исправляет.
+    """
+    _task(emp_owner, emp_assignee, valid_due_date)
+    Employee.objects.filter(pk=emp_assignee.pk).update(active_tasks_count=5)  # "сломали" счётчик
+
+    with pytest.raises(CommandError):
+        call_command("rebuild_active_load", "--check")
+
+    call_command("rebuild_active_load")
+    assert _load(emp_assignee) == [1]
+    call_command("rebuild_active_load", "--check")
+
+
+def test_counter_after_refresh_from_db(emp_owner, emp_assignee, valid_due_date):
+    """
+    refresh_from_db() обновляет запомненные статус/исполнителя: save() после него сравнивает с БД.
+    """
+    task = _task(emp_owner, emp_assignee, valid_due_date)
+    Task.objects.filter(pk=task.pk).update(status=Task.Status.NEW)
+    assert _load(emp_assignee) == [0]
+
+    task.refresh_from_db()
+    task.status = Task.Status.IN_PROGRESS
+    task.save()
+    assert _load(emp_assignee) == [1]
+
+    Task.objects.filter(pk=task.pk).update(status=Task.Status.DONE)
+    task.refresh_from_db(fields=["status"])
+    task.status = Task.Status.REVIEW
+    task.save()
+    assert _load(emp_assignee) == [1]
@@ -1,6 +1,10 @@
 import pytest
 from datetime import date, timedelta
 
+from django.core.cache import caches
+from prometheus_client import REGISTRY
+
+from tracker.api.assignment import suggest_assignees
 from tracker.models import Employee, Task, TaskDependency
 
 pytestmark = pytest.mark.django_db  # - это "глобальная метка" для всего файла.
@@ -8,6 +12,8 @@ pytestmark = pytest.mark.django_db  # - это "глобальная метка"
 # URL аналитики (чтобы не дублировать строки)
 BUSY_URL = "/api/analytics/busy-employees/"
 IMPORTANT_URL = "/api/analytics/important-tasks/"
+ASYNC_BUSY_URL = "/api/async/analytics/busy-employees/"
+ASYNC_IMPORTANT_URL = "/api/async/analytics/important-tasks/"
 
 
 def _tomorrow():
@@ -126,3 +132,147 @@ def test_important_tasks_parent_included(auth_client, manager_token):
 
     # Проверяем, что родительская задача попала в выдачу
     assert parent.id in ids
+
+
+def test_analytics_cache_hit_and_invalidation(auth_client, manager_token, django_capture_on_commit_callbacks):
+    """
+    Повторный запрос отдаётся из кэша, а запись задачи (после коммита)
+    меняет версию данных и следующий ответ пересчитывается.
+    """
+    owner = Employee.objects.create(full_name="Task Owner", position="Lead", email="owner3@example.com")
+    worker = Employee.objects.create(full_name="Worker", position="Dev", email="worker3@example.com")
+
+    client = auth_client(manager_token)
+    hits, misses = (REGISTRY.get_sample_value("tracker_analytics_cache_total", {"result": result}) or 0
+                    for result in ("hit", "miss"))
+
+    first = client.get(BUSY_URL)
+    assert first["X-Cache"] == "MISS"
+    assert first.json() == []
+
+    second = client.get(BUSY_URL)
+    assert second["X-Cache"] == "HIT"
+    # попадания/промахи - в метрике Prometheus (/api/metrics/)
+    assert REGISTRY.get_sample_value("tracker_analytics_cache_total", {"result": "hit"}) == hits + 1
+    assert REGISTRY.get_sample_value("tracker_analytics_cache_total", {"result": "miss"}) == misses + 1
+
+    # Коллбэки on_commit в тестовой транзакции выполняем явно
+    with django_capture_on_commit_callbacks(execute=True):
+        Task.objects.create(
+            title="new", status=Task.Status.IN_PROGRESS,
+            owner=owner, assignee=worker, due_date=_tomorrow()
+        )
+
+    third = client.get(BUSY_URL)
+    assert third["X-Cache"] == "MISS"
+    assert [item["id"] for item in third.json()] == [worker.id]
+
+
+def test_suggest_assignees_spreads_load():
+    """
+    Каждая рекомендация увеличивает нагрузку, владелец задачи не предлагается,
+    исполнитель дочерней задачи выбирается, пока он в пределах min_load + 2.
+    """
+    loads = {1: 0, 2: 0, 3: 5}
+
+    # 4 задачи без кандидата: 1, 2, 1, 2 (а не все первому)
+    tasks = [(10 + i, 99, None) for i in range(4)]
+    assert [emp for _, emp in suggest_assignees(tasks, loads)] == [1, 2, 1, 2]
+    assert loads == {1: 0, 2: 0, 3: 5}  # входной словарь не меняется
+
+    # владелец задачи (1) не может быть исполнителем
+    assert suggest_assignees([(10, 1, None)], loads) == [(10, 2)]
+
+    # кандидат 2: нагрузка 0, 1, 2 <= min_load + 2, затем 3 > 0 + 2 - уходит к 1
+    tasks = [(20 + i, 99, 2) for i in range(4)]
+    assert [emp for _, emp in suggest_assignees(tasks, loads)] == [2, 2, 2, 1]
+
+    assert suggest_assignees([(30, 99, None)], {}) == [(30, None)]
+
+
+def test_important_tasks_commit(auth_client, manager_token):
+    """
+    POST ?commit=true назначает рекомендованных исполнителей, GET только рекомендует.
+    """
+    owner = Employee.objects.create(full_name="Task Owner", position="Lead", email="owner4@example.com")
+    busy = Employee.objects.create(full_name="Busy Worker", position="Dev", email="busy@example.com")
+    free = [
+        Employee.objects.create(full_name=f"Free Worker {i}", position="Dev", email=f"free{i}@example.com")
+        for i in range(2)
+    ]
+    for i in range(4):
+        Task.objects.create(
+            title=f"active{i}", status=Task.Status.IN_PROGRESS,
+            owner=owner, assignee=busy, due_date=_tomorrow(),
+        )
+    child = Task.objects.filter(assignee=busy).first()
+
+    parents = []
+    for i in range(4):
+        parent = Task.objects.create(
+            title=f"parent{i}", status=Task.Status.NEW,
+            owner=owner, assignee=busy, due_date=_tomorrow() + timedelta(days=i),
+        )
+        TaskDependency.objects.create(parent_task=parent, child_task=child)
+        parents.append(parent)
+
+    client = auth_client(manager_token)
+
+    data = client.get(IMPORTANT_URL).json()
+    suggested = [item["suggested_employee_id"] for item in data]
+    # owner (0 задач) не предлагается; нагрузка распределяется между свободными сотрудниками
+    assert sorted(suggested) == sorted([free[0].id, free[0].id, free[1].id, free[1].id])
+    assert Task.objects.filter(assignee=busy, status=Task.Status.NEW).count() == 4
+
+    resp = client.post(f"{IMPORTANT_URL}?commit=true")
+    assert resp.status_code == 200
+    assigned = dict(Task.objects.filter(id__in=[p.id for p in parents]).values_list("id", "assignee_id"))
+    assert assigned == {item["id"]: item["suggested_employee_id"] for item in resp.json()}
+
+
+@pytest.mark.parametrize("sync_url, async_url", [
+    (BUSY_URL, ASYNC_BUSY_URL),
+    (IMPORTANT_URL, ASYNC_IMPORTANT_URL),
+])
+def test_async_analytics_same_as_sync(auth_client, manager_token, sync_url, async_url):
+    """Async-эндпоинт отдаёт те же данные и тот же ETag, что и синхронный; If-None-Match -> 304."""
+    owner = Employee.objects.create(full_name="Task Owner", position="Lead", email="owner5@example.com")
+    worker = Employee.objects.create(full_name="Worker", position="Dev", email="worker5@example.com")
+    parent = Task.objects.create(
+        title="parent", status=Task.Status.NEW, owner=owner, assignee=worker, due_date=_tomorrow()
+    )
+    child = Task.objects.create(
+        title="child", status=Task.Status.IN_PROGRESS, owner=owner, assignee=worker, due_date=_tomorrow()
+    )
+    TaskDependency.objects.create(parent_task=parent, child_task=child)
+
+    client = auth_client(manager_token)
+
+    async_resp = client.get(async_url)
+    assert async_resp.status_code == 200
+    assert async_resp["X-Cache"] == "MISS"
+    assert async_resp.json()
+
+    caches["analytics"].clear()  # синхронный ответ считаем заново, а не берём из кэша
+    sync_resp = client.get(sync_url)
+    assert sync_resp["X-Cache"] == "MISS"
+    assert async_resp.json() == sync_resp.json()
+    assert async_resp["ETag"] == sync_resp["ETag"]
+
+    resp = client.get(async_url, HTTP_IF_NONE_MATCH=async_resp["ETag"])
+    assert resp.status_code == 304
+    assert resp["X-Cache"] == "HIT"
+
+
+def test_async_analytics_permissions(api_client, auth_client, employee_token):
+    """Те же права и формат ошибок, что у синхронных эндпоинтов."""
+    resp = api_client.get(ASYNC_BUSY_URL)
+    assert resp.status_code == 401
+    assert resp.json()["status"] == "error"
+    assert "WWW-Authenticate" in resp
+
+    resp = auth_client(employee_token).get(ASYNC_IMPORTANT_URL)
+    assert resp.status_code == 403
+    assert resp.json()["status"] == "error"
+
+    assert api_client.post(ASYNC_BUSY_URL).status_code == 405
@@ -0,0 +1,119 @@
+import pytest
+from django.db import transaction
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from tracker.api.authentication import StatelessJWTAuthentication, _stamp_cache, _stamp_key
+from tracker.api.views import TaskViewSet
+
+pytestmark = pytest.mark.django_db  # - это "глобальная метка" для всего файла.
+
+TOKEN_URL = "/api/auth/token/"
+REFRESH_URL = "/api/auth/token/refresh/"
+
+
+def _obtain(api_client, username: str) -> dict:
+    resp = api_client.post(TOKEN_URL, {"username": username, "password": "pass12345"}, format="json")
+    assert resp.status_code == 200
+    return resp.json()
+
+
+def _authenticate(access: str):
+    request = APIRequestFactory().get("/api/tasks/", HTTP_AUTHORIZATION=f"Bearer {access}")
+    return StatelessJWTAuthentication().authenticate(request)
+
+
+def test_stateless_auth_without_queries(api_client, manager_user, django_assert_num_queries):
+    """
+    Пользователь строится из claims; после прогрева штампа - ни одного запроса.
+    """
+    access = _obtain(api_client, "manager")["access"]
+    assert AccessToken(access)["roles"] == ["Manager"]
+
+    _authenticate(access)  # промах кэша штампа: один запрос
+    with django_assert_num_queries(0):
+        user, token = _authenticate(access)
+
+    assert isinstance(user, TokenUser)
+    assert str(user.id) == str(manager_user.id)
+
+
+def test_stateless_auth_revocation(api_client, manager_user, groups, django_capture_on_commit_callbacks):
+    """
+    Смена групп или пароля меняет штамп: старый access-токен отклоняется,
+    refresh выдаёт токен с актуальными ролями.
+    """
+    tokens = _obtain(api_client, "manager")
+    _authenticate(tokens["access"])
+
+    with django_capture_on_commit_callbacks(execute=True):
+        manager_user.groups.add(groups["Admin"])
+    with pytest.raises(AuthenticationFailed):
+        _authenticate(tokens["access"])
+
+    resp = api_client.post(REFRESH_URL, {"refresh": tokens["refresh"]}, format="json")
+    access = resp.json()["access"]
+    assert AccessToken(access)["roles"] == ["Admin", "Manager"]
+    _authenticate(access)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        manager_user.set_password("new-pass-123")
+        manager_user.save()
+    with pytest.raises(AuthenticationFailed):
+        _authenticate(access)
+
+
+def test_stamp_invalidated_after_commit(api_client, manager_user, django_capture_on_commit_callbacks):
+    """
+    Штамп сбрасывается после коммита смены пароля, а не до него: иначе запрос между сбросом
+    и коммитом закэшировал бы штамп старой строки и старый токен продолжал бы работать.
+    """
+    access = _obtain(api_client, "manager")["access"]
+    _authenticate(access)
+    key = _stamp_key(manager_user.pk)
+    stamp = _stamp_cache().get(key)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        with transaction.atomic():
+            manager_user.set_password("new-pass-123")
+            manager_user.save()
+            assert _stamp_cache().get(key) == stamp  # до коммита штамп не трогаем
+    assert _stamp_cache().get(key) is None
+
+    with pytest.raises(AuthenticationFailed):
+        _authenticate(access)
+
+
+def test_refresh_rejected_after_password_change(api_client, manager_user):
+    """После смены пароля старый refresh-токен больше не выдаёт access-токены."""
+    tokens = _obtain(api_client, "manager")
+    assert api_client.post(REFRESH_URL, {"refresh": tokens["refresh"]}, format="json").status_code == 200
+
+    manager_user.set_password("new-pass-123")
+    manager_user.save()
+    resp = api_client.post(REFRESH_URL, {"refresh": tokens["refresh"]}, format="json")
+    assert resp.status_code == 401
+
+
+def test_token_without_stamp_uses_database(manager_user, django_assert_num_queries):
+    """
+    Старые токены без auth_stamp проверяются обычным чтением пользователя.
+    """
+    access = str(RefreshToken.for_user(manager_user).access_token)
+    with django_assert_num_queries(1):
+        user, _ = _authenticate(access)
+    assert user == manager_user
+
+
+def test_tasks_list_no_auth_queries(api_client, employee_user, monkeypatch, django_assert_num_queries):
+    """
+    GET /api/tasks/ в stateless-режиме: только запрос задач.
+    """
+    monkeypatch.setattr(TaskViewSet, "authentication_classes", [StatelessJWTAuthentication])
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {_obtain(api_client, 'employee')['access']}")
+    assert api_client.get("/api/tasks/").status_code == 200
+
+    with django_assert_num_queries(1):
+        assert api_client.get("/api/tasks/").status_code == 200
@@ -0,0 +1,95 @@
+import pytest
+from datetime import date, timedelta
+
+from tracker.models import Task
+
+pytestmark = pytest.mark.django_db  # - это "глобальная метка" для всего файла.
+
+BULK_URL = "/api/tasks/bulk/"
+
+
+def _tomorrow() -> str:
+    return (date.today() + timedelta(days=1)).isoformat()
+
+
+def _row(owner, assignee, **extra) -> dict:
+    row = {"title": "Imported", "owner": owner.id, "assignee": assignee.id, "due_date": _tomorrow()}
+    row.update(extra)
+    return row
+
+
+@pytest.mark.parametrize("count", [2, 40])
+def test_bulk_create_constant_queries(auth_client, manager_token, emp_owner, emp_assignee,
+                                      django_assert_max_num_queries, count):
+    """
+    Пачка создаётся за фиксированное число запросов, независимо от размера.
+    (пользователь, группа, сотрудники, INSERT, перечитывание ответа + транзакция)
+    """
+    client = auth_client(manager_token)
+    payload = [_row(emp_owner, emp_assignee, title=f"t{i}") for i in range(count)]
+
+    with django_assert_max_num_queries(8):
+        resp = client.post(BULK_URL, payload, format="json")
+
+    assert resp.status_code == 201
+    data = resp.json()
+    assert [item["title"] for item in data] == [f"t{i}" for i in range(count)]
+    assert data[0]["owner_full_name"] == emp_owner.full_name
+    assert Task.objects.count() == count
+
+
+def test_bulk_create_row_errors_nothing_saved(auth_client, manager_token, emp_owner, emp_assignee):
+    """
+    Ошибки возвращаются построчно, и ни одна задача не создаётся.
+    """
+    client = auth_client(manager_token)
+    payload = [
+        _row(emp_owner, emp_assignee),                       # ok
+        _row(emp_owner, emp_owner),                          # owner == assignee
+        _row(emp_owner, emp_assignee, status="DONE"),        # DONE без отчёта
+        {**_row(emp_owner, emp_assignee), "assignee": 999999},  # нет такого сотрудника
+    ]
+
+    resp = client.post(BULK_URL, payload, format="json")
+
+    assert resp.status_code == 400
+    errors = resp.json()["errors"]
+    assert errors[0] == {}
+    assert "assignee" in errors[1]
+    assert "report_file" in errors[2]
+    assert "assignee" in errors[3]
+    assert Task.objects.count() == 0
+
+
+def test_bulk_update(auth_client, manager_token, task_base, emp_owner, emp_assignee):
+    """
+    PATCH: частичное обновление по id, правила проверяются по итоговому состоянию.
+    """
+    other = Task.objects.create(
+        title="Other", status=Task.Status.NEW,
+        owner=emp_owner, assignee=emp_assignee, due_date=task_base.due_date,
+    )
+    client = auth_client(manager_token)
+
+    resp = client.patch(BULK_URL, [
+        {"id": task_base.id, "status": "IN_PROGRESS"},
+        {"id": other.id, "title": "Renamed"},
+    ], format="json")
+
+    assert resp.status_code == 200
+    task_base.refresh_from_db()
+    other.refresh_from_db()
+    assert task_base.status == Task.Status.IN_PROGRESS
+    assert other.title == "Renamed"
+
+    # owner станет исполнителем - ошибка в строке, изменения не применяются
+    resp = client.patch(BULK_URL, [{"id": task_base.id, "assignee": emp_owner.id, "title": "X"}], format="json")
+    assert resp.status_code == 400
+    task_base.refresh_from_db()
+    assert task_base.title == "Base task"
+
+
+def test_employee_cannot_bulk_create_403(auth_client, employee_token, emp_owner, emp_assignee):
+    client = auth_client(employee_token)
+    resp = client.post(BULK_URL, [_row(emp_owner, emp_assignee)], format="json")
+    assert resp.status_code == 403
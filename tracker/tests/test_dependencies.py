@@ -0,0 +1,103 @@
+import pytest
+from django.core.exceptions import ValidationError
+from django.db import connection
+
+from tracker.api.dependencies import dependency_path_exists, edges_have_cycle
+from tracker.models import Task, TaskDependency
+
+pytestmark = pytest.mark.django_db  # - это "глобальная метка" для всего файла.
+
+
+def _tasks(owner, assignee, due_date, count: int) -> list[Task]:
+    return [
+        Task.objects.create(title=f"t{i}", owner=owner, assignee=assignee, due_date=due_date)
+        for i in range(count)
+    ]
+
+
+def test_edges_have_cycle():
+    assert not edges_have_cycle([(1, 2), (2, 3), (1, 4), (4, 3), (10, 11)])
+    assert edges_have_cycle([(1, 2), (2, 3), (3, 1), (10, 11)])
+    assert not edges_have_cycle([])
+
+
+def test_cycle_rejected_on_save(emp_owner, emp_assignee, valid_due_date):
+    """
+    A -> B -> C, затем C -> A: запись отклоняется.
+    """
+    a, b, c = _tasks(emp_owner, emp_assignee, valid_due_date, 3)
+    TaskDependency.objects.create(parent_task=a, child_task=b)
+    TaskDependency.objects.create(parent_task=b, child_task=c)
+
+    assert dependency_path_exists(a.id, c.id) and not dependency_path_exists(c.id, a.id)
+
+    with pytest.raises(ValidationError) as exc:
+        TaskDependency.objects.create(parent_task=c, child_task=a)
+    assert "child_task" in exc.value.message_dict
+    assert TaskDependency.objects.count() == 2
+
+    # после удаления ребра путь исчезает, и обратная связь становится допустимой
+    TaskDependency.objects.filter(parent_task=b, child_task=c).delete()
+    TaskDependency.objects.create(parent_task=c, child_task=a)
+    assert dependency_path_exists(c.id, b.id)
+
+
+def test_cycle_check_uses_database(emp_owner, emp_assignee, valid_due_date):
+    """
+    Рёбра, записанные в обход ORM (другим процессом), тоже учитываются.
+    """
+    a, b, c = _tasks(emp_owner, emp_assignee, valid_due_date, 3)
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {TaskDependency._meta.db_table} (parent_task_id, child_task_id) VALUES (%s, %s)",
+            [(a.id, b.id), (b.id, c.id)],
+        )
+
+    with pytest.raises(ValidationError):
+        TaskDependency.objects.create(parent_task=c, child_task=a)
+
+
+def test_bulk_writes_checked_for_cycles(emp_owner, emp_assignee, valid_due_date):
+    """
+    bulk_create()/update() не обходят проверку циклов: при цикле ничего не записывается.
+    """
+    a, b, c = _tasks(emp_owner, emp_assignee, valid_due_date, 3)
+    TaskDependency.objects.bulk_create([TaskDependency(parent_task=a, child_task=b)])
+
+    with pytest.raises(ValidationError):
+        TaskDependency.objects.bulk_create(
+            [TaskDependency(parent_task=b, child_task=c), TaskDependency(parent_task=c, child_task=a)]
+        )
+    assert TaskDependency.objects.count() == 1
+
+    TaskDependency.objects.create(parent_task=b, child_task=c)
+    with pytest.raises(ValidationError):
+        TaskDependency.objects.filter(parent_task=b).update(child_task=a)
+    assert sorted(TaskDependency.objects.values_list("parent_task_id", "child_task_id")) == [(a.id, b.id), (b.id, c.id)]
+
+
+def test_blockers_and_dependents_endpoints(auth_client, employee_token, emp_owner, emp_assignee, valid_due_date,
+                                           django_assert_max_num_queries):
+    """
+    Транзитивное замыкание с глубиной, ромб a -> (b, c) -> d даёт d один раз.
+    """
+    a, b, c, d = _tasks(emp_owner, emp_assignee, valid_due_date, 4)
+    for parent, child in [(a, b), (a, c), (b, d), (c, d)]:
+        TaskDependency.objects.create(parent_task=parent, child_task=child)
+    client = auth_client(employee_token)
+
+    # пользователь + задача + рекурсивный запрос
+    with django_assert_max_num_queries(3):
+        resp = client.get(f"/api/tasks/{d.id}/blockers/")
+    assert resp.status_code == 200
+    assert [(item["id"], item["depth"]) for item in resp.json()] == [(b.id, 1), (c.id, 1), (a.id, 2)]
+
+    resp = client.get(f"/api/tasks/{a.id}/dependents/")
+    assert [(item["id"], item["depth"]) for item in resp.json()] == [(b.id, 1), (c.id, 1), (d.id, 2)]
+    assert resp.json()[0]["title"] == b.title
+
+    resp = client.get(f"/api/tasks/{a.id}/dependents/", {"max_depth": 1})
+    assert [item["id"] for item in resp.json()] == [b.id, c.id]
+
+    assert client.get(f"/api/tasks/{a.id}/dependents/", {"max_depth": "x"}).status_code == 400
+    assert client.get("/api/tasks/999999/blockers/").status_code == 404
@@ -0,0 +1,56 @@
+import pytest
+
+from tracker.models import Employee, Task
+
+pytestmark = pytest.mark.django_db  # - это "глобальная метка" для всего файла.
+
+TASKS_URL = "/api/tasks/"
+BUSY_URL = "/api/analytics/busy-employees/"
+
+
+def test_tasks_list_etag(auth_client, employee_token, task_base, emp_assignee, django_assert_max_num_queries):
+    """
+    Повторный запрос с If-None-Match -> 304 без тела; изменение задачи
+    или ФИО сотрудника (оно есть в ответе) меняет ETag.
+    """
+    client = auth_client(employee_token)
+
+    first = client.get(TASKS_URL)
+    etag = first["ETag"]
+    assert first.status_code == 200 and etag.startswith('"')
+
+    # те же запросы, что и для обычного ответа (пользователь + страница)
+    with django_assert_max_num_queries(2):
+        resp = client.get(TASKS_URL, HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 304
+    assert resp.content == b""
+
+    Employee.objects.filter(pk=emp_assignee.pk).update(full_name="Renamed Assignee")
+    resp = client.get(TASKS_URL, HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 200
+    assert resp["ETag"] != etag
+
+    etag = resp["ETag"]
+    Task.objects.filter(pk=task_base.pk).update(title="Changed")
+    assert client.get(TASKS_URL, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+def test_task_retrieve_etag(auth_client, employee_token, task_base):
+    client = auth_client(employee_token)
+    url = f"{TASKS_URL}{task_base.id}/"
+
+    etag = client.get(url)["ETag"]
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    task_base.status = Task.Status.IN_PROGRESS
+    task_base.save()
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+def test_analytics_etag(auth_client, manager_token):
+    client = auth_client(manager_token)
+
+    etag = client.get(BUSY_URL)["ETag"]
+    resp = client.get(BUSY_URL, HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == 304
+    assert resp["X-Cache"] == "HIT"
@@ -0,0 +1,61 @@
+import csv
+import io
+import json
+
+import pytest
+
+from tracker.models import Task
+
+pytestmark = pytest.mark.django_db  # - это "глобальная метка" для всего файла.
+
+EXPORT_URL = "/api/tasks/export/"
+
+
+def _content(resp) -> str:
+    """Собираем тело потокового ответа."""
+    assert resp.streaming
+    return b"".join(resp.streaming_content).decode("utf-8")
+
+
+def test_export_ndjson_matches_task_list(auth_client, employee_token, task_base):
+    """
+    NDJSON: одна строка на задачу, поля совпадают с обычным API задач.
+    """
+    client = auth_client(employee_token)
+
+    resp = client.get(EXPORT_URL, {"format": "ndjson"})
+    assert resp.status_code == 200
+    assert resp["Content-Type"].startswith("application/x-ndjson")
+
+    lines = _content(resp).splitlines()
+    assert len(lines) == 1
+
+    detail = client.get(f"/api/tasks/{task_base.id}/").json()
+    assert json.loads(lines[0]) == detail
+
+
+def test_export_csv_honours_filters(auth_client, employee_token, task_base, emp_owner, emp_assignee):
+    """
+    CSV: заголовок + строки, фильтры списка задач (?status=) применяются.
+    """
+    Task.objects.create(
+        title="In progress", status=Task.Status.IN_PROGRESS,
+        owner=emp_owner, assignee=emp_assignee, due_date=task_base.due_date,
+    )
+    client = auth_client(employee_token)
+
+    resp = client.get(EXPORT_URL, {"format": "csv", "status": "IN_PROGRESS"})
+    assert resp.status_code == 200
+
+    rows = list(csv.DictReader(io.StringIO(_content(resp))))
+    assert [row["title"] for row in rows] == ["In progress"]
+    assert rows[0]["assignee_full_name"] == emp_assignee.full_name
+
+
+def test_export_unknown_format_404(auth_client, employee_token):
+    """
+    Неизвестный формат -> 404 (DRF не нашёл рендерер).
+    """
+    client = auth_client(employee_token)
+    resp = client.get(EXPORT_URL, {"format": "xml"})
+    assert resp.status_code == 404
@@ -0,0 +1,125 @@
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.db import connection
+from django.test import AsyncClient
+from prometheus_client import REGISTRY
+
+from tracker import metrics, sqlhooks
+
+pytestmark = pytest.mark.django_db  # - это "глобальная метка" для всего файла.
+
+METRICS_URL = "/api/metrics/"
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_request_metrics(auth_client, employee_token, task_base):
+    """Запрос к задачам попадает в гистограммы длительности, SQL и размера ответа."""
+    labels = {"method": "GET", "view": "tasks-list"}
+    before = _sample("tracker_http_request_duration_seconds_count", **labels)
+    queries_before = _sample("tracker_db_queries_per_request_sum", **labels)
+
+    resp = auth_client(employee_token).get("/api/tasks/")
+    assert resp.status_code == 200
+
+    assert _sample("tracker_http_request_duration_seconds_count", **labels) == before + 1
+    assert _sample("tracker_db_queries_per_request_sum", **labels) >= queries_before + 1
+    assert _sample("tracker_http_response_size_bytes_sum", **labels) >= len(resp.content)
+    assert _sample("tracker_http_requests_total", status="200", **labels) >= 1
+
+
+def test_exception_metrics(auth_client, employee_token):
+    labels = {"view": "analytics-busy-employees", "exception": "PermissionDenied"}
+    before = _sample("tracker_exceptions_total", **labels)
+
+    assert auth_client(employee_token).get("/api/analytics/busy-employees/").status_code == 403
+    assert _sample("tracker_exceptions_total", **labels) == before + 1
+
+
+def test_queries_counted_in_other_threads():
+    """SQL из потока sync_to_async(thread_sensitive=False) со своим соединением тоже попадает в замер."""
+    def query():
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+        finally:
+            connection.close()
+
+    timer = metrics.QueryTimer()
+    with sqlhooks.observe_queries(timer):
+        async_to_sync(sync_to_async(query, thread_sensitive=False))()
+    assert timer.count == 1
+
+
+def test_async_request_metrics(manager_token, task_base):
+    """Под ASGI (async-цепочка middleware) метрики и SQL async-представления тоже считаются."""
+    labels = {"method": "GET", "view": "async-busy-employees"}
+    before = _sample("tracker_http_request_duration_seconds_count", **labels)
+    queries_before = _sample("tracker_db_queries_per_request_sum", **labels)
+
+    resp = async_to_sync(AsyncClient().get)(
+        "/api/async/analytics/busy-employees/", AUTHORIZATION=f"Bearer {manager_token}"
+    )
+    assert resp.status_code == 200
+
+    assert _sample("tracker_http_request_duration_seconds_count", **labels) == before + 1
+    assert _sample("tracker_db_queries_per_request_sum", **labels) >= queries_before + 1
+
+
+def test_metrics_endpoint(api_client, settings):
+    api_client.get("/api/health/")
+
+    settings.METRICS_TOKEN = ""
+    assert api_client.get(METRICS_URL).status_code == 403  # без токена закрыт
+
+    settings.METRICS_TOKEN = "scrape-secret"
+    assert api_client.get(METRICS_URL).status_code == 401
+    resp = api_client.get(METRICS_URL, HTTP_AUTHORIZATION="Bearer scrape-secret")
+    assert resp.status_code == 200
+    assert resp["Content-Type"].startswith("text/plain")
+    assert b'tracker_http_request_duration_seconds_count{method="GET",view="health"}' in resp.content
+
+    settings.METRICS_TOKEN = ""
+    settings.METRICS_PUBLIC = True
+    assert api_client.get(METRICS_URL).status_code == 200
+
+
+def _server_timing(header):
+    """'auth;dur=1.2, db;dur=0.5;desc="2 queries"' -> {"auth": 1.2, "db": 0.5}"""
+    entries = {}
+    for entry in header.split(", "):
+        name, duration = entry.split(";")[:2]
+        entries[name] = float(duration.removeprefix("dur="))
+    return entries
+
+
+def test_server_timing_header(auth_client, manager_token, task_base, settings):
+    """При SERVER_TIMING_SAMPLE_RATE=1 каждый ответ DRF содержит разбивку по этапам."""
+    settings.SERVER_TIMING_SAMPLE_RATE = 1
+    resp = auth_client(manager_token).get("/api/tasks/")
+    assert resp.status_code == 200
+
+    header = resp["Server-Timing"]
+    entries = _server_timing(header)
+    assert {"auth", "perm", "db", "serialize", "render", "other", "total"} <= entries.keys()
+    assert 'desc="' in header
+    # этапы не пересекаются: их сумма - это total (с точностью округления)
+    parts = sum(value for name, value in entries.items() if name != "total")
+    assert parts == pytest.approx(entries["total"], abs=0.1 * len(entries))
+
+
+def test_server_timing_disabled_by_default(auth_client, manager_token):
+    assert "Server-Timing" not in auth_client(manager_token).get("/api/tasks/")
+
+
+def test_server_timing_async(manager_token, task_base, settings):
+    """Под ASGI заголовок тоже есть, SQL async-представления (в потоках) попадает в db."""
+    settings.SERVER_TIMING_SAMPLE_RATE = 1
+    resp = async_to_sync(AsyncClient().get)(
+        "/api/async/analytics/busy-employees/", AUTHORIZATION=f"Bearer {manager_token}"
+    )
+    assert resp.status_code == 200
+    entries = _server_timing(resp["Server-Timing"])
+    assert entries["db"] > 0 and entries["total"] > 0
@@ -0,0 +1,98 @@
+import pytest
+from datetime import date, timedelta
+
+from django.utils import timezone
+
+from tracker.models import Employee, Task
+
+pytestmark = pytest.mark.django_db  # - это "глобальная метка" для всего файла.
+
+TASKS_URL = "/api/tasks/"
+EMPLOYEES_URL = "/api/employees/"
+
+
+@pytest.fixture()
+def many_tasks(emp_owner, emp_assignee):
+    """
+    7 задач с повторяющимися created_at/due_date/status,
+    чтобы проверить, что ключ (поле, id) корректно разрешает "ничьи".
+    """
+    statuses = [Task.Status.NEW, Task.Status.IN_PROGRESS]
+    for i in range(7):
+        Task.objects.create(
+            title=f"task {i}",
+            status=statuses[i % 2],
+            owner=emp_owner,
+            assignee=emp_assignee,
+            due_date=date.today() + timedelta(days=1 + i % 3),
+        )
+    # Одинаковое время создания у всех задач
+    Task.objects.update(created_at=timezone.now())
+    return list(Task.objects.all())
+
+
+def _walk(client, url) -> list[int]:
+    """Проходим все страницы по ссылкам next и собираем id."""
+    ids = []
+    while url:
+        resp = client.get(url)
+        assert resp.status_code == 200
+        body = resp.json()
+        ids.extend(item["id"] for item in body["results"])
+        url = body["next"]
+    return ids
+
+
+@pytest.mark.parametrize("ordering, key", [
+    ("-created_at", lambda t: (-t.created_at.timestamp(), -t.id)),
+    ("due_date", lambda t: (t.due_date, t.id)),
+    ("-status", lambda t: (t.status, t.id)),
+])
+def test_tasks_cursor_walks_every_row_once(auth_client, employee_token, many_tasks, ordering, key):
+    """
+    Обход страниц по курсору отдаёт каждую задачу ровно один раз и в порядке (поле, id).
+    """
+    client = auth_client(employee_token)
+    ids = _walk(client, f"{TASKS_URL}?ordering={ordering}&page_size=3")
+
+    expected = sorted(many_tasks, key=key, reverse=ordering == "-status")
+    assert ids == [t.id for t in expected]
+
+
+def test_tasks_cursor_previous_link(auth_client, employee_token, many_tasks):
+    """
+    Ссылка previous со второй страницы возвращает первую страницу.
+    """
+    client = auth_client(employee_token)
+
+    first = client.get(f"{TASKS_URL}?page_size=3").json()
+    assert first["previous"] is None
+
+    second = client.get(first["next"]).json()
+    back = client.get(second["previous"]).json()
+
+    assert [t["id"] for t in back["results"]] == [t["id"] for t in first["results"]]
+
+
+def test_invalid_cursor_404(auth_client, employee_token):
+    """
+    Испорченный курсор -> 404 в едином формате ошибок.
+    """
+    client = auth_client(employee_token)
+    resp = client.get(f"{TASKS_URL}?cursor=garbage")
+
+    assert resp.status_code == 404
+    assert resp.json()["status"] == "error"
+
+
+def test_employees_paginated(auth_client, admin_token):
+    """
+    Сотрудники тоже отдаются страницами.
+    """
+    for i in range(3):
+        Employee.objects.create(full_name=f"Person {i:02}", position="Dev", email=f"p{i}@example.com")
+
+    client = auth_client(admin_token)
+    ids = _walk(client, f"{EMPLOYEES_URL}?ordering=full_name&page_size=2")
+
+    assert ids == list(Employee.objects.order_by("full_name", "id").values_list("id", flat=True))
@@ -1,6 +1,11 @@
 import pytest
 from datetime import date, timedelta
 
+from django.db import transaction
+
+from tracker.api import roles
+from tracker.api.roles import get_user_roles
+
 pytestmark = pytest.mark.django_db  # - это "глобальная метка" для всего файла.
 
 # URL эндпоинтов, которые тестируем (чтобы не дублировать строки по всему файлу)
@@ -118,3 +123,52 @@ def test_admin_can_create_employee_201(auth_client, admin_token):
     }
     resp = client.post(EMPLOYEES_URL, payload, format="json")
     assert resp.status_code == 201
+
+
+def test_roles_cached_between_requests(auth_client, admin_token, admin_user, groups, django_assert_num_queries,
+                                       django_capture_on_commit_callbacks):
+    """
+    Роли берутся из кэша процесса: второй запрос без запроса к группам.
+    Изменение групп пользователя сбрасывает кэш после коммита.
+    """
+    client = auth_client(admin_token)
+    assert client.get(EMPLOYEES_URL).status_code == 200
+
+    # пользователь (JWTAuthentication) + сотрудники
+    with django_assert_num_queries(2):
+        assert client.get(EMPLOYEES_URL).status_code == 200
+
+    with django_capture_on_commit_callbacks(execute=True):
+        with transaction.atomic():
+            admin_user.groups.remove(groups["Admin"])
+            assert get_user_roles(admin_user) == {"Admin"}  # до коммита кэш не сбрасывается
+    assert client.get(EMPLOYEES_URL).status_code == 403
+
+
+def test_role_cache_prunes_expired(admin_user, employee_user, monkeypatch):
+    """Истёкшие записи удаляются при записи новых: кэш не растёт от пользователей, которые больше не приходят."""
+    monkeypatch.setattr(roles, "_next_prune", 0.0)
+    roles._role_cache[admin_user.pk] = (0.0, frozenset({"Admin"}))  # истёкшая запись
+
+    get_user_roles(employee_user)
+    assert set(roles._role_cache) == {employee_user.pk}
+
+
+def test_roles_claim_in_token(api_client, manager_user, settings, django_assert_num_queries):
+    """
+    Токен из /api/auth/token/ содержит claim roles; при ROLE_CLAIM_TRUSTED
+    права проверяются по claim без запроса к группам.
+    """
+    resp = api_client.post("/api/auth/token/", {"username": "manager", "password": "pass12345"}, format="json")
+    assert resp.status_code == 200
+    access = resp.json()["access"]
+
+    settings.ROLE_CLAIM_TRUSTED = True
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+    api_client.get(BUSY_URL)  # прогрев кэша аналитики
+
+    # только пользователь (JWTAuthentication): ни групп, ни аналитики
+    with django_assert_num_queries(1):
+        resp = api_client.get(BUSY_URL)
+    assert resp.status_code == 200
+    assert resp["X-Cache"] == "HIT"
@@ -0,0 +1,74 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient, Client
+
+from tracker.profiler import list_profile_ids, load_profile
+
+pytestmark = pytest.mark.django_db  # - это "глобальная метка" для всего файла.
+
+TASKS_URL = "/api/tasks/"
+
+
+@pytest.fixture()
+def profile_dir(settings, tmp_path):
+    settings.PROFILER_ENABLED = True
+    settings.PROFILER_DIR = tmp_path / "profiles"
+    return settings.PROFILER_DIR
+
+
+def test_admin_request_profile(auth_client, admin_token, task_base, profile_dir):
+    """Admin с X-Profile: 1 получает X-Profile-Id; в профиле SQL, EXPLAIN и cProfile."""
+    resp = auth_client(admin_token).get(TASKS_URL, HTTP_X_PROFILE="1")
+    assert resp.status_code == 200
+
+    profile = load_profile(resp["X-Profile-Id"])
+    assert profile["path"] == TASKS_URL and profile["status"] == 200
+    assert profile["sql_count"] == len(profile["queries"]) >= 1
+    assert profile["explains"] and profile["explains"][0]["plan"]
+    assert "cumulative" in profile["profile"]
+
+
+def test_async_request_profile(admin_token, task_base, profile_dir):
+    """Под ASGI профиль тоже пишется, SQL async-представления (в потоках) в нём есть."""
+    resp = async_to_sync(AsyncClient().get)(
+        "/api/async/analytics/busy-employees/", AUTHORIZATION=f"Bearer {admin_token}", X_PROFILE="1"
+    )
+    assert resp.status_code == 200
+
+    profile = load_profile(resp["X-Profile-Id"])
+    assert profile["sql_count"] == len(profile["queries"]) >= 1
+
+
+def test_profile_only_for_admin(auth_client, manager_token, profile_dir):
+    resp = auth_client(manager_token).get(f"{TASKS_URL}?_profile=1")
+    assert resp.status_code == 200
+    assert "X-Profile-Id" not in resp
+    assert list_profile_ids() == []
+
+
+def test_profile_ring_buffer_and_admin_pages(auth_client, admin_token, admin_user, profile_dir, settings):
+    settings.PROFILER_MAX_ENTRIES = 2
+    client = auth_client(admin_token)
+    ids = [client.get(TASKS_URL, HTTP_X_PROFILE="1")["X-Profile-Id"] for _ in range(3)]
+
+    # хранятся только последние профили
+    assert list_profile_ids() == ids[:0:-1]
+
+    admin_user.is_staff = admin_user.is_superuser = True
+    admin_user.save()
+    browser = Client()
+    browser.force_login(admin_user)
+
+    resp = browser.get("/admin/profiles/")
+    assert resp.status_code == 200
+    assert ids[-1].encode() in resp.content
+
+    assert browser.get(f"/admin/profiles/{ids[-1]}/").status_code == 200
+    assert browser.get(f"/admin/profiles/{ids[0]}/").status_code == 404
+
+
+def test_profiler_disabled(auth_client, admin_token, settings, tmp_path):
+    settings.PROFILER_ENABLED = False
+    settings.PROFILER_DIR = tmp_path / "profiles"
+    assert "X-Profile-Id" not in auth_client(admin_token).get(TASKS_URL, HTTP_X_PROFILE="1")
+    assert list_profile_ids() == []
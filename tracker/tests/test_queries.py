@@ -0,0 +1,142 @@
+import pytest
+from datetime import date, timedelta
+
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+
+from tracker.api.querysets import TASK_VALUES_SOURCES
+from tracker.api.rows import get_row_renderer
+from tracker.api.serializers import EmployeeSerializer, TaskSerializer
+from tracker.models import Employee, Task
+
+pytestmark = pytest.mark.django_db  # - это "глобальная метка" для всего файла.
+
+TASKS_URL = "/api/tasks/"
+
+# Бюджет SQL-запросов на эндпоинт (включая запрос пользователя в JWTAuthentication).
+# Число запросов не должно зависеть от количества задач в ответе.
+TASK_QUERY_BUDGET = {
+    "list": 2,
+    "retrieve": 2,
+}
+
+
+def _make_tasks(count: int) -> list[Task]:
+    """
+    Создаём count задач, у каждой свой owner и assignee
+    (чтобы N+1 по сотрудникам точно был виден).
+    """
+    tasks = []
+    for i in range(count):
+        owner = Employee.objects.create(full_name=f"Owner {i:03}", position="Lead", email=f"o{i}@example.com")
+        assignee = Employee.objects.create(full_name=f"Worker {i:03}", position="Dev", email=f"w{i}@example.com")
+        tasks.append(Task.objects.create(
+            title=f"task {i}", status=Task.Status.NEW,
+            owner=owner, assignee=assignee, due_date=date.today() + timedelta(days=1),
+        ))
+    return tasks
+
+
+@pytest.mark.parametrize("count", [1, 15])
+def test_tasks_list_query_budget(auth_client, employee_token, django_assert_max_num_queries, count):
+    """
+    Список задач укладывается в бюджет запросов независимо от количества строк.
+    """
+    _make_tasks(count)
+    client = auth_client(employee_token)
+
+    with django_assert_max_num_queries(TASK_QUERY_BUDGET["list"]):
+        resp = client.get(TASKS_URL)
+
+    assert resp.status_code == 200
+    assert resp.json()["results"][0]["assignee_full_name"].startswith("Worker")
+
+
+def test_task_retrieve_query_budget(auth_client, employee_token, django_assert_max_num_queries):
+    """
+    Детальная задача: один запрос с JOIN на owner/assignee.
+    """
+    task = _make_tasks(1)[0]
+    client = auth_client(employee_token)
+
+    with django_assert_max_num_queries(TASK_QUERY_BUDGET["retrieve"]):
+        resp = client.get(f"{TASKS_URL}{task.id}/")
+
+    assert resp.status_code == 200
+    assert resp.json()["owner_full_name"] == "Owner 000"
+
+
+def test_list_rows_match_serializer(auth_client, admin_token, task_base, emp_owner, valid_due_date):
+    """Списки собираются из values() без сериализатора, JSON совпадает с ним байт в байт."""
+    unassigned = Task.objects.create(title="Без исполнителя", owner=emp_owner, due_date=valid_due_date)
+    Task.objects.filter(pk=unassigned.pk).update(status=Task.Status.DONE, report_file="task_reports/отчёт 1.pdf")
+    Employee.objects.create(full_name="Без почты", position="Dev", is_active=False)
+    client = auth_client(admin_token)
+
+    for url, model, serializer_class in (
+        (TASKS_URL, Task, TaskSerializer),
+        ("/api/employees/", Employee, EmployeeSerializer),
+    ):
+        resp = client.get(url)
+        ids = [row["id"] for row in resp.data["results"]]
+        objects = sorted(model.objects.filter(id__in=ids), key=lambda obj: ids.index(obj.id))
+        expected = serializer_class(objects, many=True, context={"request": resp.wsgi_request}).data
+
+        assert len(ids) > 1
+        assert JSONRenderer().render(resp.data["results"]) == JSONRenderer().render(expected)
+
+
+def test_row_renderer_cached_per_fields():
+    """Рендерер компилируется один раз на набор полей, request (абсолютный URL файла) - при каждом render."""
+    fields = ("id", "report_file")
+    renderer = get_row_renderer(TaskSerializer, fields, TASK_VALUES_SOURCES)
+    assert get_row_renderer(TaskSerializer, list(fields), dict(TASK_VALUES_SOURCES)) is renderer
+    assert get_row_renderer(TaskSerializer, ("id",), TASK_VALUES_SOURCES) is not renderer
+
+    row = {"id": 1, "report_file": "task_reports/r.pdf"}
+    http, https = RequestFactory().get("/"), RequestFactory().get("/", secure=True)
+    assert renderer.render([row], http)[0]["report_file"].startswith("http://testserver/")
+    assert renderer.render([row], https)[0]["report_file"].startswith("https://testserver/")
+
+
+def _task_selects(queries) -> list[str]:
+    return [query["sql"] for query in queries if 'FROM "tasks"' in query["sql"]]
+
+
+@pytest.mark.parametrize("url", [TASKS_URL, "{task}"])
+def test_sparse_fields_pushed_down_to_sql(auth_client, employee_token, task_base, url):
+    """?fields= - в ответе и в SELECT только запрошенные поля, без JOIN на сотрудников."""
+    url = url.format(task=f"{TASKS_URL}{task_base.id}/")
+    client = auth_client(employee_token)
+
+    with CaptureQueriesContext(connection) as queries:
+        resp = client.get(url, {"fields": "status,id,title,due_date"})
+    assert resp.status_code == 200
+    data = resp.data["results"][0] if "results" in resp.data else resp.data
+    assert list(data) == ["id", "title", "status", "due_date"]
+
+    [select] = _task_selects(queries.captured_queries)
+    assert "JOIN" not in select
+    assert '"description"' not in select and '"review_comment"' not in select
+
+    # ФИО исполнителя - JOIN только на него
+    with CaptureQueriesContext(connection) as queries:
+        resp = client.get(url, {"fields": "id,assignee_full_name"})
+    data = resp.data["results"][0] if "results" in resp.data else resp.data
+    assert data == {"id": task_base.id, "assignee_full_name": "Assignee One"}
+    [select] = _task_selects(queries.captured_queries)
+    assert select.count("JOIN") == 1
+
+
+def test_sparse_fields_validation_and_employees(auth_client, admin_token, emp_owner):
+    client = auth_client(admin_token)
+
+    resp = client.get(TASKS_URL, {"fields": "id,secret"})
+    assert resp.status_code == 400
+    assert "fields" in resp.json()["errors"]
+
+    resp = client.get("/api/employees/", {"fields": "full_name,id"})
+    assert resp.data["results"][0] == {"id": emp_owner.id, "full_name": emp_owner.full_name}
+    assert client.get(f"/api/employees/{emp_owner.id}/", {"fields": "email"}).data == {"email": emp_owner.email}
@@ -0,0 +1,256 @@
+import hashlib
+import os
+from datetime import timedelta
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+
+from tracker.models import ReportUpload, Task
+
+pytestmark = pytest.mark.django_db  # - это "глобальная метка" для всего файла.
+
+REPORT = b"%PDF-1.4 quarterly report\n" * 100
+
+
+@pytest.fixture()
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path / "media"
+    return settings.MEDIA_ROOT
+
+
+@pytest.fixture()
+def upload_dir(settings, tmp_path):
+    settings.REPORT_UPLOAD_DIR = tmp_path / "uploads"
+    return settings.REPORT_UPLOAD_DIR
+
+
+def _attach(client, task, content, name="report.pdf"):
+    return client.patch(
+        f"/api/tasks/{task.id}/",
+        {"status": Task.Status.DONE, "report_file": SimpleUploadedFile(name, content)},
+        format="multipart",
+    )
+
+
+def _stored_files(media_root):
+    return sorted(path.name for path in media_root.rglob("*") if path.is_file())
+
+
+def test_identical_reports_stored_once(
+    auth_client, manager_token, task_base, emp_owner, emp_assignee, valid_due_date,
+    media_root, django_capture_on_commit_callbacks,
+):
+    """Один и тот же отчёт у двух задач - один файл; удаляется, когда на него не осталось задач."""
+    other = Task.objects.create(title="other", owner=emp_owner, assignee=emp_assignee, due_date=valid_due_date)
+    client = auth_client(manager_token)
+    sha256 = hashlib.sha256(REPORT).hexdigest()
+
+    first = _attach(client, task_base, REPORT).json()
+    second = _attach(client, other, REPORT, name="copy.PDF").json()
+
+    assert first["report_sha256"] == second["report_sha256"] == sha256
+    assert first["report_size"] == len(REPORT)
+    assert first["report_file"] == second["report_file"]
+    assert _stored_files(media_root) == [f"{sha256}.pdf"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Task.objects.get(pk=task_base.pk).delete()
+    assert _stored_files(media_root) == [f"{sha256}.pdf"]  # на файл ещё ссылается вторая задача
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Task.objects.filter(pk=other.pk).delete()
+    assert _stored_files(media_root) == []
+
+
+def test_replaced_report_is_released(auth_client, manager_token, task_base, media_root, django_capture_on_commit_callbacks):
+    client = auth_client(manager_token)
+    _attach(client, task_base, REPORT)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        data = _attach(client, task_base, b"new report").json()
+
+    sha256 = hashlib.sha256(b"new report").hexdigest()
+    assert data["report_sha256"] == sha256
+    assert _stored_files(media_root) == [f"{sha256}.pdf"]
+
+    # отчёт прикреплён из кода (не через загрузку) - хеш считается при сохранении
+    task = Task.objects.get(pk=task_base.pk)
+    task.report_file = SimpleUploadedFile("again.pdf", REPORT)
+    with django_capture_on_commit_callbacks(execute=True):
+        task.save()
+    task.refresh_from_db()
+    assert task.report_sha256 == hashlib.sha256(REPORT).hexdigest()
+    assert task.report_size == len(REPORT)
+    assert _stored_files(media_root) == [f"{task.report_sha256}.pdf"]
+
+
+def test_rolled_back_report_collected(task_base, media_root):
+    """Файл из откаченной транзакции не остаётся навсегда: его удаляет cleanup_report_files."""
+    task_base.status = Task.Status.DONE
+    task_base.report_file = SimpleUploadedFile("kept.pdf", REPORT)
+    task_base.save()
+
+    task = Task.objects.get(pk=task_base.pk)
+    task.report_file = SimpleUploadedFile("lost.pdf", b"rolled back")
+    with pytest.raises(RuntimeError), transaction.atomic():
+        task.save()
+        raise RuntimeError
+    lost = f"{hashlib.sha256(b'rolled back').hexdigest()}.pdf"
+    assert lost in _stored_files(media_root)
+
+    call_command("cleanup_report_files", stdout=open(os.devnull, "w"))
+    assert lost in _stored_files(media_root)  # моложе --min-age-hours
+
+    call_command("cleanup_report_files", "--min-age-hours=0", stdout=open(os.devnull, "w"))
+    assert _stored_files(media_root) == [f"{hashlib.sha256(REPORT).hexdigest()}.pdf"]
+
+
+def _report_url(task):
+    return f"/api/tasks/{task.id}/report/"
+
+
+def test_report_download(auth_client, manager_token, task_base, media_root):
+    """Без прокси отчёт отдаёт Django: целиком и по диапазону (докачка)."""
+    client = auth_client(manager_token)
+    _attach(client, task_base, REPORT)
+    url = _report_url(task_base)
+    etag = f'"{hashlib.sha256(REPORT).hexdigest()}"'
+
+    resp = client.get(url)
+    assert resp.status_code == 200
+    assert b"".join(resp.streaming_content) == REPORT
+    assert resp["Accept-Ranges"] == "bytes"
+    assert resp["ETag"] == etag
+    assert resp["Content-Disposition"] == f'attachment; filename="task-{task_base.id}-report.pdf"'
+
+    resp = client.get(url, HTTP_RANGE="bytes=10-19", HTTP_IF_RANGE=etag)
+    assert resp.status_code == 206
+    assert b"".join(resp.streaming_content) == REPORT[10:20]
+    assert resp["Content-Range"] == f"bytes 10-19/{len(REPORT)}"
+
+    resp = client.get(url, HTTP_RANGE="bytes=-5")
+    assert b"".join(resp.streaming_content) == REPORT[-5:]
+
+    # файл изменился (If-Range не совпал) - отдаётся целиком
+    assert client.get(url, HTTP_RANGE="bytes=10-19", HTTP_IF_RANGE='"old"').status_code == 200
+
+    resp = client.get(url, HTTP_RANGE=f"bytes={len(REPORT)}-")
+    assert resp.status_code == 416
+    assert resp["Content-Range"] == f"bytes */{len(REPORT)}"
+
+
+@pytest.mark.parametrize(
+    ("backend", "header"),
+    [("nginx", "X-Accel-Redirect"), ("sendfile", "X-Sendfile")],
+)
+def test_report_download_via_proxy(auth_client, manager_token, task_base, media_root, settings, backend, header):
+    """С прокси Django только проверяет права и отдаёт заголовок, тело пустое."""
+    settings.REPORT_DOWNLOAD_BACKEND = backend
+    client = auth_client(manager_token)
+    name = _attach(client, task_base, REPORT).json()["report_file"].split("/media/", 1)[-1]
+
+    resp = client.get(_report_url(task_base))
+    assert resp.status_code == 200
+    assert resp.content == b""
+    if backend == "nginx":
+        assert resp[header] == f"/protected-media/{name}"
+    else:
+        assert resp[header] == str(media_root / name)
+
+
+def test_report_download_errors(client, auth_client, manager_token, task_base, media_root):
+    assert client.get(_report_url(task_base)).status_code == 401
+    assert auth_client(manager_token).get(_report_url(task_base)).status_code == 404
+
+
+UPLOADS_URL = "/api/report-uploads/"
+
+
+def _start_upload(client, task, content=REPORT, **extra):
+    resp = client.post(UPLOADS_URL, {"task": task.id, "filename": "big report.pdf", "size": len(content), **extra})
+    assert resp.status_code == 201
+    return resp.json()["id"]
+
+
+def _put_chunk(client, upload_id, content, start, size=len(REPORT)):
+    return client.put(
+        f"{UPLOADS_URL}{upload_id}/",
+        content,
+        content_type="application/octet-stream",
+        HTTP_CONTENT_RANGE=f"bytes {start}-{start + len(content) - 1}/{size}",
+    )
+
+
+def test_resumable_upload(auth_client, manager_token, admin_token, task_base, media_root, upload_dir,
+                          django_capture_on_commit_callbacks):
+    """Сессия -> части по смещению -> завершение: файл переносится в хранилище отчётов."""
+    client = auth_client(manager_token)
+    upload_id = _start_upload(client, task_base, sha256=hashlib.sha256(REPORT).hexdigest())  # статус NEW - не проверяется
+    url = f"{UPLOADS_URL}{upload_id}/"
+
+    assert _put_chunk(client, upload_id, REPORT[:1000], 0).json()["offset"] == 1000
+    # повтор уже принятой части - 409, offset можно узнать через GET
+    assert _put_chunk(client, upload_id, REPORT[:1000], 0).status_code == 409
+    assert client.get(url).json()["offset"] == 1000
+    # чужая сессия не видна
+    assert auth_client(admin_token).get(url).status_code == 404
+
+    resp = client.post(f"{url}finalize/", {})
+    assert resp.status_code == 400
+    assert "offset" in resp.json()["errors"]
+
+    _put_chunk(client, upload_id, REPORT[1000:], 1000)
+
+    # правила Task.clean - при завершении: отчёт у задачи NEW нельзя
+    resp = client.post(f"{url}finalize/", {})
+    assert resp.status_code == 400
+    assert "report_file" in resp.json()["errors"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        resp = client.post(f"{url}finalize/", {"status": Task.Status.REVIEW})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["status"] == Task.Status.REVIEW
+    assert data["report_sha256"] == hashlib.sha256(REPORT).hexdigest()
+    assert data["report_size"] == len(REPORT)
+
+    assert _stored_files(media_root) == [f"{data['report_sha256']}.pdf"]
+    assert os.listdir(upload_dir) == []
+    assert client.get(url).status_code == 404
+
+
+def test_upload_hash_mismatch_discards_session(
+    auth_client, manager_token, task_base, media_root, upload_dir, django_capture_on_commit_callbacks,
+):
+    client = auth_client(manager_token)
+    upload_id = _start_upload(client, task_base, content=b"report", sha256="0" * 64)
+    _put_chunk(client, upload_id, b"report", 0, size=6)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        resp = client.post(f"{UPLOADS_URL}{upload_id}/finalize/", {"status": Task.Status.REVIEW})
+    assert resp.status_code == 400
+    assert "sha256" in resp.json()["errors"]
+    assert not ReportUpload.objects.exists()
+    assert os.listdir(upload_dir) == []
+
+
+def test_cleanup_report_uploads(auth_client, manager_token, task_base, upload_dir, settings):
+    client = auth_client(manager_token)
+    abandoned = _start_upload(client, task_base)
+    active = _start_upload(client, task_base)
+    expired_at = timezone.now() - timedelta(hours=settings.REPORT_UPLOAD_EXPIRE_HOURS + 1)
+    ReportUpload.objects.filter(pk=abandoned).update(updated_at=expired_at)
+
+    # файл сессии, удалённой вместе с задачей
+    orphan = upload_dir / f"{'f' * 32}.part"
+    orphan.write_bytes(b"partial")
+    os.utime(orphan, (expired_at.timestamp(), expired_at.timestamp()))
+
+    call_command("cleanup_report_uploads", stdout=open(os.devnull, "w"))
+
+    active = active.replace("-", "")
+    assert [upload.pk.hex for upload in ReportUpload.objects.all()] == [active]
+    assert os.listdir(upload_dir) == [f"{active}.part"]
@@ -0,0 +1,68 @@
+import pytest
+from django.db import connection
+from django.db.models import FloatField, Value
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from tracker.api.filters import RankedOrderingFilter
+from tracker.api.views import TaskViewSet
+from tracker.models import Employee, Task
+
+pytestmark = pytest.mark.django_db  # - это "глобальная метка" для всего файла.
+
+TASKS_URL = "/api/tasks/"
+
+
+def _task(owner, assignee, due_date, title, description="") -> Task:
+    return Task.objects.create(title=title, description=description, owner=owner, assignee=assignee, due_date=due_date)
+
+
+def test_tasks_q_search(auth_client, employee_token, emp_owner, emp_assignee, valid_due_date):
+    """
+    ?q= находит задачи по заголовку и описанию (PostgreSQL - tsvector, иначе ILIKE).
+    """
+    by_title = _task(emp_owner, emp_assignee, valid_due_date, "Подготовить отчёт", "квартал")
+    by_description = _task(emp_owner, emp_assignee, valid_due_date, "Созвон", "обсудить отчёт")
+    _task(emp_owner, emp_assignee, valid_due_date, "Deploy", "release")
+
+    client = auth_client(employee_token)
+    resp = client.get(TASKS_URL, {"q": "отчёт"})
+
+    assert resp.status_code == 200
+    ids = [item["id"] for item in resp.json()["results"]]
+    assert sorted(ids) == sorted([by_title.id, by_description.id])
+    if connection.vendor == "postgresql":
+        assert ids[0] == by_title.id  # заголовок весит больше описания
+
+
+def test_ranked_ordering_only_without_explicit_ordering():
+    """
+    Результаты поиска сортируются по рангу, пока клиент не задал ?ordering=.
+    """
+    factory = APIRequestFactory()
+    view = TaskViewSet()
+    ranked = Task.objects.annotate(search_rank=Value(1.0, output_field=FloatField()))
+
+    request = Request(factory.get(TASKS_URL))
+    assert RankedOrderingFilter().get_ordering(request, ranked, view) == ["-search_rank"]
+    assert RankedOrderingFilter().get_ordering(request, Task.objects.all(), view) == ["-created_at"]
+
+    request = Request(factory.get(TASKS_URL, {"ordering": "due_date"}))
+    assert RankedOrderingFilter().get_ordering(request, ranked, view) == ["due_date"]
+
+
+def test_employees_search(auth_client, admin_token):
+    """
+    ?search= по сотрудникам: отбор как у SearchFilter, на PostgreSQL - по похожести.
+    """
+    exact = Employee.objects.create(full_name="Ivan Petrov", position="Dev", email="ivan@example.com")
+    partial = Employee.objects.create(full_name="Ivanna Sidorova", position="QA", email="qa@example.com")
+    Employee.objects.create(full_name="Oleg Smirnov", position="Dev", email="oleg@example.com")
+
+    resp = auth_client(admin_token).get("/api/employees/", {"search": "ivan"})
+
+    assert resp.status_code == 200
+    ids = [item["id"] for item in resp.json()["results"]]
+    assert sorted(ids) == sorted([exact.id, partial.id])
+    if connection.vendor == "postgresql":
+        assert ids[0] == exact.id
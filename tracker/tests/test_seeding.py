@@ -0,0 +1,65 @@
+import json
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import F
+
+from tracker.management.seeding import SEED_EMAIL_DOMAIN, seed_dataset
+from tracker.models import Employee, Task, TaskDependency
+
+pytestmark = pytest.mark.django_db  # - это "глобальная метка" для всего файла.
+
+
+def _snapshot():
+    """Содержимое сгенерированных данных без id (id зависят от последовательностей БД)."""
+    tasks = list(Task.objects.order_by("id").values_list("title", "status", "owner__email", "assignee__email", "due_date"))
+    edges = sorted(TaskDependency.objects.values_list("parent_task__title", "child_task__title"))
+    return tasks, edges
+
+
+def test_seed_dataset_is_reproducible_dag():
+    """
+    Одинаковый seed -> одинаковые данные; зависимости без циклов,
+    счётчики нагрузки согласованы (их проверяет rebuild_active_load --check).
+    """
+    created = seed_dataset(employees=10, tasks=200, dependency_density=1.5, seed=7)
+    assert created["tasks"] == Task.objects.count() == 200
+    assert created["dependencies"] == TaskDependency.objects.count() > 0
+
+    call_command("rebuild_active_load", "--check")
+
+    # блокирующая задача всегда создана раньше зависимой -> циклов нет
+    assert not TaskDependency.objects.filter(parent_task_id__gte=F("child_task_id")).exists()
+
+    first = _snapshot()
+    call_command("seed_tracker", "--clear")
+    assert not Employee.objects.filter(email__endswith=f"@{SEED_EMAIL_DOMAIN}").exists()
+
+    seed_dataset(employees=10, tasks=200, dependency_density=1.5, seed=7)
+    assert _snapshot() == first
+
+
+def test_seed_tracker_command_refuses_duplicates():
+    call_command("seed_tracker", "--employees", "5", "--tasks", "20")
+    with pytest.raises(CommandError):
+        call_command("seed_tracker", "--employees", "5", "--tasks", "20")
+
+    call_command("seed_tracker", "--clear", "--employees", "5", "--tasks", "30")
+    assert Task.objects.count() == 30
+
+
+def test_benchmark_tracker_writes_json(tmp_path):
+    output = tmp_path / "bench.json"
+    call_command("benchmark_tracker", "--scales", "5x30", "--repeat", "1", "--output", str(output))
+
+    report = json.loads(output.read_text(encoding="utf-8"))
+    names = {row["name"] for row in report["results"]}
+    assert {"GET /api/tasks/", "GET /api/analytics/busy-employees/", "get_busy_employees"} <= names
+    assert all(row.get("status", 200) == 200 for row in report["results"])
+
+    # данные бенчмарка откатываются
+    assert not Task.objects.exists()
+
+    call_command("benchmark_tracker", "--scales", "5x30", "--repeat", "1",
+                 "--output", str(tmp_path / "next.json"), "--compare", str(output))
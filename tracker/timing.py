@@ -0,0 +1,134 @@
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+
+# SERVER-TIMING
+#
+# Разбивка времени запроса по этапам для заголовка Server-Timing:
+# auth (JWT, вместе с его SQL), perm (проверки прав, вместе с запросами групп),
+# db (остальные SQL-запросы: выборка данных, N+1 при сериализации), serialize, render,
+# other (код view, middleware и прочее). Время этапов не пересекается:
+# вложенный этап вычитается из внешнего, сумма этапов равна total.
+# Замер включается только для запросов из выборки (ServerTimingMiddleware),
+# в остальных span() - пустой контекст.
+# Под ASGI замер виден и в потоках sync_to_async (ContextVar переносится в поток), стек этапов
+# у каждого потока свой. SQL, выполненный параллельно в нескольких потоках, суммируется в db,
+# поэтому у таких запросов db может быть больше total (other тогда 0).
+
+_current: ContextVar[Optional["ServerTiming"]] = ContextVar("tracker_server_timing", default=None)
+
+# SQL внутри этих этапов остаётся в них (иначе - отдельный этап db)
+SQL_INCLUSIVE_SPANS = ("auth", "perm")
+
+_NOOP = nullcontext()
+
+
+class ServerTiming:
+    def __init__(self):
+        self.durations: Dict[str, float] = {}
+        self.queries = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def _stack(self) -> List[str]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def add(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    @contextmanager
+    def span(self, name: str):
+        if name in self._stack:  # повторный вход (вложенные сериализаторы) уже учтён внешним
+            yield
+            return
+        self._stack.append(name)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self._stack.pop()
+            self.add(name, elapsed)
+            if self._stack:
+                self.add(self._stack[-1], -elapsed)
+
+    def query_wrapper(self, execute, sql, params, many, context):
+        """execute_wrapper: SQL-запросы в этап db (кроме запросов auth/perm)."""
+        with self._lock:
+            self.queries += 1
+        if self._stack and self._stack[-1] in SQL_INCLUSIVE_SPANS:
+            return execute(sql, params, many, context)
+        with self.span("db"):
+            return execute(sql, params, many, context)
+
+    def header(self, total: float) -> str:
+        """Значение заголовка Server-Timing (миллисекунды)."""
+        other = total - sum(self.durations.values())
+        parts = []
+        for name, seconds in [*self.durations.items(), ("other", other), ("total", total)]:
+            entry = f"{name};dur={max(seconds, 0.0) * 1000:.1f}"
+            if name == "db":
+                entry += f';desc="{self.queries} queries"'
+            parts.append(entry)
+        return ", ".join(parts)
+
+
+def start() -> tuple:
+    """Включить замер для текущего запроса: (замер, токен для stop)."""
+    timing = ServerTiming()
+    return timing, _current.set(timing)
+
+
+def stop(token) -> None:
+    _current.reset(token)
+
+
+def current() -> Optional[ServerTiming]:
+    return _current.get()
+
+
+def span(name: str):
+    """Контекст замера этапа; вне выборки ничего не делает."""
+    timing = _current.get()
+    return timing.span(name) if timing is not None else _NOOP
+
+
+class ServerTimingViewMixin:
+    """Этапы DRF-представления: аутентификация, права и рендеринг ответа."""
+
+    def perform_authentication(self, request):
+        with span("auth"):
+            super().perform_authentication(request)
+
+    def check_permissions(self, request):
+        with span("perm"):
+            super().check_permissions(request)
+
+    def check_object_permissions(self, request, obj):
+        with span("perm"):
+            super().check_object_permissions(request, obj)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        timing = _current.get()
+        if timing is not None and hasattr(response, "add_post_render_callback"):
+            # Django рендерит ответ сразу после возврата из view
+            started = time.perf_counter()
+            response.add_post_render_callback(lambda _: timing.add("render", time.perf_counter() - started))
+        return response
+
+
+class ServerTimingSerializerMixin:
+    """Этап serialize (SQL внутри него уходит в db)."""
+
+    def to_representation(self, instance):
+        with span("serialize"):
+            return super().to_representation(instance)
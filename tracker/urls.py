@@ -1,9 +1,10 @@
 from django.urls import path, include
 
-from tracker.views import HealthCheckView
+from tracker.views import HealthCheckView, MetricsView
 
 
 urlpatterns = [
     path("health/", HealthCheckView.as_view(), name="health"),
+    path("metrics/", MetricsView.as_view(), name="metrics"),
     path("", include("tracker.api.urls")),  # подключаем все DRF-роуты
 ]
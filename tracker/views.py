@@ -1,7 +1,13 @@
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from drf_spectacular.utils import extend_schema
 
+from tracker.metrics import render_metrics
+
 
 @extend_schema(exclude=True)  # исключаем из OpenAPI
 class HealthCheckView(APIView):
@@ -13,3 +19,26 @@ class HealthCheckView(APIView):
     def get(self, request):
         _ = request  # чтобы не висело предупреждения (в след ветке продолжу)
         return Response({"status": "ok"})
+
+
+@extend_schema(exclude=True)
+class MetricsView(APIView):
+    """
+    Метрики для Prometheus (по всем воркерам gunicorn).
+    Нужен заголовок Authorization: Bearer <METRICS_TOKEN>. Без токена эндпоинт закрыт (403),
+    открыть его без авторизации можно только явно: METRICS_PUBLIC=True.
+    """
+
+    authentication_classes = []
+    permission_classes = []
+
+    def get(self, request):
+        token = settings.METRICS_TOKEN
+        if not token and not settings.METRICS_PUBLIC:
+            return Response({"status": "error", "code": 403, "message": "Metrics are disabled: METRICS_TOKEN is not set"},
+                            status=403)
+        if token and not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+            return Response({"status": "error", "code": 401, "message": "Authentication required"}, status=401)
+
+        body, content_type = render_metrics()
+        return HttpResponse(body, content_type=content_type)